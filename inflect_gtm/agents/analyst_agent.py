@@ -1,9 +1,17 @@
-from inflect.components import Agent, LocalMemory, GlobalMemory
-from inflect.tools import GoogleSheetsTool
+from inflect_gtm.components import Agent, LocalMemory, GlobalMemory
+from inflect_gtm.components.memory.segmentation_cache import SegmentationCache, fingerprint
+from inflect_gtm.components.utils.code_executor import SegmentationExecutor
+from inflect_gtm.tools import GoogleSheetsTool
+from inflect_gtm.tools.google_sheets.sheet_writer import SheetWriteBuffer
+import itertools
 import json
 import re
 
 
+# Rows used to fingerprint the sheet schema for the segmentation cache
+FINGERPRINT_SAMPLE_SIZE = 200
+
+
 class AnalystAgent(Agent):
     def __init__(self):
         super().__init__(
@@ -15,12 +23,80 @@ class AnalystAgent(Agent):
         )
         self.local_memory = LocalMemory()
         self.global_memory = None
+        self.executor = SegmentationExecutor()
+        self.segmentation_cache = SegmentationCache()
 
     def run(self, context):
-        customers = context.get("data", [])
-        sample_customers = customers[:5]  # Only use sample for prompt
+        if context.get("segmentation_mode") == "rules":
+            return self.run_vectorized(context)
+        try:
+            return self.run_generated(context)
+        finally:
+            # The worker pool is only needed during a run; idle agents must not hold processes
+            self.executor.close()
+
+    def run_generated(self, context):
+        """
+        Segments customers with LLM-generated code run in the sandboxed executor.
+        """
+        # Customers may be a list or a lazily streamed iterator of records (see GoogleSheetsTool.read_rows)
+        customers = iter(context.get("data", []))
+        fingerprint_sample = list(itertools.islice(customers, FINGERPRINT_SAMPLE_SIZE))
+        customers = itertools.chain(fingerprint_sample, customers)
+        sample_customers = fingerprint_sample[:5]  # Only use sample for prompt
         customer_json = json.dumps(sample_customers, indent=2)
 
+        # Steps 1-2 are skipped when a sheet with the same schema was segmented before
+        schema_key = fingerprint(fingerprint_sample)
+        cached = None if context.get("refresh") else self.segmentation_cache.lookup(schema_key)
+        if cached and self.segmentation_cache.validate(cached, fingerprint_sample, self.executor):
+            print("⚡ Reusing cached segmentation code and strategies for this sheet schema.")
+            code, strategies = cached["code"], cached["strategies"]
+            self.global_memory.set("segment_function_code", code)
+            self.global_memory.set("strategies", strategies)
+        else:
+            if cached:
+                self.segmentation_cache.invalidate(schema_key)
+                cached = None
+            generated = self.generate(context, customer_json)
+            if generated is None:
+                return context
+            code, strategies = generated
+
+        # Step 3: Execute code in sandboxed worker processes and segment customers
+        try:
+            segments = self.executor.run(code, customers)
+            self.global_memory.set("segments", segments)
+
+            print("\n📂 Segmented Customers:")
+            for seg, group in segments.items():
+                print(f"\n[{seg}] - {len(group)} customers")
+                for cust in group[:3]:
+                    print(f"- {cust['Name']} ({cust['Company']})")
+
+            print("\n📘 Strategies:")
+            for seg, strat in strategies.items():
+                print(f"\n[{seg}]: {strat}")
+        except Exception as e:
+            print("\n❌ Execution or segmentation failed:", str(e))
+            return context
+
+        if not cached:
+            self.segmentation_cache.store(schema_key, code, strategies)
+
+        # Step 4: Optionally write segment assignments back to the sheet
+        writeback = context.get("writeback")  # e.g. "sheet:customer_info; mode:upsert; key:Email"
+        if writeback:
+            result = self.write_back_segments(writeback, segments)
+            print("\n📤 Segment write-back:", result)
+
+        return context
+
+    def generate(self, context, customer_json):
+        """
+        Generates the segmentation function and strategies with the LLM.
+        Returns (code, strategies), or None if either generation failed.
+        """
         # Step 1: Generate segmentation function
         code_prompt = f"""
 You are given a few example customer records in JSON:
@@ -42,19 +118,32 @@ Return only the full function inside a Python code block.
             if not match:
                 raise ValueError("No Python code block found in code response.")
             code = match.group(1)
+            self.executor.compile(code)
             print("✅ Code generation successful.")
             self.global_memory.set("segment_function_code", code)
         except Exception as e:
             print("\n❌ Code generation failed:", str(e))
-            return context
+            return None
 
         # Step 2: Generate strategies
+        strategies = self.generate_strategies(
+            context, customer_json, "your segmentation logic in the function `segment_customers(customers)`"
+        )
+        if strategies is None:
+            return None
+
+        return code, strategies
+
+    def generate_strategies(self, context, customer_json, logic):
+        """
+        Asks the LLM for a segment-to-strategy dictionary. Returns None on failure.
+        """
         strategy_prompt = f"""
 You are given a few example customer records in JSON:
 
 {customer_json}
 
-Based on your segmentation logic in the function `segment_customers(customers)`, 
+Based on {logic}, 
 create a dictionary named `strategies` that maps each segment name to an onboarding strategy.
 Return only the dictionary.
 """
@@ -75,32 +164,98 @@ Return only the dictionary.
             strategies = json.loads(strategy_text.replace("'", '"'))
             print("✅ Strategy generation successful.")
             self.global_memory.set("strategies", strategies)
+            return strategies
         except Exception as e:
             print("\n❌ Strategy generation failed:", str(e))
+            return None
+
+    def run_vectorized(self, context):
+        """
+        Columnar segmentation: the LLM returns group-by or filter rules as JSON, which are
+        evaluated as vectorized masks over a CustomerTable instead of running Python per row.
+        """
+        from inflect_gtm.components.data.customer_table import CustomerTable, segment_by_rules
+
+        data = context.get("data", [])
+        table = data if isinstance(data, CustomerTable) else CustomerTable.from_records(data)
+        customer_json = json.dumps(table[:5], indent=2, default=str)
+        columns = ", ".join(table.columns)
+
+        # Step 1: Generate segmentation rules
+        rules_prompt = f"""
+You are given a few example customer records in JSON:
+
+{customer_json}
+
+The full table has {len(table)} customers with columns: {columns}.
+Segment the customers into logical groups using ONE of these JSON formats:
+
+1. {{"group_by": ["<column>", ...]}}
+2. {{"segments": [{{"name": "<segment name>", "where": {{"<column>": "<value>" | ["<value>", ...] | {{"<op>": <value>}}}}}}], "default": "<segment name>"}}
+   where <op> is one of ==, !=, >, >=, <, <=, in, not_in, contains.
+
+Group by patterns in fields like 'Company Size', 'Department', or others.
+Return only the JSON object.
+"""
+        try:
+            context["input"] = rules_prompt
+            response = super().run(context)
+            rules_response = response[self.name]
+            self.local_memory.add("user", rules_prompt)
+            self.local_memory.add("assistant", rules_response)
+
+            rules_match = re.search(r"\{[\s\S]*\}", rules_response)
+            if not rules_match:
+                raise ValueError("No JSON rules found in rules response.")
+            rules = json.loads(rules_match.group(0))
+            print("✅ Rule generation successful.")
+            self.global_memory.set("segment_function_code", json.dumps(rules, indent=2))
+        except Exception as e:
+            print("\n❌ Rule generation failed:", str(e))
             return context
 
-        # Step 3: Execute code and segment customers
+        # Step 2: Generate strategies
+        strategies = self.generate_strategies(context, customer_json, f"these segmentation rules: {json.dumps(rules)}")
+        if strategies is None:
+            return context
+
+        # Step 3: Evaluate rules as vectorized masks
         try:
-            exec_globals = {}
-            exec(code, exec_globals)
-            segment_func = exec_globals["segment_customers"]
-            segments = segment_func(customers)
+            segments = segment_by_rules(table, rules)
             self.global_memory.set("segments", segments)
 
             print("\n📂 Segmented Customers:")
             for seg, group in segments.items():
                 print(f"\n[{seg}] - {len(group)} customers")
-                for cust in group[:3]:
-                    print(f"- {cust['Name']} ({cust['Company']})")
-
-            print("\n📘 Strategies:")
-            for seg, strat in strategies.items():
-                print(f"\n[{seg}]: {strat}")
         except Exception as e:
-            print("\n❌ Execution or segmentation failed:", str(e))
+            print("\n❌ Rule evaluation failed:", str(e))
+            return context
+
+        writeback = context.get("writeback")
+        if writeback:
+            result = self.write_back_segments(writeback, segments)
+            print("\n📤 Segment write-back:", result)
 
         return context
 
+    def write_back_segments(self, writeback: str, segments: dict) -> list:
+        """
+        Upserts a "Segment" column keyed by the writeback 'key' column in buffered batches.
+        """
+        parts = dict(x.split(':', 1) for x in writeback.split('; '))
+        key = parts.get("key", "Email").strip()
+        if "mode" not in parts:
+            writeback += "; mode:upsert"
+        if "key" not in parts:
+            writeback += f"; key:{key}"
+
+        with SheetWriteBuffer(GoogleSheetsTool(), {"input": writeback}, flush_size=5000) as writer:
+            for seg, group in segments.items():
+                # Groups are lists of records or CustomerTables, both of which iterate as dicts
+                if not isinstance(group, (str, dict)) and hasattr(group, "__iter__"):
+                    writer.extend({key: cust.get(key), "Segment": seg} for cust in group if isinstance(cust, dict))
+        return writer.results
+
 
 if __name__ == "__main__":
     print("🚀 Running Analyst Agent...")
@@ -109,6 +264,6 @@ if __name__ == "__main__":
     agent.global_memory = global_memory
 
     context = {"input": "sheet:customer_info; range:A1:F100"}
-    context.update(GoogleSheetsTool().fetch_and_parse(context))
+    context["data"] = GoogleSheetsTool().read_rows(context)
 
     result = agent.run(context)
\ No newline at end of file
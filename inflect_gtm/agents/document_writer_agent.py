@@ -1,5 +1,14 @@
-from inflect.components import Agent, LocalMemory, GlobalMemory
+from inflect_gtm.components import Agent, LocalMemory, GlobalMemory
+from inflect_gtm.tools import GoogleDocsTool
+from inflect_gtm.components.utils.tracing import in_context
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 import json
+import os
+
+
+# Completed documents are checkpointed here so a rerun only generates missing segments
+CHECKPOINT_DIR = os.path.join(os.path.dirname(__file__), "checkpoints", "doc_writer")
 
 
 class DocumentWriterAgent(Agent):
@@ -22,24 +31,33 @@ class DocumentWriterAgent(Agent):
             print("❌ Missing segments or strategies in global memory.")
             return context
 
-        onboarding_docs = {}
-
+        prompts = {}
         for segment, customers in segments.items():
             strategy = strategies.get(segment, "Use general onboarding.")
-            prompt = f"""
+            prompts[segment] = f"""
 Segment: {segment}
 Strategy: {strategy}
-Customers: {json.dumps(customers[:5], indent=2)}
+Customers: {json.dumps(customers[:5], indent=2, default=str)}
 
 Write an onboarding document for the "{segment}" segment based on the strategy above. It should be personalized and actionable.
 """
-            context["input"] = prompt
-            response = super().run(context)
-            doc = response[self.name]
-            onboarding_docs[segment] = doc
 
-            self.local_memory.add("user", prompt)
-            self.local_memory.add("assistant", doc)
+        # Segments are generated in parallel up to max_concurrency; finished docs are reloaded from checkpoints
+        max_concurrency = int(context.get("max_concurrency", 4))
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+            futures = {segment: executor.submit(in_context(self.write_segment), prompt) for segment, prompt in prompts.items()}
+
+        onboarding_docs = {}
+        for segment, future in futures.items():
+            try:
+                doc, resumed = future.result()
+            except Exception as e:
+                print(f"❌ Failed to write document for [{segment}]:", str(e))
+                continue
+            onboarding_docs[segment] = doc
+            if not resumed:
+                self.local_memory.add("user", prompts[segment])
+                self.local_memory.add("assistant", doc)
 
         self.global_memory.set("onboarding_docs", onboarding_docs)
 
@@ -47,8 +65,43 @@ Write an onboarding document for the "{segment}" segment based on the strategy a
         for segment, doc in onboarding_docs.items():
             print(f"\n[{segment}]\n{doc[:500]}...\n")  # Print first 500 chars
 
+        # Optionally publish every document to Google Docs in one concurrent batch
+        if context.get("publish"):
+            manifest = GoogleDocsTool().publish_docs([
+                (f"Onboarding - {segment}", doc) for segment, doc in onboarding_docs.items()
+            ])
+            for entry, segment in zip(manifest, onboarding_docs):
+                entry["segment"] = segment
+            self.global_memory.set("published_docs", manifest)
+
+            print("\n🔗 Published Documents:")
+            for entry in manifest:
+                print(f"- [{entry['segment']}] {entry['link'] or entry.get('error')}")
+
         return context
 
+    def write_segment(self, prompt):
+        """
+        Generates one segment document, or loads it from its checkpoint if a previous run finished it.
+        Returns (doc, resumed).
+        """
+        key = hashlib.sha256(f"{self.model}\n{self.temperature}\n{prompt}".encode("utf-8")).hexdigest()
+        path = os.path.join(CHECKPOINT_DIR, f"{key}.json")
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                return json.load(f)["doc"], True
+
+        # Each call gets its own context so parallel generations never share the "input" key
+        doc = super().run({"input": prompt})[self.name]
+        if not doc:
+            raise ValueError("Empty response from LLM.")
+
+        os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+        with open(path + ".tmp", "w") as f:
+            json.dump({"prompt": prompt, "doc": doc}, f)
+        os.replace(path + ".tmp", path)
+        return doc, False
+
 
 if __name__ == "__main__":
     print("🚀 Running DocumentWriter Agent...")
@@ -0,0 +1,50 @@
+from inflect_gtm.components import GlobalMemory
+from inflect_gtm.components.workflow.workflow import Node, Workflow, digest
+from inflect_gtm.agents.root_agent import RootAgent
+from inflect_gtm.agents.analyst_agent import AnalystAgent
+from inflect_gtm.agents.document_writer_agent import DocumentWriterAgent
+from inflect_gtm.agents.post_demo_agent import PostDemoFollowupAgent
+
+
+def build_onboarding_workflow(sheet_input: str, meeting_log: str = "", to: str = "", user_name: str = "Mintae Kim") -> Workflow:
+    """
+    Declares the GTM agents as a workflow:
+
+        fetch_customers -> segment_customers -> write_onboarding_docs
+        post_demo_followup (independent branch, runs alongside the onboarding chain)
+
+    The customer fetch always reruns since the sheet can change; everything downstream reruns
+    only if the fetched customers (or the segments) actually changed. Checkpoints are kept per
+    set of inputs, so concurrent runs for different sheets or meetings never share them.
+    """
+    nodes = [
+        Node("fetch_customers", RootAgent(), outputs=["customers"],
+             context={"input": sheet_input}, always_run=True),
+        Node("segment_customers", AnalystAgent(), inputs={"data": "customers"},
+             outputs=["segment_function_code", "strategies", "segments"]),
+        Node("write_onboarding_docs", DocumentWriterAgent(), inputs=["segments", "strategies"],
+             outputs=["onboarding_docs"]),
+    ]
+    if meeting_log and to:
+        nodes.append(Node("post_demo_followup", PostDemoFollowupAgent(),
+                          outputs=["meeting_summary", "upcoming_events", "emails_sent"],
+                          context={"meeting_log": meeting_log, "to": to, "user_name": user_name}))
+    run_key = digest({"sheet_input": sheet_input, "meeting_log": meeting_log, "to": to, "user_name": user_name})
+    return Workflow(f"onboarding-{run_key[:16]}", nodes)
+
+
+if __name__ == "__main__":
+    print("🚀 Running onboarding workflow...")
+    workflow = build_onboarding_workflow(
+        sheet_input="sheet:customer_info; range:A1:F100",
+        meeting_log="Met with Sarah to discuss the new onboarding flow. Next steps: send the latest slide deck.",
+        to="customer@example.com"
+    )
+    result = workflow.run(
+        GlobalMemory(),
+        on_event=lambda event, name, info: print(f"🔄 {name}: {event} {info or ''}")
+    )
+
+    print("\n📋 Workflow Status:")
+    for name, status in result["status"].items():
+        print(f"- {name}: {status}", result["errors"].get(name, ""))
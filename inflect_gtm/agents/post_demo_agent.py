@@ -4,6 +4,7 @@ from inflect_gtm.tools.google_calendar.google_calendar_tool import GoogleCalenda
 from inflect_gtm.components.utils.meeting_log_parser import parse_meeting_log
 from inflect_gtm.components.utils.llm import call_llm
 from inflect_gtm.components.utils.rag_prompt_builder import build_followup_prompt
+from inflect_gtm.components.utils.tracing import span
 
 
 class PostDemoFollowupAgent(Agent):
@@ -23,25 +24,29 @@ class PostDemoFollowupAgent(Agent):
     def run(self, context):
         # Step 1: Parse meeting log using LLM
         raw_log = context.get("meeting_log", "")
-        parsed = parse_meeting_log(raw_log)
+        with span("post_demo.parse_meeting_log", log_chars=len(raw_log)):
+            parsed = parse_meeting_log(raw_log)
         self.local_memory.add("user", raw_log)
         self.local_memory.add("assistant", str(parsed))
         self.global_memory.set("meeting_summary", parsed)
 
         # Step 2: Fetch calendar events for additional context
-        events_result = self.calendar_tool.get_upcoming_events({"n": 3})
+        with span("post_demo.calendar_events"):
+            events_result = self.calendar_tool.get_upcoming_events({"n": 3})
         events = events_result.get("events", [])
         self.global_memory.set("upcoming_events", events)
 
         # Step 3: Generate follow-up email using prompt builder
         context["user_name"] = context.get("user_name", "Mintae Kim")
-        prompt = build_followup_prompt({
-            "meeting_log": parsed,
-            "calendar_events": events,
-            "user_name": context["user_name"]
-        })
+        with span("post_demo.build_prompt"):
+            prompt = build_followup_prompt({
+                "meeting_log": parsed,
+                "calendar_events": events,
+                "user_name": context["user_name"]
+            })
 
-        llm_response = call_llm(prompt)
+        with span("post_demo.generate_email"):
+            llm_response = call_llm(prompt)
         self.local_memory.add("user", prompt)
         self.local_memory.add("assistant", llm_response)
 
@@ -65,9 +70,18 @@ class PostDemoFollowupAgent(Agent):
             if not to:
                 raise ValueError("No recipient email address provided in context.")
 
-            send_result = self.gmail_tool.send_email({
-                "input": f"to:{to}; subject:{subject}; body:{body}"
-            })
+            with span("post_demo.send_email", queued=isinstance(to, list) or bool(context.get("queue_send"))):
+                if isinstance(to, list) or context.get("queue_send"):
+                    # Bulk sends go through the rate-limited outbound queue instead of blocking here
+                    recipients = to if isinstance(to, list) else [to]
+                    queued_ids = self.gmail_tool.queue_emails([
+                        {"to": recipient, "subject": subject, "body": body} for recipient in recipients
+                    ])
+                    send_result = f"📨 {len(queued_ids)} email(s) queued with subject: {subject}"
+                else:
+                    send_result = self.gmail_tool.send_email({
+                        "input": f"to:{to}; subject:{subject}; body:{body}"
+                    })
 
             print("📧 Email Sent:", send_result)
             self.global_memory.set("emails_sent", send_result)
@@ -1,6 +1,6 @@
-from inflect.components import Agent, LocalMemory, GlobalMemory
-from inflect.components.utils.llm import call_llm
-from inflect.tools import GoogleSheetsTool
+from inflect_gtm.components import Agent, LocalMemory, GlobalMemory
+from inflect_gtm.components.utils.llm import call_llm
+from inflect_gtm.tools import GoogleSheetsTool
 
 
 class RootAgent(Agent):
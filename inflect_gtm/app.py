@@ -1,14 +1,20 @@
 from fastapi import FastAPI, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 import uvicorn
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
-from langchain_ollama import ChatOllama
-from langgraph.prebuilt import create_react_agent
-from langgraph.graph import StateGraph, END
-from langchain_core.runnables import RunnableLambda
 from tools.registry import tool_registry
+from server.agent_registry import AgentRegistry
+from server.graph_cache import GraphCache
+from server.chat_runner import run_chat, run_blocking, extract_output, ClientDisconnected
+from server.job_queue import JobQueue, FINISHED_STATUSES
+from server.pipelines import PIPELINES
+from server.admission import AdmissionController, Overloaded
+from inflect_gtm.components.utils.tracing import span
+import asyncio
+import json
+import os
 
 # FastAPI 앱 생성
 app = FastAPI(title="Agent Builder API")
@@ -22,23 +28,86 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 에이전트 인스턴스 저장소
-agents = {}
+# 컴파일된 에이전트 그래프 캐시 ((task, tools) 시그니처 기준, 크기 제한)
+graph_cache = GraphCache()
 
-# 상태 변수 (Streamlit의 session_state 대체)
-state = {
-    "user_task": "",
-    "selected_tools": [],
-    "agent_executor": None,
-}
+# 에이전트 그래프 컴파일 (캐시 미스일 때만 호출)
+def compile_agent(task: str, tools: List[str]):
+    # LangChain/LangGraph는 무거우므로 첫 컴파일 시점에 임포트 (서버 시작 시간 단축)
+    from langchain_ollama import ChatOllama
+    from langgraph.prebuilt import create_react_agent
+
+    # 선택된 도구 객체 가져오기 (레지스트리의 도구 인스턴스를 그대로 공유)
+    selected_tool_objs = [tool_registry[name] for name in sorted(set(tools)) if name in tool_registry]
+
+    # 시스템 프롬프트
+    system_prompt = f"You are an assistant that helps the user with the following task: {' '.join(task.split())}"
+
+    # LangChain 에이전트 생성
+    llm = ChatOllama(model="llama3.1", temperature=0, system=system_prompt)
+    return create_react_agent(llm, selected_tool_objs)
+
+# 에이전트 빌드 함수 (레지스트리가 스펙으로부터 에이전트를 생성/재생성할 때 사용)
+def build_agent(spec: Dict[str, Any]):
+    return graph_cache.get_or_build(spec["task"], spec["tools"], compile_agent)
+
+# 에이전트 레지스트리 (스펙/세션은 워커 간 공유 SQLite에 저장, 빌드된 에이전트는 워커별 LRU/유휴 시간 기반 해제)
+agent_registry = AgentRegistry(build_agent)
+
+# 백그라운드 작업 큐 (온보딩/팔로업 파이프라인, SQLite에 상태 저장)
+job_queue = JobQueue(PIPELINES)
+
+# SSE 스트림이 새 진행 이벤트를 확인하는 주기 (초)
+JOB_EVENT_POLL_INTERVAL = 0.5
+
+# 서버 시작 시 작업 워커 실행 (중단된 작업도 다시 큐에 넣음)
+@app.on_event("startup")
+async def start_job_workers():
+    job_queue.start()
+
+# 요청별 트레이싱 미들웨어 (하위 에이전트/도구/LLM 스팬이 이 스팬 아래에 기록됨)
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    with span(f"http {request.method} {request.url.path}", method=request.method, path=request.url.path) as current:
+        response = await call_next(request)
+        if current:
+            current.set(status_code=response.status_code)
+            response.headers["X-Trace-Id"] = current.trace_id
+        return response
+
+# LLM 백엔드 용량 기반 동시 실행 제한 (대기열 초과 시 503 + Retry-After)
+admission = AdmissionController()
+
+# 과부하로 거절된 요청 응답
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request: Request, exc: Overloaded):
+    return JSONResponse(
+        status_code=503,
+        content={"error": exc.reason},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+# 공정성 기준이 되는 클라이언트 식별자 (세션 ID, 없으면 클라이언트 IP)
+def client_key(http_request: Request, session_id: Optional[str] = None) -> str:
+    if session_id:
+        return session_id
+    return http_request.client.host if http_request.client else "anonymous"
 
 # API 요청 모델
 class ChatRequest(BaseModel):
     input: str
+    # 없으면 에이전트 없이 기본 응답 (세션 소유 에이전트만 사용 가능)
+    session_id: Optional[str] = None
+    agent_id: Optional[str] = None
 
 class AgentCreateRequest(BaseModel):
     task: str
     tools: List[str]
+    session_id: Optional[str] = None
+
+class JobSubmitRequest(BaseModel):
+    kind: str
+    params: Dict[str, Any] = {}
 
 # API 응답 모델
 class ChatResponse(BaseModel):
@@ -47,16 +116,39 @@ class ChatResponse(BaseModel):
 class AgentResponse(BaseModel):
     agent: Dict[str, Any]
 
+class AgentListResponse(BaseModel):
+    agents: List[Dict[str, Any]]
+
+class JobResponse(BaseModel):
+    job: Dict[str, Any]
+
 class ToolsResponse(BaseModel):
     tools: List[str]
 
 class HealthResponse(BaseModel):
     status: str
+    admission: Optional[Dict[str, Any]] = None
 
 # 헬스 체크 엔드포인트
 @app.get("/api/health", response_model=HealthResponse)
 async def health_check():
-    return {"status": "ok"}
+    return {"status": "ok", "admission": admission.stats()}
+
+# 워밍업 엔드포인트 (배포 직후 호출하면 첫 사용자 요청이 모델/라이브러리 로딩 비용을 부담하지 않음)
+@app.post("/api/warmup")
+async def warmup():
+    def load():
+        import langchain_ollama, langgraph.prebuilt
+        from inflect_gtm.components.rag import retriever
+
+        try:
+            retriever.warmup()
+            return {"langchain": True, "retriever": True}
+        except FileNotFoundError:
+            # 벡터 스토어가 아직 없으면 검색기는 첫 쿼리 때 다시 시도
+            return {"langchain": True, "retriever": False}
+
+    return {"status": "ok", "loaded": await asyncio.to_thread(load)}
 
 # 도구 목록 엔드포인트
 @app.get("/api/tools", response_model=ToolsResponse)
@@ -66,14 +158,40 @@ async def get_tools():
 
 # 채팅 엔드포인트
 @app.post("/api/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, http_request: Request):
     user_input = request.input
-    
-    # 에이전트가 생성되었는지 확인
-    if state["agent_executor"]:
-        # 에이전트에 사용자 입력 전달
-        result = state["agent_executor"].invoke({"input": user_input})
-        return {"output": result["output"]}
+    # 레지스트리 조회는 SQLite 쿼리이므로 이벤트 루프를 막지 않도록 스레드에서 실행
+    await asyncio.to_thread(agent_registry.evict_idle)
+
+    # 요청한 에이전트(또는 세션의 최근 에이전트) 확인
+    agent_id = await asyncio.to_thread(agent_registry.resolve, request.session_id, request.agent_id)
+    if agent_id:
+        # 해제된 에이전트는 스펙으로부터 다시 생성 (이벤트 루프를 막지 않도록 스레드에서 실행)
+        agent_executor = await run_blocking(agent_registry.get, agent_id)
+        try:
+            # 에이전트에 사용자 입력 전달 (백엔드 슬롯 확보 후 비동기 실행, 타임아웃 및 연결 끊김 시 취소)
+            async with admission.admit(client_key(http_request, request.session_id)):
+                result = await run_chat(
+                    agent_executor,
+                    {"messages": [("user", user_input)]},
+                    is_disconnected=http_request.is_disconnected
+                )
+        except asyncio.TimeoutError:
+            return JSONResponse(
+                status_code=504,
+                content={"error": "Agent did not respond in time."}
+            )
+        except ClientDisconnected:
+            return JSONResponse(
+                status_code=499,
+                content={"error": "Client disconnected."}
+            )
+        return {"output": extract_output(result)}
+    elif request.agent_id:
+        return JSONResponse(
+            status_code=404,
+            content={"error": f"Agent not found: {request.agent_id}"}
+        )
     else:
         # 에이전트가 없는 경우 기본 응답
         response = f"I understand you want to know about: {user_input}. To create an agent to help with this, say 'build agent'."
@@ -81,39 +199,27 @@ async def chat(request: ChatRequest):
 
 # 에이전트 생성 엔드포인트
 @app.post("/api/create_agent", response_model=AgentResponse)
-async def create_agent(request: AgentCreateRequest):
+async def create_agent(request: AgentCreateRequest, http_request: Request):
+    # 과부하 시 예외 처리기에서 503으로 응답
+    async with admission.admit(client_key(http_request, request.session_id)):
+        return await build_agent_response(request)
+
+async def build_agent_response(request: AgentCreateRequest):
     try:
-        state["user_task"] = request.task
-        state["selected_tools"] = request.tools
-        
-        # 선택된 도구 객체 가져오기
-        selected_tool_objs = [tool_registry[name] for name in request.tools if name in tool_registry]
-        
-        # 시스템 프롬프트
-        system_prompt = f"You are an assistant that helps the user with the following task: {request.task}"
-        
-        # LangChain 에이전트 생성
-        llm = ChatOllama(model="llama3.1", temperature=0, system=system_prompt)
-        agent = create_react_agent(llm, selected_tool_objs)
-        
-        workflow = StateGraph(dict)
-        workflow.add_node("agent", RunnableLambda(agent.invoke))
-        workflow.set_entry_point("agent")
-        workflow.add_edge("agent", END)
-        graph_executor = workflow.compile()
-        
-        # 상태 업데이트
-        state["agent_executor"] = agent
-        
+        await asyncio.to_thread(agent_registry.evict_idle)
+        # 그래프 컴파일은 동기 작업이므로 스레드에서 실행
+        spec = await run_blocking(agent_registry.create, request.task, request.tools, request.session_id)
+
         # 응답할 에이전트 정보
         agent_info = {
-            "id": "agent-1",  # 실제로는 고유 ID 생성
+            "id": spec["id"],
+            "session_id": spec["session_id"],
             "name": request.task[:30] + "..." if len(request.task) > 30 else request.task,
             "tools": request.tools,
             "status": "ready",
             "task": request.task
         }
-        
+
         return {"agent": agent_info}
     except Exception as e:
         return JSONResponse(
@@ -121,6 +227,72 @@ async def create_agent(request: AgentCreateRequest):
             content={"error": f"Failed to create agent: {str(e)}"}
         )
 
-# 앱 실행 (직접 실행 시)
+# 세션별 에이전트 목록 엔드포인트
+@app.get("/api/agents", response_model=AgentListResponse)
+async def list_agents(session_id: str):
+    return {"agents": await asyncio.to_thread(agent_registry.list_agents, session_id)}
+
+# 에이전트 삭제 엔드포인트
+@app.delete("/api/agents/{agent_id}")
+async def delete_agent(agent_id: str, session_id: str):
+    # 다른 세션의 에이전트는 ID를 알아도 삭제할 수 없음
+    def delete() -> bool:
+        return bool(agent_registry.resolve(session_id, agent_id)) and agent_registry.delete(agent_id)
+
+    if not await asyncio.to_thread(delete):
+        return JSONResponse(
+            status_code=404,
+            content={"error": f"Agent not found: {agent_id}"}
+        )
+    return {"deleted": agent_id}
+
+# 작업 제출 엔드포인트 (파이프라인은 백그라운드 워커에서 실행)
+@app.post("/api/jobs", response_model=JobResponse)
+async def submit_job(request: JobSubmitRequest):
+    try:
+        job_id = await asyncio.to_thread(job_queue.submit, request.kind, request.params)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    return {"job": await asyncio.to_thread(job_queue.store.get, job_id)}
+
+# 작업 상태 조회 엔드포인트
+@app.get("/api/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    job = await asyncio.to_thread(job_queue.store.get, job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": f"Job not found: {job_id}"})
+    job["events"] = await asyncio.to_thread(job_queue.store.events, job_id)
+    return {"job": job}
+
+# 작업 진행 이벤트 스트리밍 엔드포인트 (Server-Sent Events)
+@app.get("/api/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, http_request: Request, after: int = 0):
+    if await asyncio.to_thread(job_queue.store.get, job_id) is None:
+        return JSONResponse(status_code=404, content={"error": f"Job not found: {job_id}"})
+
+    async def event_stream():
+        last_seq = after
+        while not await http_request.is_disconnected():
+            for event in await asyncio.to_thread(job_queue.store.events, job_id, last_seq):
+                last_seq = event["seq"]
+                yield f"id: {event['seq']}\nevent: {event['stage']}\ndata: {json.dumps(event)}\n\n"
+            job = await asyncio.to_thread(job_queue.store.get, job_id)
+            if job["status"] in FINISHED_STATUSES and not await asyncio.to_thread(job_queue.store.events, job_id, last_seq):
+                yield f"event: end\ndata: {json.dumps({'status': job['status']})}\n\n"
+                return
+            await asyncio.sleep(JOB_EVENT_POLL_INTERVAL)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+# 작업 취소 엔드포인트
+@app.post("/api/jobs/{job_id}/cancel", response_model=JobResponse)
+async def cancel_job(job_id: str):
+    status = await asyncio.to_thread(job_queue.cancel, job_id)
+    if status is None:
+        return JSONResponse(status_code=404, content={"error": f"Job not found: {job_id}"})
+    return {"job": await asyncio.to_thread(job_queue.store.get, job_id)}
+
+# 앱 실행 (직접 실행 시, API_WORKERS 개수만큼 워커 프로세스 실행 - 에이전트/작업 상태는 SQLite로 공유)
 if __name__ == "__main__":
-    uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=True)
+    workers = int(os.getenv("API_WORKERS", "1"))
+    uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=workers == 1, workers=workers)
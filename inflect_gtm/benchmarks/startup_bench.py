@@ -0,0 +1,89 @@
+import os
+import re
+import sys
+import argparse
+import statistics
+import subprocess
+from typing import Dict, Any, List, Tuple
+
+
+# Repository root (for `import inflect_gtm...`) and the app directory (app.py imports `server.*`)
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+APP_DIR = os.path.join(PROJECT_ROOT, "inflect_gtm")
+
+# (label, module, working directory)
+TARGETS = [
+    ("components", "inflect_gtm.components", PROJECT_ROOT),
+    ("tools", "inflect_gtm.tools", PROJECT_ROOT),
+    ("retriever", "inflect_gtm.components.rag.retriever", PROJECT_ROOT),
+    ("agents", "inflect_gtm.agents.post_demo_agent", PROJECT_ROOT),
+    ("app", "app", APP_DIR),
+]
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure_import(module: str, cwd: str, baseline: frozenset = frozenset()) -> Tuple[float, List[Tuple[int, str]]]:
+    """
+    Imports a module in a fresh interpreter with -X importtime.
+
+    Returns:
+        Tuple[float, List[Tuple[int, str]]]: Total import time in ms, and (cumulative µs, module)
+        for every top-level import it triggered. Modules in `baseline` (interpreter startup)
+        are left out of both.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [PROJECT_ROOT, os.environ.get("PYTHONPATH")])))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}" if module else "pass"],
+        cwd=cwd, env=env, capture_output=True, text=True, timeout=600
+    )
+    if result.returncode != 0:
+        last_line = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "unknown error"
+        raise RuntimeError(last_line)
+
+    imports = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        # Direct children of the interpreter (one space of indentation) carry their whole subtree
+        if match and len(match.group(3)) == 1 and match.group(4) not in baseline:
+            imports.append((int(match.group(2)), match.group(4)))
+    total_ms = sum(cumulative for cumulative, _ in imports) / 1000
+    return total_ms, imports
+
+
+def run(repeat: int = 5, top: int = 5) -> Dict[str, Any]:
+    report = {}
+    _, startup = measure_import("", PROJECT_ROOT)
+    baseline = frozenset(name for _, name in startup)
+    for label, module, cwd in TARGETS:
+        try:
+            runs = [measure_import(module, cwd, baseline) for _ in range(repeat)]
+        except RuntimeError as e:
+            print(f"❌ {label}: import failed ({e})")
+            report[label] = {"error": str(e)}
+            continue
+
+        totals = [total for total, _ in runs]
+        slowest = {}
+        for _, imports in runs:
+            for cumulative, name in imports:
+                slowest.setdefault(name, []).append(cumulative)
+        top_imports = sorted(
+            ((statistics.median(times) / 1000, name) for name, times in slowest.items()), reverse=True
+        )[:top]
+
+        report[label] = {"median_ms": statistics.median(totals), "top_imports": top_imports}
+        print(f"⏱️ {label} ({module}): median {statistics.median(totals):.1f} ms over {repeat} runs")
+        for ms, name in top_imports:
+            print(f"    {ms:8.1f} ms  {name}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measures cold import time of the package entry points.")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per target")
+    parser.add_argument("--top", type=int, default=5, help="Slowest imports listed per target")
+    args = parser.parse_args()
+
+    print("🚀 Measuring cold-start import times...")
+    run(args.repeat, args.top)
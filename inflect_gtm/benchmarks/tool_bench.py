@@ -0,0 +1,210 @@
+import os
+import json
+import time
+import argparse
+import tempfile
+from typing import Dict, Any, Callable, List
+from inflect_gtm.tools.utils.fake_google import FakeGoogle
+
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+
+SHEET_TITLE = "customer_info"
+
+
+def _customers(size: int, start: int = 0) -> List[dict]:
+    return [
+        {"customer_id": f"C{i + 1:06d}", "name": f"Customer {i}", "plan": "Growth", "seats": i % 500 + 1}
+        for i in range(start, start + size)
+    ]
+
+
+# Each setup seeds the fake backend for `size` items and returns the operation to time,
+# which returns how many items it actually processed
+
+def gmail_fetch_emails(google: FakeGoogle, size: int) -> Callable[[], int]:
+    from inflect_gtm.tools.gmail.gmail_tool import GmailTool
+
+    google.add_messages(size)
+    tool = GmailTool(build_service=google.build)
+    return lambda: len(tool.fetch_emails({"n": size}))
+
+
+def gmail_send_email(google: FakeGoogle, size: int) -> Callable[[], int]:
+    from inflect_gtm.tools.gmail.gmail_tool import GmailTool
+
+    tool = GmailTool(build_service=google.build)
+    contexts = [{"input": f"to:customer{i}@example.com; subject:Welcome aboard; body:Hi customer {i}, thanks for joining."} for i in range(size)]
+    return lambda: sum(1 for result in tool.run_many(contexts) if isinstance(result, dict) and not result["Gmail"].startswith("❌"))
+
+
+def gmail_sync(google: FakeGoogle, size: int) -> Callable[[], int]:
+    from inflect_gtm.tools.gmail.gmail_sync import GmailSync, MailboxStore
+
+    google.add_messages(size)
+    store = MailboxStore(os.path.join(tempfile.mkdtemp(prefix="tool_bench_"), "mailbox.db"))
+    sync = GmailSync(store=store, build_service=google.build)
+    # Only the Gmail traffic is timed; embedding into the vector store is benchmarked by the RAG code
+    sync._ingest = lambda messages: len(messages)
+    sync.sync({"n": size})
+    # The timed run is incremental: history.list plus batched gets of the `size` new messages
+    google.add_messages(size)
+    return lambda: sync.sync({})["indexed"]
+
+
+def calendar_upcoming_events(google: FakeGoogle, size: int) -> Callable[[], int]:
+    from inflect_gtm.tools.google_calendar.google_calendar_tool import GoogleCalendarTool
+
+    google.add_events(size)
+    tool = GoogleCalendarTool(build_service=google.build)
+    return lambda: len(tool.get_upcoming_events({"n": size}).get("events", []))
+
+
+def sheets_read_rows(google: FakeGoogle, size: int) -> Callable[[], int]:
+    from inflect_gtm.tools.google_sheets.google_sheets_tool import GoogleSheetsTool, spreadsheet_id_cache
+
+    # Titles resolved against an earlier fake backend must not be reused
+    spreadsheet_id_cache.invalidate()
+    google.add_spreadsheet(SHEET_TITLE, rows=size)
+    tool = GoogleSheetsTool(build_service=google.build)
+    return lambda: sum(1 for _ in tool.read_rows({"input": f"sheet:{SHEET_TITLE}; range:A1:H"}))
+
+
+def sheets_read_sheet(google: FakeGoogle, size: int) -> Callable[[], int]:
+    from inflect_gtm.tools.google_sheets.google_sheets_tool import GoogleSheetsTool
+
+    spreadsheet_id = google.add_spreadsheet(SHEET_TITLE, rows=size)
+    tool = GoogleSheetsTool(build_service=google.build)
+    return lambda: tool.read_sheet({"input": f"id:{spreadsheet_id}; range:A2:H{size + 1}"}).count("\n") + 1
+
+
+def sheets_append_records(google: FakeGoogle, size: int) -> Callable[[], int]:
+    from inflect_gtm.tools.google_sheets.google_sheets_tool import GoogleSheetsTool
+
+    spreadsheet_id = google.add_spreadsheet(SHEET_TITLE, values=[])
+    tool = GoogleSheetsTool(build_service=google.build)
+    return lambda: tool.append_records(spreadsheet_id, "Customers", _customers(size))
+
+
+def sheets_upsert_records(google: FakeGoogle, size: int) -> Callable[[], int]:
+    from inflect_gtm.tools.google_sheets.google_sheets_tool import GoogleSheetsTool
+
+    spreadsheet_id = google.add_spreadsheet(SHEET_TITLE, values=[])
+    tool = GoogleSheetsTool(build_service=google.build)
+    tool.append_records(spreadsheet_id, "Customers", _customers(size))
+    # Half of the records update existing rows, the other half are new
+    return lambda: sum(tool.upsert_records(spreadsheet_id, "Customers", _customers(size, start=size // 2), "customer_id"))
+
+
+def docs_publish_doc(google: FakeGoogle, size: int) -> Callable[[], int]:
+    from inflect_gtm.tools.google_docs.google_docs_tool import GoogleDocsTool
+
+    tool = GoogleDocsTool(writes_per_minute=600000, build_service=google.build)
+    content = "\n".join(["# Onboarding plan"] + [f"- Step {i}: review account setup with the customer" for i in range(size)])
+
+    def run() -> int:
+        tool.publish_doc("Onboarding plan", content)
+        return size
+    return run
+
+
+def docs_get_text(google: FakeGoogle, size: int) -> Callable[[], int]:
+    from inflect_gtm.tools.google_docs.google_docs_tool import GoogleDocsTool
+
+    document_id = google.add_document("Meeting notes", paragraphs=size)
+    tool = GoogleDocsTool(build_service=google.build)
+    return lambda: tool.get_text(document_id)[1].count("\n")
+
+
+def docs_get_text_cached(google: FakeGoogle, size: int) -> Callable[[], int]:
+    from inflect_gtm.tools.google_docs.google_docs_tool import GoogleDocsTool
+
+    document_id = google.add_document("Meeting notes", paragraphs=size)
+    tool = GoogleDocsTool(build_service=google.build)
+    tool.get_text(document_id)
+    # An unchanged revision is served from the text cache after a fields-masked check
+    return lambda: tool.get_text(document_id)[1].count("\n")
+
+
+OPERATIONS = {
+    "gmail.fetch_emails": gmail_fetch_emails,
+    "gmail.send_email": gmail_send_email,
+    "gmail.sync": gmail_sync,
+    "calendar.get_upcoming_events": calendar_upcoming_events,
+    "sheets.read_rows": sheets_read_rows,
+    "sheets.read_sheet": sheets_read_sheet,
+    "sheets.append_records": sheets_append_records,
+    "sheets.upsert_records": sheets_upsert_records,
+    "docs.publish_doc": docs_publish_doc,
+    "docs.get_text": docs_get_text,
+    "docs.get_text_cached": docs_get_text_cached,
+}
+
+
+def measure(operation: str, size: int, **fake_options) -> Dict[str, Any]:
+    """
+    Runs one operation against a fresh fake backend.
+
+    Returns:
+        Dict[str, Any]: Items processed, wall time, API calls, injected errors and bytes sent
+        and received, plus the per-method breakdown.
+    """
+    google = FakeGoogle(**fake_options)
+    run = OPERATIONS[operation](google, size)
+    google.reset_stats()
+
+    start = time.perf_counter()
+    error = None
+    try:
+        items = run()
+    except Exception as e:
+        items, error = 0, f"{type(e).__name__}: {e}"
+    wall = time.perf_counter() - start
+
+    return {
+        "operation": operation,
+        "size": size,
+        "items": items,
+        "wall_s": round(wall, 4),
+        **google.totals(),
+        "methods": google.stats,
+        "error": error,
+    }
+
+
+def run(operations: List[str], sizes: List[int], **fake_options) -> List[Dict[str, Any]]:
+    results = []
+    print(f"{'operation':<30} {'size':>7} {'items':>7} {'calls':>6} {'errors':>6} {'sent KB':>9} {'recv KB':>10} {'wall s':>8}")
+    for operation in operations:
+        for size in sizes:
+            result = measure(operation, size, **fake_options)
+            results.append(result)
+            print(
+                f"{operation:<30} {size:>7} {result['items']:>7} {result['calls']:>6} {result['errors']:>6} "
+                f"{result['request_bytes'] / 1024:>9.1f} {result['response_bytes'] / 1024:>10.1f} {result['wall_s']:>8.3f}"
+            )
+            if result["error"]:
+                print(f"❌ {operation} at {size}: {result['error']}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks the Google tools against the in-memory fake APIs.")
+    parser.add_argument("--ops", nargs="*", default=list(OPERATIONS), choices=list(OPERATIONS), help="Operations to run")
+    parser.add_argument("--sizes", nargs="*", type=int, default=DEFAULT_SIZES, help="Item counts per operation")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every API request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random seconds per API request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failing with --error-status")
+    parser.add_argument("--error-status", type=int, default=429, help="HTTP status of injected errors")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    print("🚀 Benchmarking Google tools on fake APIs...")
+    results = run(
+        args.ops, args.sizes,
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, error_status=args.error_status,
+    )
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print("💾 Results saved to", args.json)
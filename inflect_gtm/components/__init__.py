@@ -1,4 +1,23 @@
-from inflect_gtm.components.agent.agent import Agent
-from inflect_gtm.components.tool.tool import Tool
-from inflect_gtm.components.memory.global_memory import GlobalMemory
-from inflect_gtm.components.memory.local_memory import LocalMemory
\ No newline at end of file
+import importlib
+
+# Public names are resolved on first access (PEP 562) so importing the package stays cheap
+_EXPORTS = {
+    "Agent": "inflect_gtm.components.agent.agent",
+    "Tool": "inflect_gtm.components.tool.tool",
+    "GlobalMemory": "inflect_gtm.components.memory.global_memory",
+    "LocalMemory": "inflect_gtm.components.memory.local_memory",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,5 +1,6 @@
 from typing import Dict, Any
 from inflect_gtm.components.utils.llm import call_llm
+from inflect_gtm.components.utils.tracing import traced_method
 
 
 class Agent:
@@ -29,6 +30,13 @@ class Agent:
         self.chat = chat
         self.temperature = temperature
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Subclasses override run(), so each override is wrapped in its own span
+        if "run" in cls.__dict__:
+            cls.run = traced_method("agent")(cls.__dict__["run"])
+
+    @traced_method("agent")
     def run(self, context: Dict[str, Any]) -> Dict[str, str]:
         """
         Executes the agent using the given context.
@@ -0,0 +1,229 @@
+import re
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Iterable, List, Optional, Sequence
+
+
+# Text columns whose distinct values make up at most this share of rows are stored as categoricals
+CATEGORY_RATIO = 0.5
+
+# Records converted to a DataFrame at a time when building from dicts
+BUILD_CHUNK_SIZE = 50000
+
+# Numeric-looking text that is really an identifier (zip codes, IDs with leading zeros, phone
+# numbers with a country code) and would change if converted to a number
+IDENTIFIER_TEXT = re.compile(r"^\s*(?:\+|-?0\d)")
+
+OPERATORS = {
+    "==": lambda col, v: col == v,
+    "!=": lambda col, v: col != v,
+    ">": lambda col, v: col > v,
+    ">=": lambda col, v: col >= v,
+    "<": lambda col, v: col < v,
+    "<=": lambda col, v: col <= v,
+    "in": lambda col, v: col.isin(v),
+    "not_in": lambda col, v: ~col.isin(v),
+    "contains": lambda col, v: col.astype(str).str.contains(str(v), case=False, regex=False),
+}
+
+
+class CustomerTable:
+    """
+    Columnar customer table backed by a pandas DataFrame.
+    Low-cardinality text fields such as 'Company Size' or 'Department' are categorical-encoded,
+    numeric-looking text is converted to numbers, and slicing returns plain records so the table
+    can stand in for the list of dicts used elsewhere (e.g. `customers[:5]` in prompts).
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+
+    @classmethod
+    def from_rows(cls, headers: Sequence[str], rows: Iterable[Sequence[Any]]) -> "CustomerTable":
+        """
+        Builds a table straight from a sheet's header and value rows, without per-row dicts.
+        """
+        return cls(encode(rows_to_frame(headers, rows)))
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "CustomerTable":
+        records = iter(records)
+        frames = []
+        while True:
+            chunk = [record for _, record in zip(range(BUILD_CHUNK_SIZE), records)]
+            if not chunk:
+                break
+            frames.append(pd.DataFrame.from_records(chunk))
+        if not frames:
+            return cls(pd.DataFrame())
+        return cls(encode(pd.concat(frames, ignore_index=True)))
+
+    @classmethod
+    def from_frames(cls, frames: Iterable[pd.DataFrame]) -> "CustomerTable":
+        frames = list(frames)
+        if not frames:
+            return cls(pd.DataFrame())
+        return cls(encode(pd.concat(frames, ignore_index=True)))
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.frame.columns)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return self.frame.iloc[item].to_dict("records")
+        if isinstance(item, str):
+            return self.frame[item]
+        return self.frame.iloc[item].to_dict()
+
+    def __iter__(self):
+        # Records are materialized in blocks so iteration never copies the whole table
+        for start in range(0, len(self.frame), BUILD_CHUNK_SIZE):
+            yield from self.frame.iloc[start:start + BUILD_CHUNK_SIZE].to_dict("records")
+
+    def take(self, positions: np.ndarray) -> "CustomerTable":
+        return CustomerTable(self.frame.iloc[positions])
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        return self.frame.to_dict("records")
+
+    def memory_usage(self) -> int:
+        """
+        Returns the table's memory footprint in bytes.
+        """
+        return int(self.frame.memory_usage(deep=True).sum())
+
+
+def rows_to_frame(headers: Sequence[str], rows: Iterable[Sequence[Any]]) -> pd.DataFrame:
+    """
+    Builds an unencoded DataFrame from value rows, padding rows that are shorter than the header.
+    Blank rows (which the API returns as empty lists) are dropped, as in the record readers.
+    """
+    width = len(headers)
+    padded = [
+        list(row[:width]) + [None] * (width - len(row))
+        for row in rows
+        if any(cell not in ("", None) for cell in row)
+    ]
+    return pd.DataFrame(padded, columns=list(headers))
+
+
+def encode(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converts numeric-looking text columns to numbers and low-cardinality text columns to categoricals.
+    Columns holding identifier-like text (a leading zero or plus sign) stay text, so zip codes,
+    phone numbers and zero-padded IDs still match the sheet when used as keys.
+    """
+    for column in frame.columns:
+        series = frame[column]
+        if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+            continue
+        present = series.replace("", np.nan).dropna()
+        numeric = pd.to_numeric(present, errors="coerce")
+        is_identifier = present.map(lambda value: isinstance(value, str) and bool(IDENTIFIER_TEXT.match(value))).any()
+        if len(present) and numeric.notna().all() and not is_identifier:
+            frame[column] = pd.to_numeric(series.replace("", np.nan), errors="coerce")
+        elif series.nunique(dropna=True) <= max(1, CATEGORY_RATIO * len(series)):
+            frame[column] = series.astype("category")
+    return frame
+
+
+def _condition_mask(frame: pd.DataFrame, column: str, condition: Any) -> np.ndarray:
+    if column not in frame.columns:
+        return np.zeros(len(frame), dtype=bool)
+    col = frame[column]
+    if isinstance(condition, dict):
+        mask = np.ones(len(frame), dtype=bool)
+        for op, value in condition.items():
+            if op not in OPERATORS:
+                raise ValueError(f"Unsupported operator in segmentation rule: {op}")
+            mask &= OPERATORS[op](col, value).to_numpy(dtype=bool, na_value=False)
+        return mask
+    if isinstance(condition, list):
+        return col.isin(condition).to_numpy(dtype=bool, na_value=False)
+    return (col == condition).to_numpy(dtype=bool, na_value=False)
+
+
+def segment_by_rules(table: CustomerTable, rules: Dict[str, Any]) -> Dict[str, CustomerTable]:
+    """
+    Evaluates LLM-provided segmentation rules as vectorized masks.
+
+    Supported rule shapes:
+        {"group_by": ["Company Size", "Department"]}
+        {"segments": [{"name": "Enterprise Sales", "where": {"Company Size": ["Enterprise"],
+                                                            "Department": "Sales",
+                                                            "Employees": {">=": 1000}}}],
+         "default": "Other"}
+
+    With "segments", each customer lands in the first matching segment and unmatched customers
+    go to "default" (dropped if no default is given).
+
+    Returns:
+        Dict[str, CustomerTable]: Segment name to the customers in it.
+    """
+    frame = table.frame
+    group_by: Optional[List[str]] = rules.get("group_by")
+    if group_by:
+        group_by = [column for column in group_by if column in frame.columns]
+        if not group_by:
+            return {"All customers": table}
+        groups = frame.groupby(group_by, observed=True, sort=False, dropna=False).indices
+        segments = {}
+        for key, positions in groups.items():
+            key = key if isinstance(key, tuple) else (key,)
+            segments[" / ".join(str(k) for k in key)] = table.take(positions)
+        return segments
+
+    rule_list = rules.get("segments", [])
+    assigned = np.full(len(frame), -1, dtype=np.int32)
+    for i, rule in enumerate(rule_list):
+        mask = np.ones(len(frame), dtype=bool)
+        for column, condition in rule.get("where", {}).items():
+            mask &= _condition_mask(frame, column, condition)
+        assigned[(assigned == -1) & mask] = i
+
+    segments = {}
+    for i, rule in enumerate(rule_list):
+        positions = np.flatnonzero(assigned == i)
+        if len(positions):
+            segments[rule.get("name", f"Segment {i + 1}")] = table.take(positions)
+    default = rules.get("default")
+    if default:
+        positions = np.flatnonzero(assigned == -1)
+        if len(positions):
+            segments[default] = table.take(positions)
+    return segments
+
+
+if __name__ == "__main__":
+    import time
+
+    print("🚀 Testing vectorized customer segmentation...")
+    n = 1_000_000
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({
+        "Name": [f"Customer {i}" for i in range(n)],
+        "Company": [f"Company {i % 5000}" for i in range(n)],
+        "Company Size": rng.choice(["SMB", "Mid-Market", "Enterprise"], n),
+        "Department": rng.choice(["Sales", "Marketing", "IT", "HR"], n),
+        "Employees": rng.integers(1, 20000, n),
+    })
+    table = CustomerTable.from_frames([frame])
+    print(f"📦 {len(table)} customers in {table.memory_usage() / 1e6:.1f} MB")
+
+    start = time.perf_counter()
+    segments = segment_by_rules(table, {
+        "segments": [
+            {"name": "Enterprise Sales", "where": {"Company Size": ["Enterprise"], "Department": "Sales"}},
+            {"name": "Large Accounts", "where": {"Employees": {">=": 10000}}},
+        ],
+        "default": "Other"
+    })
+    print(f"⏱️ Rule segmentation: {time.perf_counter() - start:.3f}s", {k: len(v) for k, v in segments.items()})
+
+    start = time.perf_counter()
+    segments = segment_by_rules(table, {"group_by": ["Company Size", "Department"]})
+    print(f"⏱️ Group-by segmentation: {time.perf_counter() - start:.3f}s ({len(segments)} segments)")
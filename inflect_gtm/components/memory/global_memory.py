@@ -1,25 +1,355 @@
-class GlobalMemory:
+import os
+import time
+import pickle
+import sqlite3
+import threading
+import itertools
+import multiprocessing
+from types import MappingProxyType
+from typing import Dict, Any, Callable, Mapping, Optional, Tuple
+
+
+MEMORY_KEYS = (
+    "customers",
+    "segment_function_code",
+    "strategies",
+    "segments",
+    "onboarding_docs",
+    "published_docs",
+    "emails_sent",
+    "meeting_summary",
+    "upcoming_events",
+)
+
+# Define storage paths
+STORE_DIR = os.path.join(os.path.dirname(__file__), "global_memory_store")
+SQLITE_PATH = os.path.join(STORE_DIR, "global_memory.db")
+
+# How often subscriptions on a shared backend check for changes made by other processes
+WATCH_INTERVAL = 0.2
+
+
+class InProcessBackend:
+    """
+    Dict-backed storage for a single process. Every key holds a (value, version) pair.
+    """
+
+    shared = False
+
     def __init__(self):
-        self.memory = {
-            "customers": None,
-            "segment_function_code": None,
-            "strategies": None,
-            "segments": None,
-            "onboarding_docs": None,
-            "emails_sent": None,
-            "meeting_summary": None,
-            "upcoming_events": None,
-        }
-
-    def set(self, key, value):
-        if key not in self.memory:
+        self.lock = threading.RLock()
+        self.data = {key: (None, 0) for key in MEMORY_KEYS}
+
+    def read(self, key: str) -> Tuple[Any, int]:
+        with self.lock:
+            return self.data[key]
+
+    def write(self, key: str, value: Any, expected_version: Optional[int] = None) -> Optional[int]:
+        """
+        Stores a value and returns its new version, or None if expected_version is stale.
+        """
+        with self.lock:
+            _, version = self.data[key]
+            if expected_version is not None and version != expected_version:
+                return None
+            self.data[key] = (value, version + 1)
+            return version + 1
+
+    def items(self) -> Dict[str, Tuple[Any, int]]:
+        with self.lock:
+            return dict(self.data)
+
+    def versions(self) -> Dict[str, int]:
+        with self.lock:
+            return {key: version for key, (_, version) in self.data.items()}
+
+
+class SQLiteBackend:
+    """
+    SQLite-backed storage that persists across restarts and is shared by every process
+    opening the same file. Values are pickled.
+    """
+
+    shared = True
+
+    def __init__(self, path: str = SQLITE_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS memory (
+                key TEXT PRIMARY KEY,
+                value BLOB,
+                version INTEGER DEFAULT 0,
+                updated_at REAL
+            )
+        """)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO memory (key, value, version, updated_at) VALUES (?, ?, 0, ?)",
+                [(key, pickle.dumps(None), time.time()) for key in MEMORY_KEYS]
+            )
+
+    def read(self, key: str) -> Tuple[Any, int]:
+        with self.lock:
+            row = self.conn.execute("SELECT value, version FROM memory WHERE key = ?", (key,)).fetchone()
+        return pickle.loads(row[0]), row[1]
+
+    def write(self, key: str, value: Any, expected_version: Optional[int] = None) -> Optional[int]:
+        blob = pickle.dumps(value)
+        with self.lock, self.conn:
+            # The conditional UPDATE is atomic across processes, so it doubles as compare-and-set
+            if expected_version is None:
+                cursor = self.conn.execute(
+                    "UPDATE memory SET value = ?, version = version + 1, updated_at = ? WHERE key = ?",
+                    (blob, time.time(), key)
+                )
+            else:
+                cursor = self.conn.execute(
+                    "UPDATE memory SET value = ?, version = version + 1, updated_at = ? WHERE key = ? AND version = ?",
+                    (blob, time.time(), key, expected_version)
+                )
+            if cursor.rowcount == 0:
+                return None
+            # Still inside the write transaction, so no other writer can bump the version in between
+            return self.conn.execute("SELECT version FROM memory WHERE key = ?", (key,)).fetchone()[0]
+
+    def items(self) -> Dict[str, Tuple[Any, int]]:
+        with self.lock:
+            rows = self.conn.execute("SELECT key, value, version FROM memory").fetchall()
+        return {key: (pickle.loads(value), version) for key, value, version in rows if key in MEMORY_KEYS}
+
+    def versions(self) -> Dict[str, int]:
+        with self.lock:
+            rows = self.conn.execute("SELECT key, version FROM memory").fetchall()
+        return {key: version for key, version in rows if key in MEMORY_KEYS}
+
+    def __getstate__(self):
+        return {"path": self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"])
+
+
+class SharedMemoryBackend:
+    """
+    Storage held by a multiprocessing Manager so worker processes share one live memory.
+    The backend (not GlobalMemory itself) is picklable: pass it to child processes and wrap
+    it with GlobalMemory(backend) there.
+    """
+
+    shared = True
+
+    def __init__(self, manager=None):
+        self.manager = manager or multiprocessing.Manager()
+        self.data = self.manager.dict({key: (None, 0) for key in MEMORY_KEYS})
+        self.lock = self.manager.Lock()
+
+    def read(self, key: str) -> Tuple[Any, int]:
+        return self.data[key]
+
+    def write(self, key: str, value: Any, expected_version: Optional[int] = None) -> Optional[int]:
+        with self.lock:
+            _, version = self.data[key]
+            if expected_version is not None and version != expected_version:
+                return None
+            self.data[key] = (value, version + 1)
+            return version + 1
+
+    def items(self) -> Dict[str, Tuple[Any, int]]:
+        return self.data.copy()
+
+    def versions(self) -> Dict[str, int]:
+        return {key: version for key, (_, version) in self.data.copy().items()}
+
+    def __getstate__(self):
+        # The manager itself stays with the process that started it; proxies travel fine
+        return {"data": self.data, "lock": self.lock}
+
+    def __setstate__(self, state):
+        self.manager = None
+        self.data = state["data"]
+        self.lock = state["lock"]
+
+
+class GlobalMemory:
+    """
+    Shared memory for agents with a fixed set of keys.
+    Each key carries a version that increases on every write, `compare_and_set` lets concurrent
+    agents update a key without lost writes, `snapshot()` returns a read-only view that later
+    writes never change, and `subscribe` notifies callbacks when a key changes.
+
+    Values are replaced, never mutated in place: treat what `get` returns as read-only.
+    """
+
+    def __init__(self, backend=None):
+        """
+        Args:
+            backend: InProcessBackend (default), SQLiteBackend or SharedMemoryBackend.
+        """
+        self.backend = backend or InProcessBackend()
+        self.condition = threading.Condition()
+        self.subscribers: Dict[int, Tuple[Optional[str], Callable]] = {}
+        self.subscription_ids = itertools.count(1)
+        self.snapshot_cache = None
+        self.watcher = None
+        self.seen_versions: Dict[str, int] = {}
+
+    def _check_key(self, key):
+        if key not in MEMORY_KEYS:
             raise KeyError(f"Invalid global memory key: {key}")
-        self.memory[key] = value
+
+    def set(self, key, value) -> int:
+        """
+        Stores a value and returns the key's new version.
+        """
+        self._check_key(key)
+        version = self.backend.write(key, value)
+        self._notify(key, value, version)
+        return version
 
     def get(self, key):
-        if key not in self.memory:
-            raise KeyError(f"Invalid global memory key: {key}")
-        return self.memory[key]
+        self._check_key(key)
+        return self.backend.read(key)[0]
+
+    def get_versioned(self, key) -> Tuple[Any, int]:
+        """
+        Returns (value, version). Version 0 means the key was never set.
+        """
+        self._check_key(key)
+        return self.backend.read(key)
+
+    def compare_and_set(self, key, value, expected_version: int) -> bool:
+        """
+        Stores the value only if the key is still at expected_version.
+        """
+        self._check_key(key)
+        version = self.backend.write(key, value, expected_version)
+        if version is None:
+            return False
+        self._notify(key, value, version)
+        return True
+
+    def update(self, key, func: Callable[[Any], Any], retries: int = 100) -> Any:
+        """
+        Atomically replaces a key's value with func(current_value), retrying on conflicts.
+        func must build a new value rather than mutate the current one.
+        """
+        for _ in range(retries):
+            value, version = self.get_versioned(key)
+            new_value = func(value)
+            if self.compare_and_set(key, new_value, version):
+                return new_value
+        raise RuntimeError(f"Too many concurrent updates to global memory key: {key}")
+
+    def snapshot(self) -> Mapping[str, Any]:
+        """
+        Returns a read-only view of every key. The view is reused until some key changes,
+        and writes after it was taken never show up in it.
+        """
+        versions = self.backend.versions()
+        cached = self.snapshot_cache
+        if cached and cached[0] == versions:
+            return cached[1]
+        items = self.backend.items()
+        view = MappingProxyType({key: value for key, (value, _) in items.items()})
+        self.snapshot_cache = ({key: version for key, (_, version) in items.items()}, view)
+        return view
 
     def dump(self):
-        return self.memory
\ No newline at end of file
+        return dict(self.snapshot())
+
+    def subscribe(self, callback: Callable[[str, Any, int], None], key: Optional[str] = None) -> int:
+        """
+        Calls callback(key, value, version) after every change to key (or to any key if None).
+        Changes made by other processes are picked up for shared backends too.
+
+        Returns:
+            int: Subscription id for `unsubscribe`.
+        """
+        if key is not None:
+            self._check_key(key)
+        with self.condition:
+            subscription_id = next(self.subscription_ids)
+            self.subscribers[subscription_id] = (key, callback)
+        if self.backend.shared:
+            self._start_watcher()
+        return subscription_id
+
+    def unsubscribe(self, subscription_id: int):
+        with self.condition:
+            self.subscribers.pop(subscription_id, None)
+
+    def wait_for(self, key, predicate: Optional[Callable[[Any], bool]] = None, timeout: Optional[float] = None) -> Any:
+        """
+        Blocks until the key holds a value accepted by predicate (by default: any value but None)
+        and returns it. Raises TimeoutError if the timeout expires first.
+        """
+        self._check_key(key)
+        predicate = predicate or (lambda value: value is not None)
+        if self.backend.shared:
+            self._start_watcher()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.condition:
+            while True:
+                value = self.get(key)
+                if predicate(value):
+                    return value
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"Timed out waiting for global memory key: {key}")
+                self.condition.wait(remaining)
+
+    def _notify(self, key, value, version):
+        with self.condition:
+            if self.seen_versions.get(key, 0) >= version:
+                return
+            self.seen_versions[key] = version
+            callbacks = [cb for sub_key, cb in self.subscribers.values() if sub_key in (None, key)]
+            self.condition.notify_all()
+        for callback in callbacks:
+            try:
+                callback(key, value, version)
+            except Exception as e:
+                print(f"❌ Global memory subscriber failed for [{key}]:", str(e))
+
+    def _start_watcher(self):
+        with self.condition:
+            if self.watcher is not None:
+                return
+            self.seen_versions.update(self.backend.versions())
+            self.watcher = threading.Thread(target=self._watch, name="global-memory-watch", daemon=True)
+            self.watcher.start()
+
+    def _watch(self):
+        # Other processes write straight to the shared backend, so their changes are detected here
+        while True:
+            time.sleep(WATCH_INTERVAL)
+            try:
+                versions = self.backend.versions()
+            except Exception:
+                continue
+            for key, version in versions.items():
+                if version > self.seen_versions.get(key, 0):
+                    value, version = self.backend.read(key)
+                    self._notify(key, value, version)
+
+
+if __name__ == "__main__":
+    from concurrent.futures import ThreadPoolExecutor
+
+    print("🚀 Testing global memory...")
+    memory = GlobalMemory()
+    memory.subscribe(lambda key, value, version: print(f"🔔 {key} -> v{version}"), key="segments")
+
+    before = memory.snapshot()
+    memory.set("segments", {"Enterprise": []})
+    print("📸 Snapshot unchanged:", before["segments"] is None)
+
+    memory.set("emails_sent", [])
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for i in range(100):
+            executor.submit(memory.update, "emails_sent", lambda sent, i=i: sent + [i])
+    print("📧 Concurrent appends:", len(memory.get("emails_sent")), "version", memory.get_versioned("emails_sent")[1])
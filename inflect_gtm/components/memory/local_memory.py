@@ -1,9 +1,213 @@
+import os
+import json
+import time
+import threading
+from collections import deque
+from typing import Dict, Any, Callable, List, Optional
+
+
+# Default conversation budget per agent, in estimated tokens
+DEFAULT_MAX_TOKENS = 4000
+
+# A single message may use at most this share of the budget; longer content is truncated
+MAX_MESSAGE_SHARE = 0.25
+
+# Budget for the rolling summary of evicted turns
+SUMMARY_TOKENS = 500
+
+# Characters kept per evicted message by the default (extractive) summarizer
+SUMMARY_LINE_CHARS = 200
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate (~4 characters per token for English text), good enough for budgeting.
+    """
+    return len(text) // 4 + 1
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    max_chars = max_tokens * 4
+    if len(text) <= max_chars:
+        return text
+    marker = f"\n...[truncated {len(text) - max_chars} chars]...\n"
+    head = max_chars * 3 // 4
+    return text[:head] + marker + text[-(max_chars - head):]
+
+
+class Message:
+    """
+    One conversation turn. __slots__ keeps per-message overhead to a few pointers.
+    """
+
+    __slots__ = ("role", "content", "tokens", "timestamp")
+
+    def __init__(self, role: str, content: str, tokens: int, timestamp: float):
+        self.role = role
+        self.content = content
+        self.tokens = tokens
+        self.timestamp = timestamp
+
+    def to_dict(self) -> Dict[str, str]:
+        return {"role": self.role, "content": self.content}
+
+
+def extractive_summary(summary: str, messages: List[Message], max_tokens: int = SUMMARY_TOKENS) -> str:
+    """
+    Default summarizer: appends the opening of each evicted message to the running summary
+    and keeps the most recent part that fits the summary budget.
+    """
+    lines = [summary] if summary else []
+    for message in messages:
+        text = " ".join(message.content.split())
+        if len(text) > SUMMARY_LINE_CHARS:
+            text = text[:SUMMARY_LINE_CHARS] + "..."
+        lines.append(f"- {message.role}: {text}")
+    combined = "\n".join(lines)
+    max_chars = max_tokens * 4
+    if len(combined) > max_chars:
+        combined = combined[-max_chars:].split("\n", 1)[-1]
+    return combined
+
+
+def llm_summarizer(model: str = "llama3.1", max_tokens: int = SUMMARY_TOKENS) -> Callable[[str, List[Message]], str]:
+    """
+    Builds a summarizer that asks the LLM to fold evicted turns into the running summary.
+    """
+    def summarize(summary: str, messages: List[Message]) -> str:
+        from inflect_gtm.components.utils.llm import call_llm
+
+        turns = "\n".join(f"{m.role}: {_truncate(m.content, max_tokens)}" for m in messages)
+        prompt = f"""
+Current summary of the conversation:
+{summary or "(empty)"}
+
+New turns:
+{turns}
+
+Rewrite the summary to include the new turns. Keep decisions, facts and open tasks, drop raw data. Use at most {max_tokens * 3 // 4} words.
+"""
+        return _truncate(call_llm(prompt, model=model, temperature=0.0).strip(), max_tokens)
+
+    return summarize
+
+
 class LocalMemory:
-    def __init__(self):
-        self.history = []
+    """
+    Per-agent conversation memory bounded by a token budget.
+    Messages live in a ring buffer; when the budget is exceeded the oldest turns are evicted,
+    optionally appended to a JSONL spill file, and folded into a rolling summary that `get()`
+    returns ahead of the recent turns. Prompt size therefore stays flat over long sessions.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        spill_path: Optional[str] = None,
+        summarizer: Optional[Callable[[str, List[Message]], str]] = extractive_summary,
+    ):
+        """
+        Args:
+            max_tokens (int): Token budget for the buffered messages.
+            spill_path (str): Optional JSONL file receiving every evicted message in full.
+            summarizer (Callable): (summary, evicted_messages) -> new summary, or None to drop
+                evicted turns without summarizing.
+        """
+        self.max_tokens = max_tokens
+        self.max_message_tokens = max(1, int(max_tokens * MAX_MESSAGE_SHARE))
+        self.spill_path = spill_path
+        self.summarizer = summarizer
+        self.messages = deque()
+        self.tokens = 0
+        self.summary = ""
+        self.evicted: List[Message] = []
+        self.evicted_tokens = 0
+        self.lock = threading.Lock()
+        self.summary_lock = threading.Lock()
 
     def add(self, role, content):
-        self.history.append({"role": role, "content": content})
+        content = content if isinstance(content, str) else str(content)
+        now = time.time()
+        with self.lock:
+            if self.spill_path and estimate_tokens(content) > self.max_message_tokens:
+                # Keep the untruncated text on disk before shortening it in memory
+                self._spill([Message(role, content, estimate_tokens(content), now)])
+            content = _truncate(content, self.max_message_tokens)
+            message = Message(role, content, estimate_tokens(content), now)
+            self.messages.append(message)
+            self.tokens += message.tokens
+            self._evict()
+            backlog = self.evicted_tokens
+        # Summarization is lazy, but the backlog of evicted turns is still bounded by the budget
+        if backlog > self.max_tokens:
+            self.get_summary()
+
+    def _evict(self):
+        evicted = []
+        while self.tokens > self.max_tokens and len(self.messages) > 1:
+            message = self.messages.popleft()
+            self.tokens -= message.tokens
+            evicted.append(message)
+        if not evicted:
+            return
+        if self.spill_path:
+            self._spill(evicted)
+        if self.summarizer:
+            # Summaries are built lazily on read so adds rarely wait on a (possibly LLM) summarizer
+            self.evicted.extend(evicted)
+            self.evicted_tokens += sum(message.tokens for message in evicted)
+
+    def _spill(self, messages: List[Message]):
+        os.makedirs(os.path.dirname(os.path.abspath(self.spill_path)), exist_ok=True)
+        with open(self.spill_path, "a") as f:
+            for message in messages:
+                f.write(json.dumps({"role": message.role, "content": message.content, "timestamp": message.timestamp}) + "\n")
+
+    def get_summary(self) -> str:
+        # A separate lock lets add() continue while a slow summarizer runs
+        with self.summary_lock:
+            with self.lock:
+                evicted, self.evicted = self.evicted, []
+                self.evicted_tokens = 0
+            if evicted:
+                self.summary = self.summarizer(self.summary, evicted)
+            return self.summary
 
     def get(self):
-        return self.history
\ No newline at end of file
+        """
+        Returns the recent turns as {"role", "content"} dicts, preceded by a system message
+        summarizing older turns once any have been evicted.
+        """
+        summary = self.get_summary() if self.summarizer else ""
+        with self.lock:
+            history = [message.to_dict() for message in self.messages]
+        if summary:
+            history.insert(0, {"role": "system", "content": f"Summary of earlier conversation:\n{summary}"})
+        return history
+
+    @property
+    def history(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            return [message.to_dict() for message in self.messages]
+
+    def clear(self):
+        with self.lock:
+            self.messages.clear()
+            self.tokens = 0
+            self.summary = ""
+            self.evicted = []
+            self.evicted_tokens = 0
+
+    def __len__(self):
+        return len(self.messages)
+
+
+if __name__ == "__main__":
+    print("🚀 Testing bounded local memory...")
+    memory = LocalMemory(max_tokens=300)
+    for i in range(1000):
+        memory.add("user", f"Segment customers batch {i}: " + json.dumps([{"Name": f"Customer {j}"} for j in range(50)]))
+        memory.add("assistant", f"Segmented batch {i} into Enterprise and SMB.")
+    history = memory.get()
+    print(f"🧠 {len(memory)} buffered messages, {memory.tokens} tokens")
+    print("📝 Summary:", history[0]["content"][:300])
@@ -0,0 +1,112 @@
+import os
+import json
+import time
+import hashlib
+from typing import Dict, Any, List, Optional
+
+
+# Define storage paths
+STORE_DIR = os.path.join(os.path.dirname(__file__), "segmentation_cache")
+
+# Columns with at most this many distinct values in the sample are treated as categorical
+MAX_CATEGORIES = 20
+
+
+def _column_kind(values: List[Any]) -> str:
+    present = [v for v in values if v not in ("", None)]
+    if not present:
+        return "empty"
+    if all(isinstance(v, bool) for v in present):
+        return "bool"
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        return "numeric"
+    distinct = set(map(str, present))
+    # Repeated values with few distinct levels look like a category (e.g. Company Size)
+    if len(distinct) <= MAX_CATEGORIES and len(distinct) < len(present):
+        return "categorical"
+    return "text"
+
+
+def fingerprint(sample: List[Dict[str, Any]]) -> str:
+    """
+    Fingerprints a customer sample by its columns, each column's kind and, for categorical
+    columns, the set of levels. Identifier-like columns (names, emails) only contribute their
+    kind, so a fresh export of the same sheet maps to the same fingerprint.
+    """
+    columns = sorted({key for record in sample for key in record})
+    signature = []
+    for column in columns:
+        values = [record.get(column) for record in sample]
+        kind = _column_kind(values)
+        levels = sorted({str(v) for v in values if v not in ("", None)}) if kind == "categorical" else []
+        signature.append([column, kind, levels])
+    return hashlib.sha256(json.dumps(signature).encode("utf-8")).hexdigest()[:32]
+
+
+class SegmentationCache:
+    """
+    Persistent cache of validated segmentation code and strategies keyed by schema fingerprint.
+    A hit skips both LLM generations; the cached code still runs only inside the
+    SegmentationExecutor sandbox, so a hit costs a sandboxed validation run.
+    """
+
+    def __init__(self, store_dir: str = STORE_DIR):
+        self.store_dir = store_dir
+        os.makedirs(store_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.store_dir, f"{key}.json")
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns {"code", "strategies"} for a fingerprint, or None on a miss.
+        """
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def store(self, key: str, code: str, strategies: Dict[str, Any]):
+        path = self._path(key)
+        # Write to a temp file and rename so a crash never leaves a half-written entry
+        with open(path + ".tmp", "w") as f:
+            json.dump({"code": code, "strategies": strategies, "created_at": time.time()}, f)
+        os.replace(path + ".tmp", path)
+
+    def invalidate(self, key: str):
+        path = self._path(key)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def validate(self, entry: Dict[str, Any], sample: List[Dict[str, Any]], executor) -> bool:
+        """
+        Checks that cached code still segments the current sample: it must return a dict of
+        lists covering every sample record. The code runs through `executor` (a
+        SegmentationExecutor), never in this process, since the cache directory is not trusted.
+        """
+        try:
+            segments = executor.run(entry["code"], [dict(record) for record in sample])
+        except Exception:
+            return False
+        covered = sum(len(group) for group in segments.values() if isinstance(group, list))
+        return covered >= len(sample)
+
+
+if __name__ == "__main__":
+    print("🚀 Testing segmentation cache...")
+    sample = [
+        {"Name": "Sarah", "Company Size": "Enterprise", "Department": "Sales"},
+        {"Name": "James", "Company Size": "SMB", "Department": "Sales"},
+        {"Name": "Mina", "Company Size": "Enterprise", "Department": "IT"},
+    ]
+    key = fingerprint(sample)
+    cache = SegmentationCache()
+    cache.store(key, "def segment_customers(customers):\n    return {'all': customers}\n", {"all": "General onboarding"})
+    entry = cache.lookup(key)
+    print("🔑 Fingerprint:", key)
+    from inflect_gtm.components.utils.code_executor import SegmentationExecutor
+
+    with SegmentationExecutor(max_workers=1) as executor:
+        print("✅ Valid:", cache.validate(entry, sample, executor))
+    cache.invalidate(key)
@@ -1,9 +1,9 @@
 import os
 import pickle
+import threading
 from typing import List
-import numpy as np
-import faiss
-from sentence_transformers import SentenceTransformer
+from inflect_gtm.components.rag.vector_store import get_embedding_model
+from inflect_gtm.components.utils.tracing import traced, set_attributes
 
 
 # Define paths
@@ -11,20 +11,56 @@ BASE_DIR = os.path.dirname(__file__)
 STORE_DIR = os.path.join(BASE_DIR, "faiss_store")
 INDEX_PATH = os.path.join(STORE_DIR, "index.faiss")
 METADATA_PATH = os.path.join(STORE_DIR, "metadata.pkl")
-MODEL_NAME = "all-MiniLM-L6-v2"
 
-# Load embedding model
-embedding_model = SentenceTransformer(MODEL_NAME)
+# The index and metadata are read on the first query (or warmup), not at import, and re-read
+# whenever vector_store.save replaces them (e.g. after a Gmail sync). They are swapped as one
+# (index, metadata) tuple, so a query never pairs one store's index with another's metadata
+_store = None
+_loaded_version = None
+_load_lock = threading.Lock()
 
-# Load vector store index and metadata
-if not os.path.exists(INDEX_PATH) or not os.path.exists(METADATA_PATH):
-    raise FileNotFoundError("❌ Vector store not found. Please run vector_store.py to build the index first.")
 
-index = faiss.read_index(INDEX_PATH)
+def _store_version():
+    # save() replaces the metadata file last, so a new inode or mtime means a new store
+    try:
+        stat = os.stat(METADATA_PATH)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
 
-with open(METADATA_PATH, "rb") as f:
-    metadata_store = pickle.load(f)
 
+def _load_index():
+    global _store, _loaded_version
+    version = _store_version()
+    if _store is not None and version == _loaded_version:
+        return
+    with _load_lock:
+        if _store is not None and version == _loaded_version:
+            return
+        if version is None or not os.path.exists(INDEX_PATH):
+            if _store is not None:
+                return
+            raise FileNotFoundError("❌ Vector store not found. Please run vector_store.py to build the index first.")
+        import faiss
+
+        with open(METADATA_PATH, "rb") as f:
+            new_metadata = pickle.load(f)
+        new_index = faiss.read_index(INDEX_PATH)
+        if new_index.ntotal != len(new_metadata) and _store is not None:
+            # Caught between the two file replacements; keep serving the previous pair
+            return
+        _store, _loaded_version = (new_index, new_metadata), version
+
+
+def warmup():
+    """
+    Loads the embedding model and the index ahead of the first query.
+    """
+    get_embedding_model()
+    _load_index()
+
+
+@traced("rag.query_similar_documents")
 def query_similar_documents(query: str, top_k: int = 3) -> List[str]:
     """
     Retrieve the top-k most similar documents to the input query.
@@ -36,13 +72,16 @@ def query_similar_documents(query: str, top_k: int = 3) -> List[str]:
     Returns:
         List[str]: List of matched document texts.
     """
-    query_vec = embedding_model.encode([query], convert_to_numpy=True).astype("float32")
-    distances, indices = index.search(query_vec, top_k)
+    _load_index()
+    current_index, current_metadata = _store
+    query_vec = get_embedding_model().encode([query], convert_to_numpy=True).astype("float32")
+    distances, indices = current_index.search(query_vec, top_k)
 
     results = []
     for idx in indices[0]:
-        if idx < len(metadata_store):
-            results.append(metadata_store[idx].get("text", ""))
+        if 0 <= idx < len(current_metadata):
+            results.append(current_metadata[idx].get("text", ""))
+    set_attributes(top_k=top_k, results=len(results))
     return results
 
 
@@ -1,8 +1,7 @@
 import os
-import faiss
 import pickle
-from typing import List, Dict
-from sentence_transformers import SentenceTransformer
+import threading
+from typing import Any, List, Dict, Iterable, Set
 
 
 # Define storage paths
@@ -10,14 +9,33 @@ STORE_DIR = os.path.join(os.path.dirname(__file__), "faiss_store")
 INDEX_PATH = os.path.join(STORE_DIR, "index.faiss")
 METADATA_PATH = os.path.join(STORE_DIR, "metadata.pkl")
 
-# Load the embedding model (384-dimensional embeddings)
-embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
-
-# Initialize FAISS index with appropriate dimension
+# Embedding model (384-dimensional embeddings)
+MODEL_NAME = "all-MiniLM-L6-v2"
 dim = 384
-index = faiss.IndexFlatL2(dim)  # L2 (Euclidean) distance
+
+# The model and index are loaded on first use, so importing this module stays cheap
+_embedding_model = None
+_model_lock = threading.Lock()
+index = None
 metadata_store = []  # To store metadata associated with each vector
 
+# Metadata key -> {value: positions in the index}, built on first lookup and kept in step with writes
+_positions: Dict[str, Dict[Any, List[int]]] = {}
+
+
+def get_embedding_model():
+    """
+    Returns the process-wide embedding model, loading it on the first call.
+    """
+    global _embedding_model
+    if _embedding_model is None:
+        with _model_lock:
+            if _embedding_model is None:
+                from sentence_transformers import SentenceTransformer
+
+                _embedding_model = SentenceTransformer(MODEL_NAME)
+    return _embedding_model
+
 
 def load_or_initialize():
     """
@@ -25,6 +43,8 @@ def load_or_initialize():
     otherwise initializes empty index and metadata store.
     """
     global index, metadata_store
+    import faiss
+
     os.makedirs(STORE_DIR, exist_ok=True)
 
     if os.path.exists(INDEX_PATH) and os.path.exists(METADATA_PATH):
@@ -34,15 +54,31 @@ def load_or_initialize():
             metadata_store = pickle.load(f)
     else:
         print("🆕 Initializing new FAISS index and metadata...")
+        index = faiss.IndexFlatL2(dim)  # L2 (Euclidean) distance
+        metadata_store = []
+    _positions.clear()
+
+
+def ensure_loaded():
+    """
+    Loads the index on first use only; this process is assumed to be the only writer.
+    """
+    if index is None:
+        load_or_initialize()
 
 
 def save():
     """
-    Saves the current FAISS index and metadata to disk.
+    Saves the current FAISS index and metadata to disk. Each file is replaced atomically,
+    metadata last, so the retriever reloads once both are in place.
     """
-    faiss.write_index(index, INDEX_PATH)
-    with open(METADATA_PATH, "wb") as f:
+    import faiss
+
+    faiss.write_index(index, INDEX_PATH + ".tmp")
+    os.replace(INDEX_PATH + ".tmp", INDEX_PATH)
+    with open(METADATA_PATH + ".tmp", "wb") as f:
         pickle.dump(metadata_store, f)
+    os.replace(METADATA_PATH + ".tmp", METADATA_PATH)
 
 
 def add_documents(texts: List[str], metadatas: List[Dict] = None):
@@ -53,18 +89,66 @@ def add_documents(texts: List[str], metadatas: List[Dict] = None):
         texts: List of raw text documents to embed and store.
         metadatas: Optional list of dictionaries containing metadata for each document.
     """
-    global metadata_store
+    ensure_loaded()
     if metadatas is None:
         metadatas = [{} for _ in texts]
 
-    embeddings = embedding_model.encode(texts, convert_to_numpy=True)
+    embeddings = get_embedding_model().encode(texts, convert_to_numpy=True)
     index.add(embeddings)
     for text, meta in zip(texts, metadatas):
         meta["text"] = text
+        for key, positions in _positions.items():
+            if key in meta:
+                positions.setdefault(meta[key], []).append(len(metadata_store))
         metadata_store.append(meta)
     save()
 
 
+def _position_map(key: str) -> Dict[Any, List[int]]:
+    if key not in _positions:
+        positions = {}
+        for i, meta in enumerate(metadata_store):
+            if key in meta:
+                positions.setdefault(meta[key], []).append(i)
+        _positions[key] = positions
+    return _positions[key]
+
+
+def stored_values(key: str, values: Iterable) -> Set:
+    """
+    Returns which of `values` already appear as metadata[key] of a stored document.
+    """
+    ensure_loaded()
+    positions = _position_map(key)
+    return {value for value in values if value in positions}
+
+
+def remove_documents(key: str, values: Iterable) -> int:
+    """
+    Removes every document whose metadata[key] is one of `values`.
+
+    Returns:
+        int: Number of documents removed.
+    """
+    global metadata_store
+    ensure_loaded()
+    by_value = _position_map(key)
+    positions = sorted(i for value in set(values) for i in by_value.get(value, []))
+    if not positions:
+        return 0
+
+    import numpy as np
+
+    # A flat index renumbers the remaining vectors in order, so metadata stays aligned
+    index.remove_ids(np.array(positions, dtype="int64"))
+    removed = set(positions)
+    metadata_store = [meta for i, meta in enumerate(metadata_store) if i not in removed]
+    # Every later position shifted, so the maps are rebuilt on the next lookup
+    _positions.clear()
+    save()
+    return len(positions)
+
+
 # Unit test
 if __name__ == "__main__":
     print("🚀 Testing FAISS Vector Store...")
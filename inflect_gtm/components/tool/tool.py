@@ -1,12 +1,88 @@
-from typing import Dict, Any, Callable
+import asyncio
+import functools
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, Callable, Iterable, List, Optional
+from inflect_gtm.components.utils.tracing import traced_method, in_context
+
+
+# Worker threads shared by every tool's batched calls in the process
+TOOL_POOL_WORKERS = 16
+
+# Calls of one tool in flight at once unless the tool sets its own max_concurrency
+DEFAULT_TOOL_CONCURRENCY = 4
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_tool_pool() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=TOOL_POOL_WORKERS, thread_name_prefix="tool")
+    return _pool
+
+
+class _Lane:
+    """
+    Per-tool admission onto the shared pool: at most `limit` calls run at once and the rest
+    wait here in submission order, so waiting calls never occupy a pool thread.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.active = 0
+        self.pending: deque = deque()
+        self.lock = threading.Lock()
+
+    def submit(self, call: Callable[[], Any]) -> Future:
+        future = Future()
+        with self.lock:
+            if self.active >= self.limit:
+                self.pending.append((call, future))
+                return future
+            self.active += 1
+        self._start(call, future)
+        return future
+
+    def _start(self, call: Callable[[], Any], future: Future):
+        get_tool_pool().submit(self._execute, call, future)
+
+    def _execute(self, call: Callable[[], Any], future: Future):
+        # Calls cancelled while waiting are skipped
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(call())
+            except BaseException as e:
+                future.set_exception(e)
+        with self.lock:
+            if self.pending:
+                call, future = self.pending.popleft()
+            else:
+                self.active -= 1
+                return
+        self._start(call, future)
+
+
+_lanes: Dict[str, _Lane] = {}
+_lanes_lock = threading.Lock()
 
 
 class Tool:
     """
     Tool class for deterministic functions usable by agents.
     This is the parent class for all tools (e.g., Gmail, Google Docs).
+
+    Besides `run`, every tool can run batches: `run_many` and `arun_many` execute `run` for many
+    contexts on a shared thread pool, at most `max_concurrency` at once per tool name, and
+    return results in input order with failures captured per item.
     """
 
+    max_concurrency: int = DEFAULT_TOOL_CONCURRENCY
+
     def __init__(self, name: str, function: Callable[[Dict[str, Any]], Any]):
         """
         Initializes the tool.
@@ -18,6 +94,12 @@ class Tool:
         self.name = name
         self.function = function
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "run" in cls.__dict__:
+            cls.run = traced_method("tool")(cls.__dict__["run"])
+
+    @traced_method("tool")
     def run(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """
         Executes the tool.
@@ -31,6 +113,68 @@ class Tool:
         output = self.function(context)
         return {self.name: output}
 
+    def _lane(self) -> _Lane:
+        # Lanes are keyed by name so separate instances of a tool share one limit (and quota)
+        lane = _lanes.get(self.name)
+        if lane is None:
+            with _lanes_lock:
+                lane = _lanes.setdefault(self.name, _Lane(self.max_concurrency))
+        return lane
+
+    def submit(self, context: Dict[str, Any]) -> Future:
+        """
+        Schedules one `run(context)` on the shared tool pool.
+
+        Returns:
+            Future: Resolves to the run's output.
+        """
+        # Bound to the caller's context so the run's span nests under the caller's trace
+        return self._lane().submit(in_context(functools.partial(self.run, context)))
+
+    def run_many(self, contexts: Iterable[Dict[str, Any]], return_exceptions: bool = True) -> List[Any]:
+        """
+        Runs the tool once per context, concurrently.
+
+        Args:
+            contexts (Iterable[Dict[str, Any]]): One context per call.
+            return_exceptions (bool): Put a failed call's exception in its result slot instead
+                of raising it. When False, the first failure (in input order) is raised and
+                calls that have not started yet are cancelled.
+
+        Returns:
+            List[Any]: Outputs (or exceptions) in the order of `contexts`.
+        """
+        futures = [self.submit(context) for context in contexts]
+        results = []
+        for i, future in enumerate(futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                if not return_exceptions:
+                    for pending in futures[i + 1:]:
+                        pending.cancel()
+                    raise
+                results.append(e)
+        return results
+
+    async def arun(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async `run`: executes on the shared tool pool without blocking the event loop.
+        """
+        return await asyncio.wrap_future(self.submit(context))
+
+    async def arun_many(self, contexts: Iterable[Dict[str, Any]], return_exceptions: bool = True) -> List[Any]:
+        """
+        Async `run_many`: outputs (or exceptions) in the order of `contexts`.
+        """
+        futures = [self.submit(context) for context in contexts]
+        try:
+            return await asyncio.gather(*(asyncio.wrap_future(f) for f in futures), return_exceptions=return_exceptions)
+        finally:
+            # Calls that have not started are dropped if the caller fails fast or is cancelled
+            for future in futures:
+                future.cancel()
+
 
 # Unit test
 if __name__ == "__main__":
@@ -39,4 +183,13 @@ if __name__ == "__main__":
 
     echo_tool = Tool(name="echo_tool", function=dummy_tool_function)
     result = echo_tool.run({"input": "Hello from test"})
-    print("Tool Output:", result)
\ No newline at end of file
+    print("Tool Output:", result)
+
+    def flaky_tool_function(context):
+        if context["input"] == 3:
+            raise ValueError("bad input")
+        return context["input"] * 2
+
+    flaky_tool = Tool(name="flaky_tool", function=flaky_tool_function)
+    print("Batch Output:", flaky_tool.run_many([{"input": i} for i in range(6)]))
+    print("Async Batch Output:", asyncio.run(flaky_tool.arun_many([{"input": i} for i in range(6)])))
\ No newline at end of file
@@ -0,0 +1,223 @@
+import os
+import time
+import hashlib
+import itertools
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Iterable, List, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; limits are skipped there
+    resource = None
+
+
+FUNCTION_NAME = "segment_customers"
+
+# Compiled segmentation functions, cached per worker process by code hash
+_compiled_functions = {}
+_cpu_seconds = None
+
+
+def _init_worker(cpu_seconds: Optional[int], memory_bytes: Optional[int]):
+    global _cpu_seconds
+    _cpu_seconds = cpu_seconds
+    if resource and memory_bytes:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+
+
+def _segment_shard(code: str, code_hash: str, shard: List[Dict[str, Any]]) -> Dict[str, Any]:
+    if resource and _cpu_seconds:
+        # RLIMIT_CPU counts the whole process lifetime, so the limit is re-armed per shard
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        used = int(usage.ru_utime + usage.ru_stime)
+        resource.setrlimit(resource.RLIMIT_CPU, (used + _cpu_seconds, used + _cpu_seconds + 1))
+
+    func = _compiled_functions.get(code_hash)
+    if func is None:
+        namespace = {}
+        exec(compile(code, f"<{FUNCTION_NAME}>", "exec"), namespace)
+        func = namespace[FUNCTION_NAME]
+        _compiled_functions[code_hash] = func
+    return func(shard)
+
+
+def merge_segments(segments: dict, partial: dict) -> dict:
+    """
+    Merges the segments produced for one shard of customers into the running result.
+
+    Raises:
+        ValueError: A group is not a list of customers (e.g. a count or a summary dict), which
+            cannot be combined across shards.
+    """
+    for segment, group in partial.items():
+        if not isinstance(group, list):
+            raise ValueError(
+                f"Segment '{segment}' is a {type(group).__name__}, not a list of customers, so "
+                f"sharded results cannot be merged; return lists or raise shard_size above the customer count."
+            )
+        segments.setdefault(segment, []).extend(group)
+    return segments
+
+
+class SegmentationTimeout(Exception):
+    pass
+
+
+class SegmentationWorkerError(Exception):
+    pass
+
+
+class SegmentationExecutor:
+    """
+    Runs LLM-generated `segment_customers` code in a pool of worker processes.
+    Each worker runs under CPU-time and address-space limits, customers are sharded across
+    workers, and a run that exceeds its deadline tears the pool down instead of hanging the host.
+    A worker killed by its limits breaks the pool, which fails the run right away.
+
+    Sharding means the function sees one shard at a time, so it must segment customers
+    independently of each other (which the generated per-row logic does) and return lists
+    of customers; other group values are only accepted when everything fits in one shard.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        shard_size: int = 1000,
+        cpu_seconds: int = 30,
+        memory_mb: int = 1024,
+        timeout: float = 300,
+    ):
+        """
+        Args:
+            max_workers (int): Worker processes. Defaults to the CPU count.
+            shard_size (int): Customers sent to a worker per task.
+            cpu_seconds (int): CPU-time limit per shard.
+            memory_mb (int): Address-space limit per worker process.
+            timeout (float): Wall-clock limit for a whole run.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.shard_size = shard_size
+        self.cpu_seconds = cpu_seconds
+        self.memory_bytes = memory_mb * 1024 * 1024
+        self.timeout = timeout
+        self.pool = None
+
+    def _get_pool(self):
+        if self.pool is None:
+            # spawn keeps workers free of the parent's threads and open connections
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.cpu_seconds, self.memory_bytes)
+            )
+        return self.pool
+
+    def compile(self, code: str):
+        """
+        Compiles the generated code once in the parent to reject syntax errors before dispatch.
+        """
+        code_obj = compile(code, f"<{FUNCTION_NAME}>", "exec")
+        if FUNCTION_NAME not in code_obj.co_names:
+            raise ValueError(f"Generated code does not define {FUNCTION_NAME}.")
+        return code_obj
+
+    def run(self, code: str, customers: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Segments customers with the generated code and merges the per-shard results in order.
+
+        Args:
+            code (str): Source defining `segment_customers(customers) -> dict`.
+            customers (Iterable[Dict[str, Any]]): Customer records; may be a lazy iterator.
+
+        Returns:
+            Dict[str, Any]: Merged segments.
+        """
+        self.compile(code)
+        code_hash = hashlib.sha256(code.encode("utf-8")).hexdigest()
+        pool = self._get_pool()
+        deadline = time.monotonic() + self.timeout
+
+        customers = iter(customers)
+        shards = iter(lambda: list(itertools.islice(customers, self.shard_size)), [])
+
+        # At most two shards per worker are in flight, so streamed input stays bounded in memory
+        in_flight = deque()
+        segments = {}
+        shard_count = 0
+        first = None
+
+        def collect(partial):
+            # A single shard's result is returned as is; merging starts with the second one
+            nonlocal shard_count, first
+            shard_count += 1
+            if shard_count == 1:
+                first = partial
+                return
+            if shard_count == 2:
+                merge_segments(segments, first)
+            merge_segments(segments, partial)
+
+        try:
+            for shard in shards:
+                in_flight.append(pool.submit(_segment_shard, code, code_hash, shard))
+                if len(in_flight) >= 2 * self.max_workers:
+                    collect(self._wait(in_flight.popleft(), deadline))
+            while in_flight:
+                collect(self._wait(in_flight.popleft(), deadline))
+        except BaseException:
+            self.terminate()
+            raise
+        return first if shard_count == 1 else segments
+
+    def _wait(self, future, deadline: float):
+        remaining = deadline - time.monotonic()
+        try:
+            return future.result(timeout=max(0, remaining))
+        except FutureTimeoutError:
+            raise SegmentationTimeout(f"Segmentation exceeded {self.timeout}s.")
+        except BrokenProcessPool:
+            raise SegmentationWorkerError("A segmentation worker was killed, likely by its CPU or memory limit.")
+
+    def terminate(self):
+        """
+        Kills all workers immediately; the next run starts a fresh pool.
+        """
+        if self.pool is not None:
+            # ProcessPoolExecutor has no public way to stop running tasks, so its workers are killed directly
+            processes = list((self.pool._processes or {}).values())
+            for process in processes:
+                process.terminate()
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            for process in processes:
+                process.join()
+            self.pool = None
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+if __name__ == "__main__":
+    print("🚀 Testing sandboxed segmentation executor...")
+    sample_code = """
+def segment_customers(customers):
+    segments = {}
+    for c in customers:
+        segments.setdefault(c["Company Size"], []).append(c)
+    return segments
+"""
+    customers = ({"Name": f"Customer {i}", "Company Size": ["SMB", "Mid", "Enterprise"][i % 3]} for i in range(10000))
+    with SegmentationExecutor(shard_size=500) as executor:
+        result = executor.run(sample_code, customers)
+    print({segment: len(group) for segment, group in result.items()})
@@ -0,0 +1,25 @@
+import os
+import threading
+
+
+# Repository root, where .env, credentials.json and the token files live
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
+
+_loaded = False
+_lock = threading.Lock()
+
+
+def load_env():
+    """
+    Loads PROJECT_ROOT/.env into the environment once per process; later calls are no-ops.
+    """
+    global _loaded
+    if _loaded:
+        return
+    with _lock:
+        if _loaded:
+            return
+        from dotenv import load_dotenv
+
+        load_dotenv(dotenv_path=os.path.join(PROJECT_ROOT, ".env"))
+        _loaded = True
@@ -1,9 +1,10 @@
 import subprocess
-import ollama
 import json
 from typing import Optional
+from inflect_gtm.components.utils.tracing import traced, set_attributes
 
 
+@traced("llm.call")
 def call_llm(
     prompt: Optional[str] = "",
     model: str = "llama3.1",
@@ -29,14 +30,17 @@ def call_llm(
     if instruction or context:
         context_str = json.dumps(context, indent=2) if context else ""
         prompt = f"{instruction}\n\nContext:\n{context_str}".strip()
+    set_attributes(model=model, chat=chat, prompt_chars=len(prompt or ""))
 
     if chat:
+        import ollama  # Deferred: importing the client costs startup time even when only the CLI is used
+
         response = ollama.chat(
             model=model,
             messages=[{"role": "user", "content": prompt}],
             options={"temperature": temperature}
         )
-        return response["message"]["content"]
+        output = response["message"]["content"]
     else:
         result = subprocess.run(
             ["ollama", "run", model, prompt],
@@ -44,4 +48,6 @@ def call_llm(
             text=True,
             timeout=30
         )
-        return result.stdout.strip()
\ No newline at end of file
+        output = result.stdout.strip()
+    set_attributes(response_chars=len(output))
+    return output
\ No newline at end of file
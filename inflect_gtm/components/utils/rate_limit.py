@@ -0,0 +1,60 @@
+import asyncio
+import random
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket used to pace calls against API quotas.
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        """
+        Args:
+            rate (float): Tokens added per second.
+            capacity (float): Maximum burst size. Defaults to one second of tokens.
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """
+        Takes `tokens` from the bucket and returns how long the caller must wait before using them.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= tokens
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self, tokens: float = 1.0):
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1.0):
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def penalize(self, seconds: float):
+        """
+        Drains the bucket so no tokens are handed out for `seconds` (e.g. after a Retry-After).
+        """
+        with self.lock:
+            self.tokens = min(self.tokens, -seconds * self.rate)
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 64.0) -> float:
+    """
+    Exponential backoff with full jitter: a random delay in [0, min(cap, base * 2^attempt)].
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
@@ -0,0 +1,399 @@
+import os
+import sys
+import json
+import time
+import queue
+import inspect
+import random
+import atexit
+import cProfile
+import functools
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, List, Optional
+
+
+# Exporter: "off" (default), "jsonl" or "otlp"
+TRACE_EXPORTER = os.getenv("INFLECT_TRACE", "off").lower()
+
+# Share of requests (root spans) that are traced
+TRACE_SAMPLE_RATE = float(os.getenv("INFLECT_TRACE_SAMPLE_RATE", "1.0"))
+
+# Share of traced requests that are also profiled with cProfile
+PROFILE_SAMPLE_RATE = float(os.getenv("INFLECT_PROFILE_RATE", "0"))
+
+# Define storage paths
+TRACE_DIR = os.getenv("INFLECT_TRACE_DIR", os.path.join(os.path.dirname(__file__), "traces"))
+TRACE_FILE = os.path.join(TRACE_DIR, "traces.jsonl")
+PROFILE_DIR = os.path.join(TRACE_DIR, "profiles")
+
+# OTLP/HTTP JSON endpoint of a collector (or any stand-in accepting the same payload)
+OTLP_ENDPOINT = os.getenv("INFLECT_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+SERVICE_NAME = os.getenv("INFLECT_SERVICE_NAME", "inflect-gtm")
+
+# Finished spans are exported in batches of this size (or when the exporter goes idle)
+EXPORT_BATCH_SIZE = 256
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("inflect_current_span", default=None)
+
+# Marks work inside an unsampled trace so nested spans are skipped too
+_UNSAMPLED = object()
+
+# cProfile cannot nest, so at most one profiler runs at a time
+_profile_lock = threading.Lock()
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start", "end", "attributes", "status", "error", "thread", "profiled")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.start = time.time_ns()
+        self.end = None
+        self.attributes = attributes
+        self.status = "ok"
+        self.error = None
+        self.thread = threading.current_thread().name
+        # Whether the trace was sampled for profiling
+        self.profiled = False
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start,
+            "duration_ms": round((self.end - self.start) / 1e6, 3),
+            "status": self.status,
+            "error": self.error,
+            "thread": self.thread,
+            "attributes": self.attributes,
+        }
+
+
+class JsonlExporter:
+    def __init__(self, path: str = TRACE_FILE):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def export(self, spans: List[Span]):
+        with open(self.path, "a") as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(), default=str) + "\n")
+
+
+class OtlpExporter:
+    """
+    Posts spans as OTLP/HTTP JSON, the format OpenTelemetry collectors accept on /v1/traces.
+    """
+
+    def __init__(self, endpoint: str = OTLP_ENDPOINT):
+        import requests
+
+        self.endpoint = endpoint
+        self.session = requests.Session()
+
+    def export(self, spans: List[Span]):
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", SERVICE_NAME)]},
+                "scopeSpans": [{
+                    "scope": {"name": "inflect_gtm.tracing"},
+                    "spans": [{
+                        "traceId": span.trace_id,
+                        "spanId": span.span_id,
+                        "parentSpanId": span.parent_id or "",
+                        "name": span.name,
+                        "kind": 1,
+                        "startTimeUnixNano": str(span.start),
+                        "endTimeUnixNano": str(span.end),
+                        "attributes": [_otlp_attribute(k, v) for k, v in span.attributes.items()],
+                        "status": {"code": 2, "message": span.error} if span.status == "error" else {"code": 1},
+                    } for span in spans]
+                }]
+            }]
+        }
+        self.session.post(self.endpoint, json=payload, timeout=10)
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class Tracer:
+    """
+    Collects finished spans and exports them in batches from a background thread, so tracing
+    never adds file or network I/O to the traced code path.
+    """
+
+    def __init__(self, exporter=None, sample_rate: float = TRACE_SAMPLE_RATE, profile_rate: float = PROFILE_SAMPLE_RATE):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.profile_rate = profile_rate
+        self.pending = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def submit(self, span: Span):
+        if self.thread is None:
+            with self.lock:
+                if self.thread is None:
+                    self.thread = threading.Thread(target=self._export_loop, name="trace-export", daemon=True)
+                    self.thread.start()
+        self.pending.put(span)
+
+    def _export_loop(self):
+        while True:
+            batch = [self.pending.get()]
+            while len(batch) < EXPORT_BATCH_SIZE:
+                try:
+                    batch.append(self.pending.get(timeout=0.5))
+                except queue.Empty:
+                    break
+            try:
+                self.exporter.export(batch)
+            except Exception as e:
+                print("❌ Failed to export trace spans:", str(e))
+            for _ in batch:
+                self.pending.task_done()
+
+    def flush(self):
+        if self.thread is not None:
+            self.pending.join()
+
+
+def _build_exporter(kind: str):
+    if kind == "jsonl":
+        return JsonlExporter()
+    if kind == "otlp":
+        return OtlpExporter()
+    return None
+
+
+tracer = Tracer(_build_exporter(TRACE_EXPORTER))
+atexit.register(tracer.flush)
+
+
+def configure(exporter: Optional[str] = None, sample_rate: Optional[float] = None, profile_rate: Optional[float] = None):
+    """
+    Reconfigures tracing at runtime, e.g. configure("jsonl", profile_rate=0.05).
+    """
+    if exporter is not None:
+        tracer.flush()
+        tracer.exporter = _build_exporter(exporter)
+    if sample_rate is not None:
+        tracer.sample_rate = sample_rate
+    if profile_rate is not None:
+        tracer.profile_rate = profile_rate
+
+
+def current_span() -> Optional[Span]:
+    span = _current_span.get()
+    return span if isinstance(span, Span) else None
+
+
+def current_trace_id() -> Optional[str]:
+    span = current_span()
+    return span.trace_id if span else None
+
+
+def set_attributes(**attributes):
+    """
+    Adds attributes to the active span, if the current work is being traced.
+    """
+    span = current_span()
+    if span:
+        span.set(**attributes)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Times a block as a span nested under the active one. Yields the Span (or None when the
+    work is not traced), so callers can attach attributes discovered inside the block.
+    """
+    parent = _current_span.get()
+    if not tracer.enabled or parent is _UNSAMPLED:
+        yield None
+        return
+    if parent is None and random.random() >= tracer.sample_rate:
+        token = _current_span.set(_UNSAMPLED)
+        try:
+            yield None
+        finally:
+            _current_span.reset(token)
+        return
+
+    trace_id = parent.trace_id if parent else os.urandom(16).hex()
+    current = Span(name, trace_id, parent.span_id if parent else None, attributes)
+    if parent is None:
+        current.profiled = bool(tracer.profile_rate) and random.random() < tracer.profile_rate
+    else:
+        current.profiled = parent.profiled
+    token = _current_span.set(current)
+
+    try:
+        # On an event loop the profiler would only see the loop interleaving other requests;
+        # work handed to threads through in_context is profiled there instead
+        if parent is None and current.profiled and not _on_event_loop():
+            with _profiling(current):
+                yield current
+        else:
+            yield current
+    except BaseException as e:
+        current.status = "error"
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.end = time.time_ns()
+        _current_span.reset(token)
+        tracer.submit(current)
+
+
+def _on_event_loop() -> bool:
+    # asyncio is only looked up, so tracing does not pull it into every import
+    asyncio = sys.modules.get("asyncio")
+    if asyncio is None:
+        return False
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+@contextmanager
+def _profiling(current: Span):
+    """
+    Profiles the block with cProfile on the current thread and attaches the .prof path to
+    `current`. Skipped when another profile is running or the span already has one.
+    """
+    if "profile" in current.attributes or not _profile_lock.acquire(blocking=False):
+        yield
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:  # Another profiler is already active on this thread
+        _profile_lock.release()
+        yield
+        return
+
+    try:
+        yield
+    finally:
+        profiler.disable()
+        _profile_lock.release()
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        path = os.path.join(PROFILE_DIR, f"{current.trace_id}-{current.span_id}.prof")
+        profiler.dump_stats(path)
+        current.set(profile=path)
+
+
+def traced(name: Optional[str] = None):
+    """
+    Decorator that runs a function (sync or async) inside a span named `name`
+    (default: module.qualname).
+    """
+    def decorator(func: Callable):
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def traced_method(kind: str):
+    """
+    Decorator for `run` methods: names the span after the instance, e.g. "agent.analyst.run".
+    """
+    def decorator(func: Callable):
+        if getattr(func, "__traced__", False):
+            return func
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with span(f"{kind}.{getattr(self, 'name', type(self).__name__)}.run", **{"class": type(self).__name__}):
+                return func(self, *args, **kwargs)
+        wrapper.__traced__ = True
+        return wrapper
+
+    return decorator
+
+
+def in_context(func: Callable) -> Callable:
+    """
+    Binds func to the caller's context so spans opened in a worker thread nest under the
+    span that submitted it (thread pools do not copy contextvars on their own).
+    When the trace is sampled for profiling, the call is profiled in the worker thread.
+    """
+    ctx = contextvars.copy_context()
+    return functools.partial(ctx.run, _run_profiled, func)
+
+
+def _run_profiled(func: Callable, *args, **kwargs) -> Any:
+    current = current_span()
+    if current is None or not current.profiled:
+        return func(*args, **kwargs)
+    with _profiling(current):
+        return func(*args, **kwargs)
+
+
+if __name__ == "__main__":
+    print("🚀 Testing tracing...")
+    configure("jsonl", profile_rate=1.0)
+
+    @traced("demo.generate")
+    def generate(prompt):
+        time.sleep(0.05)
+        set_attributes(prompt_chars=len(prompt))
+        return prompt.upper()
+
+    with span("demo.request", route="/api/chat") as root:
+        with span("demo.retrieve"):
+            time.sleep(0.02)
+        generate("hello")
+    tracer.flush()
+    print("🧵 Trace:", root.trace_id, "→", TRACE_FILE)
+    print("🔥 Profile:", root.attributes.get("profile"))
+
+    import asyncio
+
+    async def request():
+        # The root span lives on the event loop, so only the pooled call is profiled
+        with span("demo.async_request", route="/api/chat") as current:
+            await asyncio.get_running_loop().run_in_executor(None, in_context(generate), "hi")
+        return current
+
+    async_root = asyncio.run(request())
+    tracer.flush()
+    print("🔥 Worker profile:", async_root.attributes.get("profile"))
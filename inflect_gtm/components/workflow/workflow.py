@@ -0,0 +1,313 @@
+import os
+import json
+import time
+import pickle
+import hashlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, Callable, List, Optional, Union
+from inflect_gtm.components.memory.global_memory import GlobalMemory
+from inflect_gtm.components.utils.tracing import in_context
+
+
+# Define storage paths
+STORE_DIR = os.path.join(os.path.dirname(__file__), "workflow_store")
+
+
+def _jsonable(value: Any) -> Any:
+    # Columnar tables (e.g. CustomerTable) are hashed by their records, not their repr
+    if hasattr(value, "to_records") and callable(value.to_records):
+        return value.to_records()
+    return str(value)
+
+
+def digest(value: Any) -> str:
+    """
+    Stable content hash of a node's inputs, used to decide whether the node must rerun.
+    """
+    payload = json.dumps(value, sort_keys=True, default=_jsonable)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Node:
+    """
+    One step of a workflow: an agent (or any callable taking a context) plus the GlobalMemory
+    keys it reads and writes. Dependencies between nodes are derived from these keys.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        agent: Any,
+        inputs: Union[List[str], Dict[str, str], None] = None,
+        outputs: Optional[List[str]] = None,
+        context: Optional[Dict[str, Any]] = None,
+        after: Optional[List[str]] = None,
+        always_run: bool = False,
+        version: str = "1",
+    ):
+        """
+        Args:
+            name (str): Unique node name.
+            agent (Any): Object with a `run(context)` method, or a callable taking the context.
+            inputs (list | dict): GlobalMemory keys the node reads. A dict maps context keys to
+                memory keys (e.g. {"data": "customers"}) for agents that read from the context.
+            outputs (List[str]): GlobalMemory keys the node is expected to set.
+            context (Dict[str, Any]): Static context passed on every run.
+            after (List[str]): Extra nodes that must finish first, for ordering not expressed by keys.
+            always_run (bool): Rerun even when inputs are unchanged (e.g. nodes reading external data).
+            version (str): Bump to invalidate persisted outputs after changing the node's logic.
+        """
+        self.name = name
+        self.agent = agent
+        if isinstance(inputs, dict):
+            self.inputs = dict(inputs)
+        else:
+            self.inputs = {key: key for key in inputs or []}
+        self.outputs = list(outputs or [])
+        self.context = dict(context or {})
+        self.after = list(after or [])
+        self.always_run = always_run
+        self.version = version
+
+    def input_hash(self, memory: GlobalMemory) -> str:
+        values = {key: memory.get(key) for key in sorted(set(self.inputs.values()))}
+        return digest({"inputs": values, "context": self.context, "version": self.version})
+
+    def execute(self, memory: GlobalMemory) -> Any:
+        if hasattr(self.agent, "global_memory"):
+            self.agent.global_memory = memory
+        context = dict(self.context)
+        for context_key, memory_key in self.inputs.items():
+            context[context_key] = memory.get(memory_key)
+        run = getattr(self.agent, "run", self.agent)
+        return run(context)
+
+
+class Workflow:
+    """
+    DAG of agent nodes connected through GlobalMemory keys.
+    Ready nodes run concurrently, every node's outputs are persisted with the hash of its inputs,
+    and a rerun only executes nodes whose inputs changed (like an incremental build). Nodes that
+    are up to date restore their persisted outputs into memory instead of running.
+    """
+
+    def __init__(self, name: str, nodes: List[Node], store_dir: str = STORE_DIR, max_workers: int = 4):
+        """
+        Args:
+            name (str): Workflow name; persisted outputs live under store_dir/<name>.
+            nodes (List[Node]): Workflow steps.
+            store_dir (str): Directory for persisted node outputs.
+            max_workers (int): Maximum nodes running at once.
+        """
+        self.name = name
+        self.nodes: Dict[str, Node] = {}
+        for node in nodes:
+            if node.name in self.nodes:
+                raise ValueError(f"Duplicate workflow node: {node.name}")
+            self.nodes[node.name] = node
+        self.store_dir = os.path.join(store_dir, name)
+        self.max_workers = max_workers
+        self.dependencies = self._resolve_dependencies()
+        self.order = self._topological_order()
+
+    def _resolve_dependencies(self) -> Dict[str, set]:
+        producers = {}
+        for node in self.nodes.values():
+            for key in node.outputs:
+                if key in producers:
+                    raise ValueError(f"Memory key '{key}' is produced by both {producers[key]} and {node.name}")
+                producers[key] = node.name
+
+        dependencies = {}
+        for node in self.nodes.values():
+            deps = {producers[key] for key in node.inputs.values() if key in producers}
+            for name in node.after:
+                if name not in self.nodes:
+                    raise ValueError(f"Node {node.name} runs after unknown node: {name}")
+                deps.add(name)
+            deps.discard(node.name)
+            dependencies[node.name] = deps
+        return dependencies
+
+    def _topological_order(self) -> List[str]:
+        order, visiting, done = [], set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Workflow has a cycle through node: {name}")
+            visiting.add(name)
+            for dep in sorted(self.dependencies[name]):
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+
+        for name in self.nodes:
+            visit(name)
+        return order
+
+    def _checkpoint_path(self, name: str) -> str:
+        return os.path.join(self.store_dir, f"{name}.pkl")
+
+    def load_checkpoint(self, name: str) -> Optional[Dict[str, Any]]:
+        path = self._checkpoint_path(name)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except (EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+
+    def save_checkpoint(self, name: str, input_hash: str, outputs: Dict[str, Any]):
+        os.makedirs(self.store_dir, exist_ok=True)
+        path = self._checkpoint_path(name)
+        # Write to a temp file and rename so a crash never leaves a half-written checkpoint;
+        # the temp name is unique so concurrent runs never write into each other's file
+        fd, tmp_path = tempfile.mkstemp(dir=self.store_dir, prefix=f"{name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump({"input_hash": input_hash, "outputs": outputs, "finished_at": time.time()}, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def invalidate(self, name: Optional[str] = None):
+        """
+        Deletes the persisted outputs of one node, or of the whole workflow.
+        """
+        names = [name] if name else list(self.nodes)
+        for node_name in names:
+            path = self._checkpoint_path(node_name)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def run(
+        self,
+        memory: Optional[GlobalMemory] = None,
+        force: Optional[List[str]] = None,
+        on_event: Optional[Callable[[str, str, Dict[str, Any]], None]] = None,
+        should_cancel: Optional[Callable[[], bool]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Runs the workflow.
+
+        Args:
+            memory (GlobalMemory): Memory shared by all nodes. A fresh one is created if omitted.
+            force (List[str]): Node names to rerun even if their inputs are unchanged.
+            on_event (Callable): Optional callback `(event, node_name, info)` for "started",
+                "cached", "finished", "failed", "skipped" and "cancelled" events.
+            should_cancel (Callable): Optional check made before starting each node; once it
+                returns True no new nodes start and the remaining ones are marked "cancelled".
+
+        Returns:
+            Dict[str, Any]: {"memory": GlobalMemory, "status": {node: status}, "errors": {node: message}}
+        """
+        memory = memory or GlobalMemory()
+        force = set(force or [])
+        status: Dict[str, str] = {}
+        errors: Dict[str, str] = {}
+
+        def emit(event, name, **info):
+            if on_event:
+                on_event(event, name, info)
+
+        def process(name):
+            node = self.nodes[name]
+            input_hash = node.input_hash(memory)
+            checkpoint = None
+            if name not in force and not node.always_run:
+                checkpoint = self.load_checkpoint(name)
+            if checkpoint and checkpoint["input_hash"] == input_hash:
+                for key, value in checkpoint["outputs"].items():
+                    memory.set(key, value)
+                emit("cached", name)
+                return "cached"
+
+            emit("started", name)
+            start = time.perf_counter()
+            node.execute(memory)
+            outputs = {key: memory.get(key) for key in node.outputs}
+            missing = [key for key, value in outputs.items() if value is None]
+            if missing:
+                raise RuntimeError(f"Node did not produce: {', '.join(missing)}")
+            self.save_checkpoint(name, input_hash, outputs)
+            emit("finished", name, seconds=round(time.perf_counter() - start, 3))
+            return "ran"
+
+        remaining = {name: set(deps) for name, deps in self.dependencies.items()}
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"workflow-{self.name}") as executor:
+            while remaining or running:
+                # Running nodes finish, but nothing new starts after a cancellation
+                if remaining and should_cancel and should_cancel():
+                    for name in [n for n in self.order if n in remaining]:
+                        del remaining[name]
+                        status[name] = "cancelled"
+                        emit("cancelled", name)
+
+                # Submit every node whose dependencies have all succeeded, in topological order
+                for name in [n for n in self.order if n in remaining and not remaining[n]]:
+                    del remaining[name]
+                    running[executor.submit(in_context(process), name)] = name
+
+                # Nodes downstream of a failure can never become ready
+                for name in [n for n in self.order if n in remaining]:
+                    failed_deps = [d for d in remaining[name] if status.get(d) in ("failed", "skipped")]
+                    if failed_deps:
+                        del remaining[name]
+                        status[name] = "skipped"
+                        errors[name] = f"Upstream node failed: {', '.join(sorted(failed_deps))}"
+                        emit("skipped", name, reason=errors[name])
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = "failed"
+                        errors[name] = str(e)
+                        emit("failed", name, error=str(e))
+                    status[name] = result
+                    if result != "failed":
+                        for deps in remaining.values():
+                            deps.discard(name)
+
+        return {"memory": memory, "status": status, "errors": errors}
+
+
+if __name__ == "__main__":
+    print("🚀 Testing workflow engine...")
+
+    def fetch(context):
+        time.sleep(0.2)
+        memory.set("customers", [{"Name": "Sarah", "Company Size": "Enterprise"}, {"Name": "James", "Company Size": "SMB"}])
+
+    def segment(context):
+        groups = {}
+        for customer in context["data"]:
+            groups.setdefault(customer["Company Size"], []).append(customer)
+        memory.set("segments", groups)
+        memory.set("strategies", {segment: "Personalized onboarding" for segment in groups})
+
+    def follow_up(context):
+        time.sleep(0.2)
+        memory.set("meeting_summary", {"summary": context["meeting_log"]})
+
+    memory = GlobalMemory()
+    workflow = Workflow("demo", [
+        Node("fetch", fetch, outputs=["customers"], always_run=True),
+        Node("segment", segment, inputs={"data": "customers"}, outputs=["segments", "strategies"]),
+        Node("follow_up", follow_up, outputs=["meeting_summary"], context={"meeting_log": "Demo went well."}),
+    ])
+    for attempt in range(2):
+        result = workflow.run(memory, on_event=lambda event, name, info: print(f"  {event}: {name} {info or ''}"))
+        print(f"🔁 Run {attempt + 1}:", result["status"])
+    workflow.invalidate()
@@ -0,0 +1,182 @@
+import os
+import math
+import time
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+
+# Requests the LLM backend serves in parallel (matches Ollama's OLLAMA_NUM_PARALLEL)
+BACKEND_SLOTS = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
+
+# Uvicorn worker processes sharing the backend; each one admits its share of the slots
+API_WORKERS = int(os.getenv("API_WORKERS", "1"))
+
+# Requests allowed to wait for a slot, across all clients
+MAX_QUEUE = 32
+
+# Requests one client may have waiting at once, so a single client cannot fill the queue
+MAX_QUEUE_PER_CLIENT = 4
+
+# Longest a request may wait for a slot before it is shed, in seconds
+MAX_WAIT = 15.0
+
+# Initial guess of how long one request holds a slot, refined from observed requests
+INITIAL_SERVICE_TIME = 5.0
+
+
+class Overloaded(Exception):
+    def __init__(self, retry_after: float, reason: str):
+        super().__init__(reason)
+        self.retry_after = max(1, math.ceil(retry_after))
+        self.reason = reason
+
+
+class AdmissionController:
+    """
+    Limits concurrent LLM-bound requests to the backend's slots.
+    Requests beyond the limit wait in a bounded queue served round-robin across clients, and
+    are shed with a Retry-After hint when the queue is full or the expected wait exceeds the
+    deadline, so overload turns into fast 503s instead of unbounded latency for everyone.
+
+    All methods run on one event loop, so no locking is needed.
+    """
+
+    def __init__(
+        self,
+        slots: int = max(1, BACKEND_SLOTS // API_WORKERS),
+        max_queue: int = MAX_QUEUE,
+        max_queue_per_client: int = MAX_QUEUE_PER_CLIENT,
+        max_wait: float = MAX_WAIT,
+    ):
+        self.slots = slots
+        self.max_queue = max_queue
+        self.max_queue_per_client = max_queue_per_client
+        self.max_wait = max_wait
+        self.active = 0
+        self.waiting: Dict[str, deque] = {}
+        self.turns: deque = deque()
+        self.queued = 0
+        self.service_time = INITIAL_SERVICE_TIME
+        self.shed = 0
+
+    def expected_wait(self) -> float:
+        # Every waiting request ahead of us needs one slot-turn of average service time
+        return (self.queued + 1) * self.service_time / self.slots
+
+    async def acquire(self, client_id: str):
+        if self.active < self.slots and not self.queued:
+            self.active += 1
+            return
+
+        client_queue = self.waiting.get(client_id)
+        if self.queued >= self.max_queue:
+            self._shed(f"Server busy: {self.queued} requests waiting")
+        if client_queue and len(client_queue) >= self.max_queue_per_client:
+            self._shed("Too many requests waiting for this client")
+        if self.expected_wait() > self.max_wait:
+            self._shed(f"Expected wait of {self.expected_wait():.0f}s exceeds {self.max_wait:.0f}s")
+
+        future = asyncio.get_running_loop().create_future()
+        if client_queue is None:
+            client_queue = self.waiting[client_id] = deque()
+            self.turns.append(client_id)
+        client_queue.append(future)
+        self.queued += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=self.max_wait)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled():
+                # The slot was granted just as we gave up, so hand it on
+                self.release()
+            else:
+                future.cancel()
+                self._forget(client_id, future)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self.shed += 1
+            raise Overloaded(self.service_time, "Timed out waiting for capacity")
+
+    def release(self, service_time: Optional[float] = None):
+        if service_time is not None:
+            # Exponential moving average keeps Retry-After and shedding in line with current latency
+            self.service_time = 0.8 * self.service_time + 0.2 * service_time
+        self.active -= 1
+        while self.turns and self.active < self.slots:
+            client_id = self.turns.popleft()
+            client_queue = self.waiting[client_id]
+            future = client_queue.popleft()
+            self.queued -= 1
+            if client_queue:
+                # Round-robin: the client goes to the back of the line for its next request
+                self.turns.append(client_id)
+            else:
+                del self.waiting[client_id]
+            if not future.done():
+                self.active += 1
+                future.set_result(True)
+
+    def _forget(self, client_id: str, future: asyncio.Future):
+        client_queue = self.waiting.get(client_id)
+        if client_queue and future in client_queue:
+            client_queue.remove(future)
+            self.queued -= 1
+            if not client_queue:
+                del self.waiting[client_id]
+                self.turns.remove(client_id)
+
+    def _shed(self, reason: str):
+        self.shed += 1
+        raise Overloaded(self.expected_wait(), reason)
+
+    @asynccontextmanager
+    async def admit(self, client_id: str):
+        """
+        Holds a backend slot for the duration of the block. Raises Overloaded when shed.
+        """
+        await self.acquire(client_id)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - start)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "slots": self.slots,
+            "active": self.active,
+            "queued": self.queued,
+            "shed": self.shed,
+            "service_time": round(self.service_time, 3),
+        }
+
+
+if __name__ == "__main__":
+    print("🚀 Testing admission control...")
+
+    async def main():
+        controller = AdmissionController(slots=2, max_queue=6, max_wait=2.0)
+        controller.service_time = 0.2
+        served = []
+
+        async def request(client_id, i):
+            try:
+                async with controller.admit(client_id):
+                    await asyncio.sleep(0.2)
+                    served.append(client_id)
+                return "ok"
+            except Overloaded as e:
+                return f"503 (retry after {e.retry_after}s)"
+
+        # One noisy client floods the server while two others send a single request each
+        results = await asyncio.gather(
+            *[request("noisy", i) for i in range(10)],
+            request("alice", 0),
+            request("bob", 0),
+        )
+        print("📊 Results:", results)
+        print("🧾 Serve order:", served)
+        print("📈 Stats:", controller.stats())
+
+    asyncio.run(main())
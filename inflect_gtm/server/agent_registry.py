@@ -0,0 +1,250 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Callable, List, Optional
+
+
+# Define storage paths
+STORE_DIR = os.path.join(os.path.dirname(__file__), "registry_store")
+SPECS_PATH = os.path.join(STORE_DIR, "agents.db")
+
+# Built agents kept in memory at once; older ones are rebuilt from their spec on demand
+MAX_BUILT_AGENTS = 100
+
+# Built agents unused for this many seconds are released
+IDLE_TTL = 30 * 60
+
+
+class SpecStore:
+    """
+    SQLite-backed agent specs and session bindings, shared by every API worker process
+    opening the same file.
+    """
+
+    def __init__(self, path: str = SPECS_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS agents (
+                id TEXT PRIMARY KEY,
+                session_id TEXT,
+                spec TEXT,
+                created_at REAL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS agents_session ON agents (session_id, created_at)")
+        self.conn.commit()
+
+    def add(self, spec: Dict[str, Any]):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO agents (id, session_id, spec, created_at) VALUES (?, ?, ?, ?)",
+                (spec["id"], spec["session_id"], json.dumps(spec), spec["created_at"])
+            )
+
+    def get(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            row = self.conn.execute("SELECT spec FROM agents WHERE id = ?", (agent_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def for_session(self, session_id: str) -> List[Dict[str, Any]]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT spec FROM agents WHERE session_id = ? ORDER BY created_at", (session_id,)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def latest(self, session_id: str) -> Optional[str]:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT id FROM agents WHERE session_id = ? ORDER BY created_at DESC LIMIT 1", (session_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def delete(self, agent_id: str) -> bool:
+        with self.lock, self.conn:
+            return self.conn.execute("DELETE FROM agents WHERE id = ?", (agent_id,)).rowcount == 1
+
+    def counts(self) -> Dict[str, int]:
+        with self.lock:
+            agents, sessions = self.conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT session_id) FROM agents"
+            ).fetchone()
+        return {"agents": agents, "sessions": sessions}
+
+
+class AgentRegistry:
+    """
+    Registry of user-created agents.
+    Every agent gets a unique ID and is bound to the session that created it. Specs (task and
+    tools) live in a SpecStore shared by all worker processes; each process caches built
+    executors in an LRU capped by count and idle time, and builds an agent lazily the first
+    time it serves it (including agents created by another worker).
+    """
+
+    def __init__(
+        self,
+        builder: Callable[[Dict[str, Any]], Any],
+        max_agents: int = MAX_BUILT_AGENTS,
+        idle_ttl: float = IDLE_TTL,
+        spec_store: Optional[SpecStore] = None,
+    ):
+        """
+        Args:
+            builder (Callable): Builds an executor from a spec ({"task", "tools", ...}).
+            max_agents (int): Maximum built agents held in memory by this process.
+            idle_ttl (float): Seconds after which an unused built agent is released.
+            spec_store (SpecStore): Shared spec storage. Defaults to the server's SQLite store.
+        """
+        self.builder = builder
+        self.max_agents = max_agents
+        self.idle_ttl = idle_ttl
+        self.spec_store = spec_store or SpecStore()
+        self.built: "OrderedDict[str, Any]" = OrderedDict()
+        self.last_used: Dict[str, float] = {}
+        self.build_locks: Dict[str, threading.Lock] = {}
+        self.lock = threading.Lock()
+
+    def create(self, task: str, tools: List[str], session_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Registers and builds a new agent.
+
+        Returns:
+            Dict[str, Any]: The stored spec, including "id" and "session_id".
+        """
+        agent_id = f"agent-{uuid.uuid4().hex[:12]}"
+        session_id = session_id or uuid.uuid4().hex
+        spec = {
+            "id": agent_id,
+            "session_id": session_id,
+            "task": task,
+            "tools": list(tools),
+            "created_at": time.time(),
+        }
+        # Build before registering so a failing build leaves no half-created agent behind
+        executor = self.builder(spec)
+        self.spec_store.add(spec)
+        with self.lock:
+            self._cache(agent_id, executor)
+        return spec
+
+    def get(self, agent_id: str) -> Any:
+        """
+        Returns the built executor for an agent, building it if this process does not hold it.
+        Raises KeyError for unknown (or deleted) IDs.
+        """
+        # The shared store is checked every time so a delete on another worker takes effect here
+        spec = self.spec_store.get(agent_id)
+        if spec is None:
+            self._drop(agent_id)
+            raise KeyError(f"Unknown agent: {agent_id}")
+
+        with self.lock:
+            if agent_id in self.built:
+                self.built.move_to_end(agent_id)
+                self.last_used[agent_id] = time.monotonic()
+                return self.built[agent_id]
+            build_lock = self.build_locks.setdefault(agent_id, threading.Lock())
+
+        # Concurrent requests for the same agent wait for a single build
+        with build_lock:
+            with self.lock:
+                if agent_id in self.built:
+                    self.built.move_to_end(agent_id)
+                    self.last_used[agent_id] = time.monotonic()
+                    return self.built[agent_id]
+            try:
+                executor = self.builder(spec)
+                with self.lock:
+                    self._cache(agent_id, executor)
+                return executor
+            finally:
+                # Dropped even when the build fails, so failed agents do not leak locks
+                with self.lock:
+                    self.build_locks.pop(agent_id, None)
+
+    def spec(self, agent_id: str) -> Dict[str, Any]:
+        spec = self.spec_store.get(agent_id)
+        if spec is None:
+            raise KeyError(f"Unknown agent: {agent_id}")
+        return spec
+
+    def resolve(self, session_id: Optional[str], agent_id: Optional[str] = None) -> Optional[str]:
+        """
+        Picks the agent for a request: the given ID, else the session's most recent agent.
+        Agents are only visible to the session that created them, so an agent_id that belongs
+        to another session (or a missing session_id) resolves to None.
+        """
+        if not session_id:
+            return None
+        if agent_id:
+            spec = self.spec_store.get(agent_id)
+            if spec is None or spec["session_id"] != session_id:
+                return None
+            return agent_id
+        return self.spec_store.latest(session_id)
+
+    def list_agents(self, session_id: str) -> List[Dict[str, Any]]:
+        specs = self.spec_store.for_session(session_id)
+        with self.lock:
+            return [{**spec, "status": "ready" if spec["id"] in self.built else "idle"} for spec in specs]
+
+    def delete(self, agent_id: str) -> bool:
+        self._drop(agent_id)
+        return self.spec_store.delete(agent_id)
+
+    def _drop(self, agent_id: str):
+        with self.lock:
+            self.built.pop(agent_id, None)
+            self.last_used.pop(agent_id, None)
+
+    def evict_idle(self) -> int:
+        """
+        Releases built agents idle for longer than idle_ttl. Returns how many were released.
+        """
+        cutoff = time.monotonic() - self.idle_ttl
+        with self.lock:
+            idle = [agent_id for agent_id, used in self.last_used.items() if used < cutoff]
+            for agent_id in idle:
+                self.built.pop(agent_id, None)
+                self.last_used.pop(agent_id, None)
+            return len(idle)
+
+    def stats(self) -> Dict[str, int]:
+        counts = self.spec_store.counts()
+        with self.lock:
+            counts["built"] = len(self.built)
+        return counts
+
+    def _cache(self, agent_id: str, executor: Any):
+        # Caller holds self.lock
+        self.built[agent_id] = executor
+        self.built.move_to_end(agent_id)
+        self.last_used[agent_id] = time.monotonic()
+        while len(self.built) > self.max_agents:
+            evicted_id, _ = self.built.popitem(last=False)
+            self.last_used.pop(evicted_id, None)
+
+
+if __name__ == "__main__":
+    print("🚀 Testing agent registry...")
+    builds = []
+
+    def build(spec):
+        builds.append(spec["id"])
+        return f"executor for {spec['task']}"
+
+    registry = AgentRegistry(build, max_agents=2, spec_store=SpecStore(os.path.join(STORE_DIR, "demo_agents.db")))
+    first = registry.create("Summarize meeting notes", ["google_docs"], session_id="user-a")
+    registry.create("Send follow-up emails", ["gmail"], session_id="user-a")
+    registry.create("Segment customers", ["google_sheets"], session_id="user-b")
+    print("📦 Stats:", registry.stats())
+    print("🔁 Rebuilt on demand:", registry.get(first["id"]), f"({len(builds)} builds)")
+    print("🧭 Latest agent for user-a:", registry.resolve("user-a"))
+    os.remove(os.path.join(STORE_DIR, "demo_agents.db"))
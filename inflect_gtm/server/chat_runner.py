@@ -0,0 +1,86 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Awaitable, Callable, Optional
+from inflect_gtm.components.utils.tracing import in_context
+
+
+# Worker threads for agents (and agent builds) that only offer a synchronous API
+CHAT_WORKERS = 8
+
+# Per-request limit for one agent invocation, in seconds
+CHAT_TIMEOUT = 120
+
+# How often a running chat checks whether the client is still connected
+DISCONNECT_POLL_INTERVAL = 0.5
+
+chat_pool = ThreadPoolExecutor(max_workers=CHAT_WORKERS, thread_name_prefix="chat")
+
+
+class ClientDisconnected(Exception):
+    pass
+
+
+async def run_blocking(func: Callable, *args) -> Any:
+    """
+    Runs a synchronous call on the bounded chat pool so it never blocks the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    # run_in_executor does not carry contextvars over, so the request's trace is bound explicitly;
+    # a trace sampled for profiling is profiled here, in the worker thread
+    return await loop.run_in_executor(chat_pool, in_context(func), *args)
+
+
+async def invoke_agent(agent_executor: Any, payload: Dict[str, Any]) -> Any:
+    """
+    Invokes an agent through its async `ainvoke` when available, else on the chat pool.
+    """
+    if hasattr(agent_executor, "ainvoke"):
+        return await agent_executor.ainvoke(payload)
+    return await run_blocking(agent_executor.invoke, payload)
+
+
+async def run_chat(
+    agent_executor: Any,
+    payload: Dict[str, Any],
+    timeout: float = CHAT_TIMEOUT,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+) -> Any:
+    """
+    Runs one chat turn with a timeout, cancelling it if the client goes away.
+
+    Raises:
+        asyncio.TimeoutError: The agent did not answer within the timeout.
+        ClientDisconnected: The client disconnected before the answer was ready.
+    """
+    task = asyncio.ensure_future(invoke_agent(agent_executor, payload))
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    try:
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+            done, _ = await asyncio.wait({task}, timeout=min(remaining, DISCONNECT_POLL_INTERVAL))
+            if done:
+                return task.result()
+            if is_disconnected and await is_disconnected():
+                raise ClientDisconnected()
+    finally:
+        # Cancelling stops async agents at their next await; pooled sync calls finish but are discarded
+        if not task.done():
+            task.cancel()
+
+
+def extract_output(result: Any) -> str:
+    """
+    Pulls the reply text out of an agent result: {"output": ...} from classic agents, or the
+    last message of a LangGraph {"messages": [...]} state.
+    """
+    if isinstance(result, dict):
+        if "output" in result:
+            return str(result["output"])
+        messages = result.get("messages")
+        if messages:
+            last = messages[-1]
+            return str(getattr(last, "content", last))
+    return str(result)
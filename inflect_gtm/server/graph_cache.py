@@ -0,0 +1,69 @@
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, List, Tuple
+
+
+# Compiled agents (LangGraph ReAct graphs) kept at once
+MAX_CACHED_GRAPHS = 32
+
+
+def signature(task: str, tools: Iterable[str]) -> str:
+    """
+    Normalized key for an agent: whitespace in the task is collapsed and the tool set is
+    order- and duplicate-insensitive, so equivalent create_agent requests share one entry.
+    """
+    normalized = {"task": " ".join(task.split()), "tools": sorted(set(tools))}
+    return hashlib.sha256(json.dumps(normalized).encode("utf-8")).hexdigest()
+
+
+class GraphCache:
+    """
+    Bounded LRU of compiled agents keyed by (task, tools) signature. Only the agent that
+    `build` returns is cached, so it must not hold per-session state.
+    Concurrent requests for the same signature wait for a single build.
+    """
+
+    def __init__(self, max_size: int = MAX_CACHED_GRAPHS):
+        self.max_size = max_size
+        self.entries: "OrderedDict[str, Any]" = OrderedDict()
+        self.build_locks = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, task: str, tools: List[str], build: Callable[[str, List[str]], Any]) -> Any:
+        key = signature(task, tools)
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            build_lock = self.build_locks.setdefault(key, threading.Lock())
+
+        with build_lock:
+            with self.lock:
+                if key in self.entries:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return self.entries[key]
+            try:
+                built = build(task, tools)
+                with self.lock:
+                    self.misses += 1
+                    self.entries[key] = built
+                    while len(self.entries) > self.max_size:
+                        self.entries.popitem(last=False)
+                return built
+            finally:
+                # Dropped even when the build fails, so failed signatures do not leak locks
+                with self.lock:
+                    self.build_locks.pop(key, None)
+
+    def stats(self) -> Tuple[int, int, int]:
+        """
+        Returns (entries, hits, misses).
+        """
+        with self.lock:
+            return len(self.entries), self.hits, self.misses
@@ -0,0 +1,336 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from typing import Dict, Any, Callable, List, Optional
+
+
+# Define storage paths
+STORE_DIR = os.path.join(os.path.dirname(__file__), "job_store")
+JOBS_PATH = os.path.join(STORE_DIR, "jobs.db")
+
+# Pipelines run at once; each one mostly waits on the LLM and Google APIs
+JOB_WORKERS = 2
+
+# Idle workers check the shared store for jobs submitted by other API processes this often
+JOB_POLL_INTERVAL = 1.0
+
+# Running jobs have their updated_at refreshed this often by the process that owns them
+HEARTBEAT_INTERVAL = 10.0
+
+# A running job whose heartbeat is older than this is treated as orphaned and requeued
+STALE_AFTER = 60.0
+
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+
+class JobCancelled(Exception):
+    pass
+
+
+_worker_token = None
+_worker_pid = None
+
+
+def worker_token() -> str:
+    """
+    Identifies this process as a job owner. Unlike a pid it is never reused by a restarted
+    worker or shared with a process in another container, and a forked child gets its own.
+    """
+    global _worker_token, _worker_pid
+    if _worker_pid != os.getpid():
+        _worker_token = uuid.uuid4().hex
+        _worker_pid = os.getpid()
+    return _worker_token
+
+
+class JobStore:
+    """
+    SQLite-backed jobs and their progress events, so job state survives restarts and can be
+    read by every API worker process.
+    """
+
+    def __init__(self, path: str = JOBS_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT,
+                params TEXT,
+                status TEXT,
+                result TEXT,
+                error TEXT,
+                cancel_requested INTEGER DEFAULT 0,
+                worker_id TEXT,
+                created_at REAL,
+                updated_at REAL
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS job_events (
+                job_id TEXT,
+                seq INTEGER,
+                stage TEXT,
+                message TEXT,
+                data TEXT,
+                created_at REAL,
+                PRIMARY KEY (job_id, seq)
+            )
+        """)
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(jobs)")]
+        if "worker_id" not in columns:
+            self.conn.execute("ALTER TABLE jobs ADD COLUMN worker_id TEXT")
+        self.conn.commit()
+
+    def create(self, kind: str, params: Dict[str, Any]) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO jobs (id, kind, params, status, created_at, updated_at) VALUES (?, ?, ?, 'queued', ?, ?)",
+                (job_id, kind, json.dumps(params), now, now)
+            )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT id, kind, params, status, result, error, cancel_requested, created_at, updated_at FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "id": row[0],
+            "kind": row[1],
+            "params": json.loads(row[2]),
+            "status": row[3],
+            "result": json.loads(row[4]) if row[4] else None,
+            "error": row[5],
+            "cancel_requested": bool(row[6]),
+            "created_at": row[7],
+            "updated_at": row[8],
+        }
+
+    def update(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None) -> bool:
+        """
+        Records a running job's outcome. Only the process that claimed the job may do so, so a
+        worker whose job was requeued as orphaned cannot overwrite the new owner's run.
+        Returns False when this process no longer owns the job.
+        """
+        with self.lock, self.conn:
+            return self.conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? WHERE id = ? AND worker_id = ?",
+                (status, json.dumps(result, default=str) if result is not None else None, error, time.time(), job_id, worker_token())
+            ).rowcount == 1
+
+    def request_cancel(self, job_id: str) -> Optional[str]:
+        """
+        Flags a job for cancellation. Queued jobs are cancelled at once; running ones stop at
+        their next checkpoint. Returns the job's status afterwards, or None if unknown.
+        """
+        with self.lock, self.conn:
+            row = self.conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            status = row[0]
+            if status in FINISHED_STATUSES:
+                return status
+            if status == "queued":
+                status = "cancelled"
+            self.conn.execute(
+                "UPDATE jobs SET cancel_requested = 1, status = ?, updated_at = ? WHERE id = ?",
+                (status, time.time(), job_id)
+            )
+            return status
+
+    def cancel_requested(self, job_id: str) -> bool:
+        with self.lock:
+            row = self.conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    def claim_next(self) -> Optional[str]:
+        """
+        Atomically moves the oldest queued job to running for this process and returns its ID.
+        Safe with several API worker processes polling the same store.
+        """
+        with self.lock, self.conn:
+            row = self.conn.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            cursor = self.conn.execute(
+                "UPDATE jobs SET status = 'running', worker_id = ?, updated_at = ? WHERE id = ? AND status = 'queued'",
+                (worker_token(), time.time(), row[0])
+            )
+            return row[0] if cursor.rowcount == 1 else None
+
+    def heartbeat(self) -> int:
+        """
+        Refreshes updated_at on the running jobs this process owns. Returns how many.
+        """
+        with self.lock, self.conn:
+            return self.conn.execute(
+                "UPDATE jobs SET updated_at = ? WHERE status = 'running' AND worker_id = ?",
+                (time.time(), worker_token())
+            ).rowcount
+
+    def requeue_orphans(self, stale_after: float = STALE_AFTER) -> int:
+        """
+        Requeues running jobs whose owner stopped heartbeating (e.g. it crashed or its
+        container was replaced). Works across processes, hosts and containers sharing the file.
+        """
+        with self.lock, self.conn:
+            return self.conn.execute(
+                "UPDATE jobs SET status = 'queued', worker_id = NULL, updated_at = ? WHERE status = 'running' AND updated_at < ?",
+                (time.time(), time.time() - stale_after)
+            ).rowcount
+
+    def add_event(self, job_id: str, stage: str, message: str = "", data: Optional[Dict[str, Any]] = None) -> int:
+        with self.lock, self.conn:
+            seq = self.conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) + 1 FROM job_events WHERE job_id = ?", (job_id,)
+            ).fetchone()[0]
+            self.conn.execute(
+                "INSERT INTO job_events (job_id, seq, stage, message, data, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, seq, stage, message, json.dumps(data or {}, default=str), time.time())
+            )
+        return seq
+
+    def events(self, job_id: str, after: int = 0) -> List[Dict[str, Any]]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT seq, stage, message, data, created_at FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq",
+                (job_id, after)
+            ).fetchall()
+        return [
+            {"seq": seq, "stage": stage, "message": message, "data": json.loads(data), "created_at": created_at}
+            for seq, stage, message, data, created_at in rows
+        ]
+
+
+class JobQueue:
+    """
+    Runs pipeline jobs on a small pool of worker threads.
+    A pipeline is a callable `(params, report, should_cancel) -> result`: `report(stage, message,
+    **data)` records a progress event and `should_cancel()` tells it to stop early. Workers claim
+    jobs from the shared store, so with several API processes a job submitted to one may run on
+    another. Owners heartbeat their running jobs; jobs whose heartbeat goes stale (their process
+    died) are requeued by any live queue and run again, so pipelines may run more than once.
+    """
+
+    def __init__(self, pipelines: Dict[str, Callable], store: Optional[JobStore] = None, workers: int = JOB_WORKERS):
+        self.pipelines = pipelines
+        self.store = store or JobStore()
+        self.workers = workers
+        self.wakeup = threading.Event()
+        self.stopping = threading.Event()
+        self.threads: List[threading.Thread] = []
+
+    def start(self):
+        if self.threads:
+            return
+        self.stopping.clear()
+        self.store.requeue_orphans()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        thread = threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True)
+        thread.start()
+        self.threads.append(thread)
+
+    def stop(self):
+        self.stopping.set()
+        self.wakeup.set()
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+
+    def submit(self, kind: str, params: Dict[str, Any]) -> str:
+        if kind not in self.pipelines:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = self.store.create(kind, params)
+        self.store.add_event(job_id, "queued", f"{kind} job queued")
+        self.wakeup.set()
+        return job_id
+
+    def cancel(self, job_id: str) -> Optional[str]:
+        status = self.store.request_cancel(job_id)
+        if status == "cancelled":
+            self.store.add_event(job_id, "cancelled", "Job cancelled before it started")
+        return status
+
+    def _heartbeat(self):
+        while not self.stopping.wait(HEARTBEAT_INTERVAL):
+            try:
+                self.store.heartbeat()
+                if self.store.requeue_orphans():
+                    self.wakeup.set()
+            except Exception as e:
+                print("❌ Job heartbeat failed:", str(e))
+
+    def _work(self):
+        while not self.stopping.is_set():
+            job_id = self.store.claim_next()
+            if job_id is None:
+                # Local submits wake workers at once; other processes' submits are seen on the next poll
+                self.wakeup.wait(JOB_POLL_INTERVAL)
+                self.wakeup.clear()
+                continue
+            self._run(job_id)
+
+    def _run(self, job_id: str):
+        job = self.store.get(job_id)
+        pipeline = self.pipelines[job["kind"]]
+
+        def report(stage: str, message: str = "", **data):
+            self.store.add_event(job_id, stage, message, data)
+
+        def should_cancel() -> bool:
+            return self.store.cancel_requested(job_id)
+
+        report("running", f"{job['kind']} job started")
+        try:
+            # Only a JobCancelled raised by the pipeline cancels the job; a cancel request that
+            # arrives after it returned is too late, as its side effects (e.g. sent emails) happened
+            result = pipeline(job["params"], report, should_cancel)
+        except JobCancelled:
+            if self.store.update(job_id, "cancelled"):
+                report("cancelled", "Job cancelled")
+            return
+        except Exception as e:
+            if self.store.update(job_id, "failed", error=str(e)):
+                report("failed", str(e))
+            return
+        # A job requeued as orphaned belongs to another worker now, so its outcome is not recorded here
+        if self.store.update(job_id, "succeeded", result=result):
+            report("succeeded", "Job finished")
+
+
+if __name__ == "__main__":
+    print("🚀 Testing job queue...")
+
+    def slow_pipeline(params, report, should_cancel):
+        for stage in ("fetch", "segment", "write"):
+            if should_cancel():
+                raise JobCancelled()
+            time.sleep(0.1)
+            report(stage, f"{stage} done")
+        return {"docs": params["n"]}
+
+    jobs = JobQueue({"demo": slow_pipeline}, store=JobStore(os.path.join(STORE_DIR, "demo_jobs.db")))
+    jobs.start()
+    job_id = jobs.submit("demo", {"n": 3})
+    time.sleep(0.5)
+    print("📋 Job:", jobs.store.get(job_id)["status"], jobs.store.get(job_id)["result"])
+    for event in jobs.store.events(job_id):
+        print(f"  {event['seq']}. {event['stage']}: {event['message']}")
+    jobs.stop()
+    os.remove(os.path.join(STORE_DIR, "demo_jobs.db"))
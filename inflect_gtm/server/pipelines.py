@@ -0,0 +1,64 @@
+from typing import Dict, Any, Callable
+
+from server.job_queue import JobCancelled
+
+
+def run_onboarding(params: Dict[str, Any], report: Callable, should_cancel: Callable[[], bool]) -> Dict[str, Any]:
+    """
+    Full onboarding pipeline: fetch sheet -> segment -> write docs, plus the post-demo follow-up
+    branch when a meeting log and recipient are given. Each workflow node reports a stage event.
+
+    params: {"sheet": "sheet:customer_info; range:A1:F100", "meeting_log": ..., "to": ..., "force": [...]}
+    """
+    # Agents pull in LLM and Google clients, so they are only imported when a job runs
+    from inflect_gtm.agents.onboarding_workflow import build_onboarding_workflow
+
+    workflow = build_onboarding_workflow(
+        sheet_input=params["sheet"],
+        meeting_log=params.get("meeting_log", ""),
+        to=params.get("to", ""),
+        user_name=params.get("user_name", "Mintae Kim")
+    )
+    result = workflow.run(
+        force=params.get("force"),
+        on_event=lambda event, node, info: report(node, event, **info),
+        should_cancel=should_cancel
+    )
+    if any(status == "cancelled" for status in result["status"].values()):
+        raise JobCancelled()
+
+    memory = result["memory"]
+    failed = {node: error for node, error in result["errors"].items() if result["status"][node] == "failed"}
+    if failed:
+        raise RuntimeError(f"Pipeline nodes failed: {failed}")
+    return {
+        "status": result["status"],
+        "segments": list((memory.get("segments") or {}).keys()),
+        "onboarding_docs": list((memory.get("onboarding_docs") or {}).keys()),
+        "emails_sent": memory.get("emails_sent"),
+    }
+
+
+def run_followup(params: Dict[str, Any], report: Callable, should_cancel: Callable[[], bool]) -> Dict[str, Any]:
+    """
+    Post-demo follow-up: parse the meeting log, then generate and send the follow-up email.
+
+    params: {"meeting_log": ..., "to": "customer@example.com", "user_name": ...}
+    """
+    from inflect_gtm.components import GlobalMemory
+    from inflect_gtm.agents.post_demo_agent import PostDemoFollowupAgent
+
+    report("followup", "Generating follow-up email")
+    agent = PostDemoFollowupAgent()
+    agent.global_memory = GlobalMemory()
+    result = agent.run(dict(params))
+    if not result.get("email_subject"):
+        raise RuntimeError("Follow-up email was not sent.")
+    report("followup", "Follow-up email sent", subject=result["email_subject"])
+    return result
+
+
+PIPELINES = {
+    "onboarding": run_onboarding,
+    "followup": run_followup,
+}
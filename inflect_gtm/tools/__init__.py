@@ -1,4 +1,23 @@
-from inflect_gtm.tools.gmail.gmail_tool import GmailTool
-from inflect_gtm.tools.google_docs.google_docs_tool import GoogleDocsTool
-from inflect_gtm.tools.google_sheets.google_sheets_tool import GoogleSheetsTool
-from inflect_gtm.tools.slack.slack_tool import SlackTool
\ No newline at end of file
+import importlib
+
+# Tools pull in the Google and Slack clients, so they are imported on first access (PEP 562)
+_EXPORTS = {
+    "GmailTool": "inflect_gtm.tools.gmail.gmail_tool",
+    "GoogleDocsTool": "inflect_gtm.tools.google_docs.google_docs_tool",
+    "GoogleSheetsTool": "inflect_gtm.tools.google_sheets.google_sheets_tool",
+    "SlackTool": "inflect_gtm.tools.slack.slack_tool",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
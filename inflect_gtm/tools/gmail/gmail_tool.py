@@ -1,17 +1,24 @@
 import os
 import base64
-from typing import Dict, Any, List
+from typing import Dict, Any, Callable, List, Optional
 from email.mime.text import MIMEText
 from googleapiclient.discovery import build
 from inflect_gtm.components import Tool
-from dotenv import load_dotenv
 from inflect_gtm.tools.utils.google_auth import authenticate
+from inflect_gtm.tools.utils.google_retry import execute_with_retry
 
 
 class GmailTool(Tool):
-    def __init__(self):
+    def __init__(self, build_service: Optional[Callable] = None):
+        """
+        Args:
+            build_service (Callable): Replaces googleapiclient's `build` (and OAuth), e.g. with
+                a fake service from tools/utils/fake_google.py.
+        """
         super().__init__(name="Gmail", function=self.send_email)
-        self.creds = authenticate()
+        self.creds = authenticate() if build_service is None else None
+        self.service = (build_service or build)('gmail', 'v1', credentials=self.creds)
+        self.outbound_queue = None
 
     def send_email(self, context: Dict[str, Any]) -> str:
         input_str = context.get("input", "")
@@ -21,19 +28,24 @@ class GmailTool(Tool):
             subject = parts['subject'].strip()
             body = parts['body'].strip()
 
-            service = build('gmail', 'v1', credentials=self.creds)
-
-            message = MIMEText(body)
-            message['to'] = to
-            message['subject'] = subject
-
-            raw_message = {'raw': base64.urlsafe_b64encode(message.as_bytes()).decode()}
-            service.users().messages().send(userId='me', body=raw_message).execute()
+            raw_message = build_raw_message(to, subject, body)
+            execute_with_retry(self.service.users().messages().send(userId='me', body=raw_message))
 
             return f"📧 Email sent to {to} with subject: {subject}"
         except Exception as e:
             return f"❌ Failed to send email: {str(e)}"
 
+    def queue_emails(self, messages: List[Dict[str, str]]) -> List[str]:
+        """
+        Queues many emails for rate-limited background delivery and returns their outbox ids.
+        Each message is a dict with "to", "subject" and "body".
+        """
+        if self.outbound_queue is None:
+            from inflect_gtm.tools.gmail.outbound_queue import get_queue
+            # One queue per process, shared by every GmailTool
+            self.outbound_queue = get_queue(self.creds)
+        return self.outbound_queue.enqueue(messages)
+
     def fetch_emails(self, context: Dict[str, Any]) -> List[str]:
         """
         Fetches the latest N email threads and returns a list of email bodies.
@@ -41,33 +53,54 @@ class GmailTool(Tool):
         max_results = context.get("n", 10)
         query = context.get("query", "")  # e.g., "from:support@company.com"
 
-        service = build('gmail', 'v1', credentials=self.creds)
+        service = self.service
         results = service.users().messages().list(userId='me', maxResults=max_results, q=query).execute()
         messages = results.get('messages', [])
 
         email_bodies = []
         for msg in messages:
             msg_data = service.users().messages().get(userId='me', id=msg['id'], format='full').execute()
-            payload = msg_data.get("payload", {})
-            parts = payload.get("parts", [])
-
-            # Try plain text first
-            for part in parts:
-                if part.get("mimeType") == "text/plain":
-                    body_data = part.get("body", {}).get("data", "")
-                    if body_data:
-                        decoded = base64.urlsafe_b64decode(body_data).decode("utf-8")
-                        email_bodies.append(decoded)
-                        break
-            else:
-                # Fallback to snippet
-                snippet = msg_data.get("snippet", "")
-                if snippet:
-                    email_bodies.append(snippet)
+            body = extract_body(msg_data)
+            if body:
+                email_bodies.append(body)
 
         return email_bodies
 
 
+def build_raw_message(to: str, subject: str, body: str) -> Dict[str, str]:
+    """
+    Encodes a plain-text email as the raw payload expected by messages.send.
+    """
+    message = MIMEText(body)
+    message['to'] = to
+    message['subject'] = subject
+    return {'raw': base64.urlsafe_b64encode(message.as_bytes()).decode()}
+
+
+def extract_body(msg_data: Dict[str, Any]) -> str:
+    """
+    Returns the plain-text body of a Gmail message resource, falling back to its snippet.
+    """
+    payload = msg_data.get("payload", {})
+    parts = payload.get("parts", [])
+
+    # Try plain text first
+    for part in parts:
+        if part.get("mimeType") == "text/plain":
+            body_data = part.get("body", {}).get("data", "")
+            if body_data:
+                return base64.urlsafe_b64decode(body_data).decode("utf-8")
+
+    # Single-part messages carry the body on the payload itself
+    if payload.get("mimeType") == "text/plain":
+        body_data = payload.get("body", {}).get("data", "")
+        if body_data:
+            return base64.urlsafe_b64decode(body_data).decode("utf-8")
+
+    # Fallback to snippet
+    return msg_data.get("snippet", "")
+
+
 if __name__ == "__main__":
     print("🚀 Testing Gmail tool...")
 
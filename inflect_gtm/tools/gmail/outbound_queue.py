@@ -0,0 +1,303 @@
+import os
+import json
+import time
+import uuid
+import asyncio
+import sqlite3
+import threading
+from typing import Dict, Any, List, Optional
+from googleapiclient.discovery import build
+from inflect_gtm.components.utils.rate_limit import TokenBucket, backoff_delay
+from inflect_gtm.tools.gmail.gmail_tool import build_raw_message
+from inflect_gtm.tools.utils.google_retry import is_retryable, get_status
+
+
+# Define storage paths
+STORE_DIR = os.path.join(os.path.dirname(__file__), "mailbox_store")
+OUTBOX_PATH = os.path.join(STORE_DIR, "outbox.db")
+
+# Gmail allows 250 quota units per user per second and messages.send costs 100 units
+QUOTA_UNITS_PER_SECOND = 250
+SEND_COST = 100
+
+# Messages being sent have their updated_at refreshed this often by the process sending them
+HEARTBEAT_INTERVAL = 30.0
+
+# A "sending" message whose heartbeat is older than this was interrupted by a dead process
+STALE_AFTER = 300.0
+
+_owner_token = None
+_owner_pid = None
+
+
+def owner_token() -> str:
+    """
+    Identifies this process as the sender of the messages it claims; a forked child gets its own.
+    """
+    global _owner_token, _owner_pid
+    if _owner_pid != os.getpid():
+        _owner_token = uuid.uuid4().hex
+        _owner_pid = os.getpid()
+    return _owner_token
+
+
+class Outbox:
+    """
+    SQLite-backed list of outbound messages so pending sends survive a crash.
+
+    Senders claim each message atomically before sending, so queues in several processes can
+    drain the same file without sending a message twice. Delivery is at-least-once only up to
+    the send call: a message whose sender died while it was "sending" may or may not have
+    reached Gmail, so once its heartbeat goes stale it is marked "unknown" for manual review
+    instead of being sent again.
+    """
+
+    def __init__(self, path: str = OUTBOX_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id TEXT PRIMARY KEY,
+                payload TEXT,
+                status TEXT,
+                attempts INTEGER DEFAULT 0,
+                error TEXT,
+                owner TEXT,
+                created_at REAL,
+                updated_at REAL
+            )
+        """)
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(outbox)")]
+        if "owner" not in columns:
+            self.conn.execute("ALTER TABLE outbox ADD COLUMN owner TEXT")
+        self.conn.commit()
+
+    def add(self, messages: List[Dict[str, str]]) -> List[str]:
+        now = time.time()
+        rows = [(uuid.uuid4().hex, json.dumps(m), "pending", now, now) for m in messages]
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO outbox (id, payload, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+        return [row[0] for row in rows]
+
+    def pending(self) -> List[tuple]:
+        """
+        Returns (id, payload) for every message not yet picked up by a sender.
+        """
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT id, payload FROM outbox WHERE status = 'pending' ORDER BY created_at"
+            ).fetchall()
+        return [(mid, json.loads(payload)) for mid, payload in rows]
+
+    def claim(self, message_id: str) -> bool:
+        """
+        Moves a pending message to "sending" for this process. Returns False when another
+        sender already claimed it.
+        """
+        with self.lock, self.conn:
+            return self.conn.execute(
+                "UPDATE outbox SET status = 'sending', owner = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE id = ? AND status = 'pending'",
+                (owner_token(), time.time(), message_id)
+            ).rowcount == 1
+
+    def update(self, message_id: str, status: str, error: Optional[str] = None):
+        """
+        Records the outcome of a send claimed by this process.
+        """
+        with self.lock, self.conn:
+            self.conn.execute(
+                "UPDATE outbox SET status = ?, error = ?, updated_at = ? WHERE id = ? AND owner = ?",
+                (status, error, time.time(), message_id, owner_token())
+            )
+
+    def heartbeat(self) -> int:
+        """
+        Refreshes updated_at on the messages this process is sending. Returns how many.
+        """
+        with self.lock, self.conn:
+            return self.conn.execute(
+                "UPDATE outbox SET updated_at = ? WHERE status = 'sending' AND owner = ?",
+                (time.time(), owner_token())
+            ).rowcount
+
+    def mark_interrupted(self, stale_after: float = STALE_AFTER) -> int:
+        """
+        Marks "sending" messages whose sender stopped heartbeating as "unknown", since there is
+        no way to tell whether Gmail accepted them.
+
+        Returns:
+            int: Number of messages marked.
+        """
+        with self.lock, self.conn:
+            return self.conn.execute(
+                "UPDATE outbox SET status = 'unknown', error = ?, updated_at = ? WHERE status = 'sending' AND updated_at < ?",
+                ("Interrupted while sending; check the Sent folder before retrying", time.time(), time.time() - stale_after)
+            ).rowcount
+
+    def counts(self) -> Dict[str, int]:
+        with self.lock:
+            rows = self.conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        return dict(rows)
+
+
+class OutboundEmailQueue:
+    """
+    Asynchronous outbound email queue for Gmail.
+    Messages are persisted first, then sent concurrently under a token bucket sized to the
+    per-user send quota. 429 and 5xx responses are retried with jittered backoff.
+    Messages interrupted mid-send by a crash are not retried (see Outbox). Use `get_queue`
+    for the process-wide queue rather than building one per caller.
+    """
+
+    def __init__(
+        self,
+        creds,
+        outbox: Optional[Outbox] = None,
+        concurrency: int = 4,
+        sends_per_second: float = QUOTA_UNITS_PER_SECOND / SEND_COST,
+        max_retries: int = 6,
+    ):
+        """
+        Args:
+            creds: Google API credentials with Gmail send scope.
+            outbox (Outbox): Persistent store for queued messages.
+            concurrency (int): Number of sends allowed in flight at once.
+            sends_per_second (float): Sustained send rate for the token bucket.
+            max_retries (int): Retries per message for retryable errors.
+        """
+        self.creds = creds
+        self.outbox = outbox or Outbox()
+        self.concurrency = concurrency
+        self.bucket = TokenBucket(rate=sends_per_second, capacity=max(1.0, sends_per_second))
+        self.max_retries = max_retries
+        self._local = threading.local()
+        self._thread = None
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+
+    def enqueue(self, messages: List[Dict[str, str]]) -> List[str]:
+        """
+        Persists messages (dicts with "to", "subject", "body") and wakes the background sender.
+
+        Returns:
+            List[str]: Outbox ids of the queued messages.
+        """
+        ids = self.outbox.add(messages)
+        self._wakeup.set()
+        return ids
+
+    def _service(self):
+        # googleapiclient services are not thread-safe, so each sender thread gets its own
+        service = getattr(self._local, "service", None)
+        if service is None:
+            service = build('gmail', 'v1', credentials=self.creds)
+            self._local.service = service
+        return service
+
+    def _send(self, message: Dict[str, str]):
+        raw_message = build_raw_message(message["to"], message["subject"], message["body"])
+        self._service().users().messages().send(userId='me', body=raw_message).execute()
+
+    async def _deliver(self, message_id: str, message: Dict[str, str], semaphore: asyncio.Semaphore):
+        async with semaphore:
+            if not self.outbox.claim(message_id):
+                # Already picked up by another queue or process
+                return None
+            attempt = 0
+            while True:
+                await self.bucket.acquire_async()
+                try:
+                    await asyncio.to_thread(self._send, message)
+                    self.outbox.update(message_id, "sent")
+                    return True
+                except Exception as e:
+                    if attempt >= self.max_retries or not is_retryable(e):
+                        self.outbox.update(message_id, "failed", str(e))
+                        return False
+                    delay = backoff_delay(attempt)
+                    if get_status(e) == 429:
+                        # Back off the whole queue, not just this message
+                        self.bucket.penalize(delay)
+                    await asyncio.sleep(delay)
+                    attempt += 1
+
+    async def drain(self) -> Dict[str, int]:
+        """
+        Sends everything currently pending and returns counts of sent and failed messages.
+        """
+        self.outbox.mark_interrupted()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        pending = self.outbox.pending()
+        heartbeat = asyncio.ensure_future(self._heartbeat())
+        try:
+            results = await asyncio.gather(*(self._deliver(mid, msg, semaphore) for mid, msg in pending))
+        finally:
+            heartbeat.cancel()
+        return {"sent": results.count(True), "failed": results.count(False)}
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            self.outbox.heartbeat()
+
+    def start(self):
+        """
+        Starts a background thread that drains the outbox whenever new messages are enqueued.
+        Pending messages left over from a previous run are sent on start.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._wakeup.set()
+        self._thread = threading.Thread(target=self._loop, name="gmail-outbox", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _loop(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                break
+            asyncio.run(self.drain())
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_queue(creds) -> OutboundEmailQueue:
+    """
+    Returns the process-wide outbound queue, creating and starting it on first use.
+    """
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = OutboundEmailQueue(creds)
+                _queue.start()
+    return _queue
+
+
+if __name__ == "__main__":
+    from inflect_gtm.tools.utils.google_auth import authenticate
+
+    print("🚀 Testing outbound email queue...")
+    queue = OutboundEmailQueue(authenticate())
+    queue.enqueue([
+        {"to": "customer@example.com", "subject": f"Test Email {i}", "body": "This is a queued test."}
+        for i in range(3)
+    ])
+    print("📤 Drain Result:", asyncio.run(queue.drain()))
+    print("📊 Outbox:", queue.outbox.counts())
@@ -2,17 +2,22 @@ import json
 import datetime
 from dateutil import parser as dt_parser
 from difflib import SequenceMatcher
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Callable, List, Optional
 from googleapiclient.discovery import build
 from inflect_gtm.components.tool.tool import Tool
 from inflect_gtm.tools.utils.google_auth import authenticate
 
 
 class GoogleCalendarTool(Tool):
-    def __init__(self):
+    def __init__(self, build_service: Optional[Callable] = None):
+        """
+        Args:
+            build_service (Callable): Replaces googleapiclient's `build` (and OAuth), e.g. with
+                a fake service from tools/utils/fake_google.py.
+        """
         super().__init__(name="GoogleCalendar", function=self.get_upcoming_events)
-        self.creds = authenticate()
-        self.service = build("calendar", "v3", credentials=self.creds)
+        self.creds = authenticate() if build_service is None else None
+        self.service = (build_service or build)("calendar", "v3", credentials=self.creds)
 
     def get_upcoming_events(self, context: Dict[str, Any]) -> Dict[str, Any]:
         try:
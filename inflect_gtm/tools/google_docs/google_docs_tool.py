@@ -1,23 +1,98 @@
 import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
-from typing import Dict, Any
+from typing import Dict, Any, Callable, List, Optional, Tuple
 from inflect_gtm.components import Tool
-from dotenv import load_dotenv
+from inflect_gtm.components.utils.rate_limit import TokenBucket
+from inflect_gtm.tools.utils.google_retry import execute_with_retry
+from inflect_gtm.components.utils.env import PROJECT_ROOT, load_env
 
 # Load environment variables from .env
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
-load_dotenv(dotenv_path=os.path.join(project_root, ".env"))
+load_env()
+project_root = PROJECT_ROOT
 
 # Google Docs API scope
 SCOPES = ['https://www.googleapis.com/auth/documents']
 
+# Docs API per-user write quota; each published document costs two writes (create + batchUpdate)
+WRITE_REQUESTS_PER_MINUTE = 60
+
+HEADING = re.compile(r"^(#{1,6})\s+(.*)$")
+BULLET = re.compile(r"^\s*[-*•]\s+(.*)$")
+NUMBERED = re.compile(r"^\s*\d+[.)]\s+(.*)$")
+
+# Number of documents whose extracted text is kept in memory
+TEXT_CACHE_SIZE = 256
+
+
+class DocumentTextCache:
+    """
+    LRU cache of extracted document text keyed by documentId and validated by revisionId.
+    """
+
+    def __init__(self, max_size: int = TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, document_id: str) -> Optional[Tuple[str, str, str]]:
+        with self.lock:
+            entry = self.entries.get(document_id)
+            if entry is not None:
+                self.entries.move_to_end(document_id)
+            return entry
+
+    def put(self, document_id: str, revision_id: str, title: str, text: str):
+        with self.lock:
+            self.entries[document_id] = (revision_id, title, text)
+            self.entries.move_to_end(document_id)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+
+document_text_cache = DocumentTextCache()
+
 
 class GoogleDocsTool(Tool):
-    def __init__(self):
+    def __init__(self, writes_per_minute: int = WRITE_REQUESTS_PER_MINUTE, build_service: Optional[Callable] = None):
+        """
+        Args:
+            writes_per_minute (int): Write requests allowed per minute.
+            build_service (Callable): Replaces googleapiclient's `build` (and OAuth), e.g. with
+                a fake service from tools/utils/fake_google.py.
+        """
         super().__init__(name="GoogleDocs", function=self.create_doc)
+        self.build_service = build_service
+        self.creds = None
+        self.creds_lock = threading.Lock()
+        self.local = threading.local()
+        self.write_bucket = TokenBucket(rate=writes_per_minute / 60, capacity=writes_per_minute)
+
+    def get_service(self):
+        """
+        Returns a Docs client for the current thread, loading credentials once per tool.
+        googleapiclient clients are not thread-safe, so each worker thread builds its own.
+        """
+        if self.build_service is not None:
+            service = getattr(self.local, "service", None)
+            if service is None:
+                service = self.local.service = self.build_service('docs', 'v1', credentials=None)
+            return service
+        with self.creds_lock:
+            if self.creds is None or not self.creds.valid:
+                self.creds = self.load_credentials()
+                self.local = threading.local()
+        service = getattr(self.local, "service", None)
+        if service is None:
+            service = build('docs', 'v1', credentials=self.creds)
+            self.local.service = service
+        return service
 
     def load_credentials(self):
         creds = None
@@ -42,41 +117,218 @@ class GoogleDocsTool(Tool):
             title = parts["title"].strip()
             content = parts["content"].strip()
 
-            creds = self.load_credentials()
-            service = build('docs', 'v1', credentials=creds)
-
-            doc = service.documents().create(body={'title': title}).execute()
-            document_id = doc['documentId']
-
-            requests = [{
-                'insertText': {
-                    'location': {'index': 1},
-                    'text': content
-                }
-            }]
-            service.documents().batchUpdate(documentId=document_id, body={'requests': requests}).execute()
+            document_id = self.publish_doc(title, content)
 
             return f"📝 Google Doc '{title}' created. Link: https://docs.google.com/document/d/{document_id}"
 
         except Exception as e:
             return f"❌ Failed to create Google Doc: {str(e)}"
 
-    def read_doc(self, document_id: str) -> str:
-        try:
-            creds = self.load_credentials()
-            service = build('docs', 'v1', credentials=creds)
-            doc = service.documents().get(documentId=document_id).execute()
+    def publish_doc(self, title: str, content: str) -> str:
+        """
+        Creates a document and fills it with structured content in a single batchUpdate.
+
+        Returns:
+            str: The new document id.
+        """
+        service = self.get_service()
+
+        self.write_bucket.acquire()
+        doc = execute_with_retry(service.documents().create(body={'title': title}))
+        document_id = doc['documentId']
+
+        requests = build_requests(content)
+        if requests:
+            self.write_bucket.acquire()
+            execute_with_retry(service.documents().batchUpdate(documentId=document_id, body={'requests': requests}))
+        return document_id
+
+    def publish_docs(self, docs: List[Tuple[str, str]], max_workers: int = 8) -> List[Dict[str, Any]]:
+        """
+        Publishes many documents concurrently within the write quota.
+
+        Args:
+            docs (List[Tuple[str, str]]): (title, content) pairs.
+            max_workers (int): Number of documents published in parallel.
 
-            text = ''
-            for element in doc.get('body', {}).get('content', []):
-                if 'paragraph' in element:
-                    for p_element in element['paragraph'].get('elements', []):
-                        text += p_element.get('textRun', {}).get('content', '')
+        Returns:
+            List[Dict[str, Any]]: Manifest in input order with title, document_id, link and status.
+        """
+        def publish(item):
+            title, content = item
+            try:
+                document_id = self.publish_doc(title, content)
+                return {
+                    "title": title,
+                    "document_id": document_id,
+                    "link": f"https://docs.google.com/document/d/{document_id}",
+                    "status": "created"
+                }
+            except Exception as e:
+                return {"title": title, "document_id": None, "link": None, "status": "failed", "error": str(e)}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(publish, docs))
 
-            return f"📝 Content of document '{doc['title']}':\n{text.strip()}"
+    def read_doc(self, document_id: str) -> str:
+        try:
+            title, text, _ = self.get_text(document_id)
+            return f"📝 Content of document '{title}':\n{text.strip()}"
         except Exception as e:
             return f"❌ Failed to read Google Doc: {str(e)}"
 
+    def get_text(self, document_id: str) -> Tuple[str, str, str]:
+        """
+        Returns (title, text, revisionId) for a document, re-fetching the full body only
+        when its revision differs from the cached one. Documents returned without a
+        revisionId (e.g. to callers without edit access) are never cached.
+        """
+        service = self.get_service()
+        cached = document_text_cache.get(document_id)
+        if cached:
+            # A fields mask keeps the revision check to a few bytes
+            meta = execute_with_retry(service.documents().get(documentId=document_id, fields='revisionId,title'))
+            if meta.get('revisionId') and meta['revisionId'] == cached[0]:
+                return cached[1], cached[2], cached[0]
+
+        doc = execute_with_retry(service.documents().get(documentId=document_id))
+        text = extract_text(doc)
+        # Without a revision there is nothing to validate a cached copy against
+        if doc.get('revisionId'):
+            document_text_cache.put(document_id, doc['revisionId'], doc.get('title', ''), text)
+        return doc.get('title', ''), text, doc.get('revisionId')
+
+    def read_doc_chunks(self, document_id: str, chunk_size: int = 1000, overlap: int = 100) -> Tuple[List[str], List[Dict]]:
+        """
+        Splits a document into overlapping chunks for vector_store.add_documents.
+
+        Args:
+            document_id (str): Google Docs document id.
+            chunk_size (int): Maximum characters per chunk.
+            overlap (int): Characters carried over from the end of the previous chunk.
+
+        Returns:
+            Tuple[List[str], List[Dict]]: Chunk texts and their metadata.
+        """
+        title, text, revision_id = self.get_text(document_id)
+        texts = chunk_text(text, chunk_size, overlap)
+        metadatas = [
+            {"source": "google_docs", "document_id": document_id, "revision_id": revision_id, "title": title, "chunk": i}
+            for i in range(len(texts))
+        ]
+        return texts, metadatas
+
+
+def extract_text(document: Dict[str, Any]) -> str:
+    """
+    Extracts the text of a Docs document in reading order, including tables, nested tables
+    and tables of contents. Pieces are collected in a list and joined once.
+    """
+    pieces = []
+    stack = [iter(document.get('body', {}).get('content', []))]
+    while stack:
+        element = next(stack[-1], None)
+        if element is None:
+            stack.pop()
+            continue
+        if 'paragraph' in element:
+            for p_element in element['paragraph'].get('elements', []):
+                pieces.append(p_element.get('textRun', {}).get('content', ''))
+        elif 'table' in element:
+            cells = (
+                content
+                for row in element['table'].get('tableRows', [])
+                for cell in row.get('tableCells', [])
+                for content in cell.get('content', [])
+            )
+            stack.append(cells)
+        elif 'tableOfContents' in element:
+            stack.append(iter(element['tableOfContents'].get('content', [])))
+    return ''.join(pieces)
+
+
+def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 100) -> List[str]:
+    """
+    Splits text into chunks of at most `chunk_size` characters, preferring paragraph breaks.
+    """
+    text = text.strip()
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(len(text), start + chunk_size)
+        if end < len(text):
+            # Break at the last paragraph boundary in the second half of the window
+            boundary = text.rfind('\n', start + chunk_size // 2, end)
+            if boundary != -1:
+                end = boundary + 1
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return chunks
+
+
+def build_requests(content: str) -> List[Dict[str, Any]]:
+    """
+    Converts markdown-style text into Docs batchUpdate requests: one insertText for the whole
+    body, followed by heading styles and bullet/numbered lists for the matching paragraphs.
+    """
+    lines, styles = [], []
+    for line in content.splitlines():
+        heading = HEADING.match(line)
+        bullet = BULLET.match(line)
+        numbered = NUMBERED.match(line)
+        if heading:
+            lines.append(heading.group(2))
+            styles.append(f"HEADING_{len(heading.group(1))}")
+        elif bullet:
+            lines.append(bullet.group(1))
+            styles.append("BULLET_DISC_CIRCLE_SQUARE")
+        elif numbered:
+            lines.append(numbered.group(1))
+            styles.append("NUMBERED_DECIMAL_ALPHA_ROMAN")
+        else:
+            lines.append(line)
+            styles.append(None)
+
+    if not lines:
+        return []
+
+    text = "\n".join(lines) + "\n"
+    requests = [{'insertText': {'location': {'index': 1}, 'text': text}}]
+
+    # Docs indexes are UTF-16 code units and the body starts at index 1
+    index = 1
+    spans = []
+    for line, style in zip(lines, styles):
+        end = index + len(line.encode('utf-16-le')) // 2 + 1
+        spans.append((index, end, style))
+        index = end
+
+    list_start = None
+    for i, (start, end, style) in enumerate(spans):
+        if style and style.startswith("HEADING"):
+            requests.append({'updateParagraphStyle': {
+                'range': {'startIndex': start, 'endIndex': end},
+                'paragraphStyle': {'namedStyleType': style},
+                'fields': 'namedStyleType'
+            }})
+        # Consecutive list paragraphs of the same kind become one list
+        is_list = style in ("BULLET_DISC_CIRCLE_SQUARE", "NUMBERED_DECIMAL_ALPHA_ROMAN")
+        if is_list and list_start is None:
+            list_start = i
+        next_style = spans[i + 1][2] if i + 1 < len(spans) else None
+        if list_start is not None and next_style != style:
+            requests.append({'createParagraphBullets': {
+                'range': {'startIndex': spans[list_start][0], 'endIndex': end},
+                'bulletPreset': style
+            }})
+            list_start = None
+
+    return requests
+
 
 if __name__ == "__main__":
     print("🚀 Testing Google Docs tool...")
@@ -88,4 +340,12 @@ if __name__ == "__main__":
     doc_id = create_result.split("/d/")[-1] if "/d/" in create_result else None
     if doc_id:
         read_result = docs_tool.read_doc(doc_id.split("/")[0])
-        print("🔍 Read doc result:", read_result)
\ No newline at end of file
+        print("🔍 Read doc result:", read_result)
+        texts, metadatas = docs_tool.read_doc_chunks(doc_id.split("/")[0], chunk_size=200)
+        print(f"🔍 Chunked into {len(texts)} pieces:", metadatas)
+
+    manifest = docs_tool.publish_docs([
+        (f"Onboarding - Segment {i}", f"# Segment {i}\n\nWelcome!\n\n- Step one\n- Step two\n\n1. Kickoff\n2. Review")
+        for i in range(3)
+    ])
+    print("🔍 Publish manifest:", manifest)
\ No newline at end of file
@@ -1,15 +1,19 @@
 import os
-from typing import Dict, Any
+import re
+import time
+import threading
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from inflect_gtm.components import Tool
-from dotenv import load_dotenv
+from inflect_gtm.components.utils.env import PROJECT_ROOT, load_env
+from inflect_gtm.tools.utils.google_retry import get_status
 
 # Load environment variables from .env
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
-load_dotenv(dotenv_path=os.path.join(project_root, ".env"))
+load_env()
+project_root = PROJECT_ROOT
 
 # Google Sheets API scopes
 SCOPES = [
@@ -17,9 +21,70 @@ SCOPES = [
     'https://www.googleapis.com/auth/drive.metadata.readonly'
 ]
 
+# Rows fetched per values().get call when streaming a sheet
+DEFAULT_CHUNK_SIZE = 1000
+
+# Columns run up to three letters (ZZZ), so a longer run of letters is a tab name, not a cell reference
+A1_RANGE = re.compile(r"^(?P<start_col>[A-Za-z]{0,3})(?P<start_row>\d*)(?::(?P<end_col>[A-Za-z]{0,3})(?P<end_row>\d*))?$")
+
+# Rows sent per values.append / values.batchUpdate request
+WRITE_CHUNK_SIZE = 5000
+
+# Seconds a resolved sheet title is trusted before Drive is asked whether it changed
+TITLE_CACHE_TTL = 300
+
+
+class SpreadsheetIdCache:
+    """
+    Process-wide TTL cache from spreadsheet title to (id, modifiedTime).
+    After the TTL expires, Drive is only asked for same-titled files modified since the
+    cached modifiedTime, so an unchanged title resolves from a cheap empty response.
+    """
+
+    def __init__(self, ttl: float = TITLE_CACHE_TTL):
+        self.ttl = ttl
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def get(self, title: str):
+        with self.lock:
+            return self.entries.get(title)
+
+    def put(self, title: str, spreadsheet_id: str, modified_time: str):
+        with self.lock:
+            self.entries[title] = (spreadsheet_id, modified_time, time.monotonic())
+
+    def touch(self, title: str):
+        with self.lock:
+            if title in self.entries:
+                spreadsheet_id, modified_time, _ = self.entries[title]
+                self.entries[title] = (spreadsheet_id, modified_time, time.monotonic())
+
+    def is_fresh(self, entry) -> bool:
+        return time.monotonic() - entry[2] < self.ttl
+
+    def invalidate(self, title: Optional[str] = None):
+        with self.lock:
+            if title is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(title, None)
+
+
+spreadsheet_id_cache = SpreadsheetIdCache()
+
+
 class GoogleSheetsTool(Tool):
-    def __init__(self):
+    def __init__(self, build_service: Optional[Callable] = None):
+        """
+        Args:
+            build_service (Callable): Replaces googleapiclient's `build` (and OAuth), e.g. with
+                a fake service from tools/utils/fake_google.py.
+        """
         super().__init__(name="GoogleSheets", function=self.read_sheet)
+        self.creds = None
+        self.services = {}
+        self.build_service = build_service
 
     def get_credentials(self):
         cred_path = os.path.join(project_root, os.getenv("GOOGLE_CREDENTIALS_PATH"))
@@ -38,38 +103,100 @@ class GoogleSheetsTool(Tool):
                 token.write(creds.to_json())
         return creds
 
+    def get_service(self, api: str = 'sheets', version: str = 'v4'):
+        """
+        Returns a cached API client, reloading credentials only when they have expired.
+        """
+        if self.build_service is not None:
+            if (api, version) not in self.services:
+                self.services[(api, version)] = self.build_service(api, version, credentials=None)
+            return self.services[(api, version)]
+        if self.creds is None or not self.creds.valid:
+            self.creds = self.get_credentials()
+            self.services = {}
+        if (api, version) not in self.services:
+            self.services[(api, version)] = build(api, version, credentials=self.creds)
+        return self.services[(api, version)]
+
+    def resolve_spreadsheet_id(self, parts: Dict[str, str]) -> Optional[str]:
+        """
+        Returns the spreadsheet id from 'id', or looks up the most recently modified
+        spreadsheet named 'sheet' in Drive. Returns None if neither resolves.
+        """
+        spreadsheet_id = parts.get('id')
+        sheet_title = parts.get('sheet')
+        if spreadsheet_id:
+            return spreadsheet_id.strip()
+        if not sheet_title:
+            return None
+
+        sheet_title = sheet_title.strip()
+        cached = spreadsheet_id_cache.get(sheet_title)
+        if cached and spreadsheet_id_cache.is_fresh(cached):
+            return cached[0]
+
+        escaped_title = sheet_title.replace("\\", "\\\\").replace("'", "\\'")
+        query = f"mimeType='application/vnd.google-apps.spreadsheet' and name='{escaped_title}' and trashed=false"
+        if cached:
+            query += f" and modifiedTime > '{cached[1]}'"
+
+        response = self.get_service('drive', 'v3').files().list(
+            q=query,
+            spaces='drive',
+            fields='files(id, name, modifiedTime)',
+            orderBy='modifiedTime desc',
+            pageSize=1
+        ).execute()
+        files = response.get('files', [])
+        if files:
+            spreadsheet_id_cache.put(sheet_title, files[0]['id'], files[0]['modifiedTime'])
+            return files[0]['id']
+        if cached:
+            # Nothing with this title changed since the cached lookup
+            spreadsheet_id_cache.touch(sheet_title)
+            return cached[0]
+        return None
+
+    def call_with_spreadsheet(self, parts: Dict[str, str], call: Callable[[str], Any]):
+        """
+        Resolves the spreadsheet id and returns (id, call(id)), or (None, None) if it does not
+        resolve. A 404 for a sheet given by title means the cached id points at a deleted or
+        replaced file, so the title is dropped from the cache and resolved once more.
+        """
+        spreadsheet_id = self.resolve_spreadsheet_id(parts)
+        if not spreadsheet_id:
+            return None, None
+        try:
+            return spreadsheet_id, call(spreadsheet_id)
+        except Exception as e:
+            sheet_title = (parts.get('sheet') or '').strip()
+            if get_status(e) != 404 or parts.get('id') or not sheet_title:
+                raise
+
+        spreadsheet_id_cache.invalidate(sheet_title)
+        spreadsheet_id = self.resolve_spreadsheet_id(parts)
+        if not spreadsheet_id:
+            return None, None
+        return spreadsheet_id, call(spreadsheet_id)
+
     def read_sheet(self, context: Dict[str, Any]) -> str:
         input_str = context.get("input", "")
         try:
             parts = dict(x.split(':', 1) for x in input_str.split('; '))
             cell_range = parts['range'].strip()
             sheet_title = parts.get('sheet')
-            spreadsheet_id = parts.get('id')
-
-            creds = self.get_credentials()
-            service = build('sheets', 'v4', credentials=creds)
-
-            if not spreadsheet_id and sheet_title:
-                drive_service = build('drive', 'v3', credentials=creds)
-                response = drive_service.files().list(
-                    q=f"mimeType='application/vnd.google-apps.spreadsheet' and name='{sheet_title}'",
-                    spaces='drive',
-                    fields='files(id, name, modifiedTime)',
-                    orderBy='modifiedTime desc',
-                    pageSize=1
-                ).execute()
-                files = response.get('files', [])
-                if not files:
-                    return f"❌ No spreadsheet found with title: {sheet_title}"
-                spreadsheet_id = files[0]['id']
 
-            if not spreadsheet_id:
+            if not parts.get('id') and not sheet_title:
                 return "❌ Please provide either 'id' or 'sheet' in input."
 
-            result = service.spreadsheets().values().get(
-                spreadsheetId=spreadsheet_id,
-                range=cell_range
-            ).execute()
+            values_api = self.get_service().spreadsheets().values()
+            spreadsheet_id, result = self.call_with_spreadsheet(
+                parts, lambda spreadsheet_id: values_api.get(spreadsheetId=spreadsheet_id, range=cell_range).execute()
+            )
+
+            if not spreadsheet_id:
+                return f"❌ No spreadsheet found with title: {sheet_title}"
+
             values = result.get('values', [])
 
             if not values:
@@ -88,8 +215,7 @@ class GoogleSheetsTool(Tool):
             cell_range = parts["range"].strip()
             values = [cell.strip() for cell in parts["values"].split(',')]
 
-            creds = self.get_credentials()
-            service = build('sheets', 'v4', credentials=creds)
+            service = self.get_service()
 
             spreadsheet = {
                 'properties': {'title': sheet_title}
@@ -112,6 +238,151 @@ class GoogleSheetsTool(Tool):
         except Exception as e:
             return f"❌ Failed to update Google Sheet: {str(e)}"
 
+    def write_records(self, context: Dict[str, Any], records: List[dict]) -> str:
+        """
+        Writes many records to an existing spreadsheet in a handful of requests.
+
+        Args:
+            context (Dict[str, Any]): Input string with 'sheet' or 'id', an optional 'tab', and
+                'mode' set to "append" (default) or "upsert" with a 'key' column
+                (e.g. "sheet:customer_info; tab:Segments; mode:upsert; key:Email").
+            records (List[dict]): Rows keyed by column header.
+
+        Returns:
+            str: Status message.
+        """
+        try:
+            parts = dict(x.split(':', 1) for x in context.get("input", "").split('; '))
+            spreadsheet_id = self.resolve_spreadsheet_id(parts)
+            if not spreadsheet_id:
+                return "❌ Please provide either 'id' or an existing 'sheet' in input."
+            tab = parts.get('tab', '').strip()
+            mode = parts.get('mode', 'append').strip()
+
+            if mode == "upsert":
+                key = parts.get('key', '').strip()
+                if not key:
+                    return "❌ Upsert mode requires a 'key' column."
+                updated, appended = self.upsert_records(spreadsheet_id, tab, records, key)
+            else:
+                updated, appended = 0, self.append_records(spreadsheet_id, tab, records)
+
+            return f"📊 Wrote {len(records)} records ({updated} updated, {appended} appended). Link: https://docs.google.com/spreadsheets/d/{spreadsheet_id}"
+
+        except Exception as e:
+            return f"❌ Failed to update Google Sheet: {str(e)}"
+
+    def append_records(self, spreadsheet_id: str, tab: str, records: List[dict]) -> int:
+        """
+        Appends records below the existing data, adding any missing columns to the header.
+        """
+        if not records:
+            return 0
+        headers = self._ensure_headers(spreadsheet_id, tab, records)
+        rows = [[record.get(h) for h in headers] for record in records]
+        self._append_rows(spreadsheet_id, tab, rows)
+        return len(rows)
+
+    def upsert_records(self, spreadsheet_id: str, tab: str, records: List[dict], key: str):
+        """
+        Updates rows whose `key` column matches a record and appends the rest.
+        Cells for fields a record does not carry are left untouched.
+
+        Returns:
+            tuple: (number of updated rows, number of appended rows)
+        """
+        if not records:
+            return 0, 0
+        headers = self._ensure_headers(spreadsheet_id, tab, records + [{key: None}])
+        values_api = self.get_service().spreadsheets().values()
+        prefix = self._tab_prefix(tab)
+
+        # One read of the key column maps every existing key to its sheet row
+        key_col = self._column_letter(headers.index(key) + 1)
+        key_values = values_api.get(
+            spreadsheetId=spreadsheet_id,
+            range=f"{prefix}{key_col}2:{key_col}",
+            valueRenderOption='UNFORMATTED_VALUE'
+        ).execute().get('values', [])
+        row_for_key = {str(row[0]): index + 2 for index, row in enumerate(key_values) if row}
+
+        last_col = self._column_letter(len(headers))
+        updates, new_rows = [], []
+        for record in records:
+            # None is skipped by the Sheets API, so missing fields keep their current value
+            row = [record.get(h) for h in headers]
+            sheet_row = row_for_key.get(str(record.get(key)))
+            if sheet_row:
+                updates.append({"range": f"{prefix}A{sheet_row}:{last_col}{sheet_row}", "values": [row]})
+            else:
+                new_rows.append(row)
+
+        for start in range(0, len(updates), WRITE_CHUNK_SIZE):
+            values_api.batchUpdate(
+                spreadsheetId=spreadsheet_id,
+                body={"valueInputOption": "RAW", "data": updates[start:start + WRITE_CHUNK_SIZE]}
+            ).execute()
+        self._append_rows(spreadsheet_id, tab, new_rows)
+        return len(updates), len(new_rows)
+
+    def _append_rows(self, spreadsheet_id: str, tab: str, rows: List[list]):
+        values_api = self.get_service().spreadsheets().values()
+        for start in range(0, len(rows), WRITE_CHUNK_SIZE):
+            values_api.append(
+                spreadsheetId=spreadsheet_id,
+                range=f"{self._tab_prefix(tab)}A1",
+                valueInputOption="RAW",
+                insertDataOption="INSERT_ROWS",
+                body={"values": rows[start:start + WRITE_CHUNK_SIZE]}
+            ).execute()
+
+    def _ensure_headers(self, spreadsheet_id: str, tab: str, records: List[dict]) -> List[str]:
+        """
+        Returns the tab's header row, creating the tab or extending the header with new fields as needed.
+        """
+        service = self.get_service()
+        if tab:
+            sheets = service.spreadsheets().get(
+                spreadsheetId=spreadsheet_id,
+                fields='sheets.properties.title'
+            ).execute().get('sheets', [])
+            if tab not in [sheet['properties']['title'] for sheet in sheets]:
+                service.spreadsheets().batchUpdate(
+                    spreadsheetId=spreadsheet_id,
+                    body={"requests": [{"addSheet": {"properties": {"title": tab}}}]}
+                ).execute()
+
+        prefix = self._tab_prefix(tab)
+        header_rows = service.spreadsheets().values().get(
+            spreadsheetId=spreadsheet_id,
+            range=f"{prefix}1:1"
+        ).execute().get('values', [])
+        headers = [str(h).strip() for h in header_rows[0]] if header_rows else []
+
+        missing = list(dict.fromkeys(field for record in records for field in record if field not in headers))
+        if missing:
+            headers += missing
+            service.spreadsheets().values().update(
+                spreadsheetId=spreadsheet_id,
+                range=f"{prefix}A1",
+                valueInputOption="RAW",
+                body={"values": [headers]}
+            ).execute()
+        return headers
+
+    def _tab_prefix(self, tab: str) -> str:
+        if not tab:
+            return ""
+        return f"{tab}!" if tab.startswith("'") else f"'{tab}'!"
+
+    def _column_letter(self, index: int) -> str:
+        # 1 -> A, 26 -> Z, 27 -> AA
+        letters = ""
+        while index:
+            index, remainder = divmod(index - 1, 26)
+            letters = chr(ord('A') + remainder) + letters
+        return letters
+
     def parse_sheet_text(self, sheet_text: str) -> list[dict]:
         lines = [line.strip() for line in sheet_text.strip().splitlines() if line.strip()]
         if not lines or len(lines) < 2:
@@ -127,11 +398,164 @@ class GoogleSheetsTool(Tool):
 
         return rows
 
+    def iter_row_chunks(self, context: Dict[str, Any], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[dict]]:
+        """
+        Streams a sheet as lists of typed records, fetching `chunk_size` rows per request.
+        See `iter_value_chunks` for how the range is interpreted.
+        """
+        for headers, rows in self.iter_value_chunks(context, chunk_size):
+            yield self._to_records(headers, rows)
+
+    def read_table(self, context: Dict[str, Any], chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Reads a sheet into a columnar CustomerTable, building frames from raw value rows
+        so no per-row dicts are created.
+        """
+        # Imported here so record-based reads never pay for pandas
+        from inflect_gtm.components.data.customer_table import CustomerTable, rows_to_frame
+        return CustomerTable.from_frames(
+            rows_to_frame(headers, rows) for headers, rows in self.iter_value_chunks(context, chunk_size)
+        )
+
+    def iter_value_chunks(self, context: Dict[str, Any], chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Streams a sheet as (headers, value rows) chunks, fetching `chunk_size` rows per request.
+
+        The first row of the range is used as the header. Columns and the starting row come
+        from 'range' (e.g. "A1:F100", "Customers!A1:F" or just "Customers"); rows are paged up
+        to the tab's row count rather than stopping at the range's end row. The API drops
+        trailing blank rows, so a short or empty chunk does not by itself mean the end.
+
+        Args:
+            context (Dict[str, Any]): Input string with 'sheet' or 'id' and an optional 'range'.
+            chunk_size (int): Number of rows fetched per request.
+
+        Yields:
+            tuple: Header names and a list of rows of unformatted cell values.
+        """
+        parts = dict(x.split(':', 1) for x in context.get("input", "").split('; '))
+        spreadsheet_id, row_counts = self.call_with_spreadsheet(parts, self._tab_row_counts)
+        if not spreadsheet_id:
+            raise ValueError(f"No spreadsheet found for input: {context.get('input', '')}")
+
+        tab, start_col, start_row, end_col = self._parse_range(parts.get('range', '').strip(), row_counts)
+        values_api = self.get_service().spreadsheets().values()
+        title = tab[:-1].strip("'").replace("''", "'") if tab else next(iter(row_counts), None)
+        row_count = row_counts.get(title)
+
+        def fetch(first_row: int, last_row: int) -> List[list]:
+            result = values_api.get(
+                spreadsheetId=spreadsheet_id,
+                range=f"{tab}{start_col}{first_row}:{end_col}{last_row}",
+                valueRenderOption='UNFORMATTED_VALUE',
+                dateTimeRenderOption='FORMATTED_STRING'
+            ).execute()
+            return result.get('values', [])
+
+        header_rows = fetch(start_row, start_row)
+        if not header_rows:
+            return
+        headers = [str(h).strip() for h in header_rows[0]]
+
+        next_row = start_row + 1
+        while row_count is None or next_row <= row_count:
+            rows = fetch(next_row, next_row + chunk_size - 1)
+            if rows:
+                yield headers, rows
+            elif row_count is None:
+                # Without the grid size, an empty chunk is the only reliable end marker
+                return
+            next_row += chunk_size
+
+    def _tab_row_counts(self, spreadsheet_id: str) -> Dict[str, Optional[int]]:
+        """
+        Returns {tab title: grid row count} in tab order (None where the count is unknown).
+        """
+        sheets = self.get_service().spreadsheets().get(
+            spreadsheetId=spreadsheet_id,
+            fields='sheets.properties(title,gridProperties.rowCount)'
+        ).execute().get('sheets', [])
+        return {
+            sheet['properties']['title']: sheet['properties'].get('gridProperties', {}).get('rowCount')
+            for sheet in sheets
+        }
+
+    def read_rows(self, context: Dict[str, Any], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[dict]:
+        """
+        Streams a sheet one typed record at a time while fetching in chunks of `chunk_size` rows.
+        """
+        for chunk in self.iter_row_chunks(context, chunk_size):
+            yield from chunk
+
+    def read_ranges(self, context: Dict[str, Any]) -> Dict[str, List[dict]]:
+        """
+        Reads several ranges or tabs of one spreadsheet in a single values.batchGet request.
+
+        Args:
+            context (Dict[str, Any]): Input string with 'sheet' or 'id', plus ranges either as a
+                "ranges" list in the context or a comma-separated 'ranges' part of the input
+                (e.g. "sheet:customer_info; ranges:Customers!A1:F,Deals!A1:D").
+
+        Returns:
+            Dict[str, List[dict]]: Records for each requested range, using its first row as the header.
+        """
+        parts = dict(x.split(':', 1) for x in context.get("input", "").split('; '))
+        ranges = context.get("ranges") or [r.strip() for r in parts.get('ranges', '').split(',') if r.strip()]
+        if not ranges:
+            raise ValueError("Please provide at least one range.")
+
+        values_api = self.get_service().spreadsheets().values()
+        spreadsheet_id, result = self.call_with_spreadsheet(parts, lambda spreadsheet_id: values_api.batchGet(
+            spreadsheetId=spreadsheet_id,
+            ranges=ranges,
+            valueRenderOption='UNFORMATTED_VALUE',
+            dateTimeRenderOption='FORMATTED_STRING'
+        ).execute())
+        if not spreadsheet_id:
+            raise ValueError(f"No spreadsheet found for input: {context.get('input', '')}")
+
+        # valueRanges come back in request order
+        records = {}
+        for cell_range, value_range in zip(ranges, result.get('valueRanges', [])):
+            values = value_range.get('values', [])
+            if not values:
+                records[cell_range] = []
+                continue
+            headers = [str(h).strip() for h in values[0]]
+            records[cell_range] = self._to_records(headers, values[1:])
+        return records
+
+    def _to_records(self, headers: List[str], rows: List[list]) -> List[dict]:
+        # The API drops trailing empty cells, so short rows are padded to the header width
+        width = len(headers)
+        return [dict(zip(headers, row + [""] * (width - len(row)))) for row in rows if row]
+
+    def _parse_range(self, cell_range: str, tabs: Iterable[str] = ()):
+        """
+        Splits an A1 range into (tab prefix, start column, start row, end column).
+        A range without columns (or a bare tab name) selects whole rows. Text naming one of
+        `tabs` is always a tab, even if it also reads as a column (e.g. a tab called "Raw").
+        """
+        tab = ""
+        if "!" in cell_range:
+            tab, cell_range = cell_range.rsplit("!", 1)
+            tab += "!"
+        elif cell_range.strip("'").replace("''", "'") in tabs:
+            return self._tab_prefix(cell_range), "", 1, ""
+        match = A1_RANGE.match(cell_range)
+        if not match:
+            # Not a cell reference, so treat it as a tab name
+            return self._tab_prefix(cell_range), "", 1, ""
+        start_col = match.group("start_col").upper()
+        end_col = (match.group("end_col") or start_col).upper()
+        start_row = int(match.group("start_row") or 1)
+        return tab, start_col, start_row, end_col
+
     def fetch_and_parse(self, context: Dict[str, Any]) -> dict:
-        sheet_text = self.read_sheet(context)
-        if sheet_text.startswith("❌"):
-            return {"error": sheet_text}
-        rows = self.parse_sheet_text(sheet_text)
+        try:
+            rows = list(self.read_rows(context))
+        except Exception as e:
+            return {"error": f"❌ Failed to read Google Sheet: {str(e)}"}
         return {
             "output": f"Fetched {len(rows)} rows from sheet.",
             "data": rows
@@ -148,4 +572,10 @@ if __name__ == "__main__":
     read_context = {"input": "sheet:customer_info; range:A1:F100"}
     print("🔍 Read Result:", sheets_tool.run(read_context))
 
-    print("🔍 Fetch & Parse Result:", sheets_tool.fetch_and_parse(read_context))
\ No newline at end of file
+    print("🔍 Fetch & Parse Result:", sheets_tool.fetch_and_parse(read_context))
+
+    for chunk in sheets_tool.iter_row_chunks(read_context, chunk_size=50):
+        print(f"🔍 Streamed chunk of {len(chunk)} rows, first: {chunk[0]}")
+
+    batch_context = {"input": "sheet:customer_info; ranges:A1:F,Sheet2!A1:D"}
+    print("🔍 Batch Read Result:", sheets_tool.read_ranges(batch_context))
\ No newline at end of file
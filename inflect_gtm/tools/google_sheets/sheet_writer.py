@@ -0,0 +1,55 @@
+from typing import Dict, Any, List
+from inflect_gtm.tools.google_sheets.google_sheets_tool import GoogleSheetsTool
+
+
+class SheetWriteBuffer:
+    """
+    Coalesces many small record writes into a few buffered GoogleSheetsTool.write_records calls.
+    Use as a context manager so the remaining records are flushed on exit.
+    """
+
+    def __init__(self, tool: GoogleSheetsTool, context: Dict[str, Any], flush_size: int = 1000):
+        """
+        Args:
+            tool (GoogleSheetsTool): Tool used to perform the writes.
+            context (Dict[str, Any]): Write target, as accepted by GoogleSheetsTool.write_records.
+            flush_size (int): Number of buffered records that triggers a flush.
+        """
+        self.tool = tool
+        self.context = context
+        self.flush_size = flush_size
+        self.buffer: List[dict] = []
+        self.results: List[str] = []
+
+    def add(self, record: dict):
+        self.buffer.append(record)
+        if len(self.buffer) >= self.flush_size:
+            self.flush()
+
+    def extend(self, records: List[dict]):
+        for record in records:
+            self.add(record)
+
+    def flush(self) -> str:
+        if not self.buffer:
+            return ""
+        records, self.buffer = self.buffer, []
+        result = self.tool.write_records(self.context, records)
+        self.results.append(result)
+        return result
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+
+
+if __name__ == "__main__":
+    print("📊 Testing buffered sheet writes...")
+    sheets_tool = GoogleSheetsTool()
+    with SheetWriteBuffer(sheets_tool, {"input": "sheet:customer_info; tab:Segments; mode:upsert; key:Email"}, flush_size=2) as writer:
+        writer.add({"Email": "sarah@example.com", "Segment": "Enterprise"})
+        writer.add({"Email": "james@example.com", "Segment": "SMB"})
+        writer.add({"Email": "mina@example.com", "Segment": "Enterprise"})
+    print("🔍 Write Results:", writer.results)
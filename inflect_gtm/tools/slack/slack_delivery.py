@@ -0,0 +1,200 @@
+import time
+import asyncio
+import threading
+import requests
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, List, Optional
+from requests.adapters import HTTPAdapter
+from inflect_gtm.components.utils.rate_limit import TokenBucket, backoff_delay
+
+
+SLACK_API_URL = "https://slack.com/api/"
+
+# Requests per second for Slack's Web API rate-limit tiers (https://api.slack.com/docs/rate-limits)
+RATE_LIMIT_TIERS = {
+    1: 1 / 60,
+    2: 20 / 60,
+    3: 50 / 60,
+    4: 100 / 60,
+}
+
+# Tiers of the other Web API methods the tools call
+METHOD_TIERS = {
+    "conversations.list": 2,
+    "conversations.info": 3,
+    "users.lookupByEmail": 3,
+    "chat.update": 3,
+}
+
+# chat.postMessage is a "special" tier: roughly one message per second per channel
+POST_MESSAGE_RATE = 1.0
+
+# Failed sends kept for flush(); older ones are only logged, since queued sends are fire-and-forget
+MAX_KEPT_FAILURES = 100
+
+
+class SlackAPIError(Exception):
+    pass
+
+
+class SlackDeliveryEngine:
+    """
+    Delivers Slack messages over a pooled HTTP session.
+    Sends can be made synchronously with `post`, or queued with `enqueue`, which paces each
+    channel independently, keeps per-channel order and honors Retry-After on 429 responses.
+    """
+
+    def __init__(self, token: str, pool_size: int = 10, max_retries: int = 5, channel_rate: float = POST_MESSAGE_RATE):
+        """
+        Args:
+            token (str): Slack bot token.
+            pool_size (int): Maximum pooled connections and concurrent in-flight sends.
+            max_retries (int): Retries for rate-limited or failed requests.
+            channel_rate (float): Messages per second allowed per channel.
+        """
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json; charset=utf-8"
+        })
+        self.max_retries = max_retries
+        self.channel_rate = channel_rate
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.buckets_lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="slack-send")
+        self.loop = None
+        self.loop_thread = None
+        self.channel_locks: Dict[str, asyncio.Lock] = {}
+        self.pending: set = set()
+        # Most recent sends that failed since the last flush, kept after they leave `pending` so flush can report them
+        self.failed: deque = deque(maxlen=MAX_KEPT_FAILURES)
+        self.pending_lock = threading.Lock()
+
+    def _bucket(self, channel: str) -> TokenBucket:
+        with self.buckets_lock:
+            if channel not in self.buckets:
+                self.buckets[channel] = TokenBucket(rate=self.channel_rate, capacity=1)
+            return self.buckets[channel]
+
+    def _method_bucket(self, method: str) -> Optional[TokenBucket]:
+        tier = METHOD_TIERS.get(method)
+        if tier is None:
+            return None
+        with self.buckets_lock:
+            key = f"method:{method}"
+            if key not in self.buckets:
+                rate = RATE_LIMIT_TIERS[tier]
+                self.buckets[key] = TokenBucket(rate=rate, capacity=max(1.0, rate * 60))
+            return self.buckets[key]
+
+    def call(self, method: str, payload: Dict[str, Any], bucket: Optional[TokenBucket] = None) -> Dict[str, Any]:
+        """
+        Calls a Slack Web API method, sleeping through Retry-After on 429 and backing off on 5xx.
+        Methods without an explicit bucket are paced by their rate-limit tier.
+        """
+        bucket = bucket or self._method_bucket(method)
+        attempt = 0
+        while True:
+            if bucket:
+                bucket.acquire()
+            response = self.session.post(SLACK_API_URL + method, json=payload, timeout=30)
+
+            if response.status_code == 429 or response.status_code >= 500:
+                if attempt >= self.max_retries:
+                    response.raise_for_status()
+                if response.status_code == 429:
+                    delay = float(response.headers.get("Retry-After", 1))
+                    if bucket:
+                        bucket.penalize(delay)
+                    else:
+                        time.sleep(delay)
+                else:
+                    time.sleep(backoff_delay(attempt))
+                attempt += 1
+                continue
+
+            response.raise_for_status()
+            data = response.json()
+            if not data.get("ok"):
+                raise SlackAPIError(data.get("error", "unknown_error"))
+            return data
+
+    def post(self, channel: str, text: str, **fields) -> Dict[str, Any]:
+        """
+        Posts a message synchronously, paced by the channel's rate limit.
+        """
+        payload = {"channel": channel, "text": text, **fields}
+        return self.call("chat.postMessage", payload, bucket=self._bucket(channel))
+
+    def _ensure_loop(self):
+        with self.buckets_lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                self.loop_thread = threading.Thread(target=self.loop.run_forever, name="slack-delivery", daemon=True)
+                self.loop_thread.start()
+
+    async def _deliver(self, channel: str, text: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        lock = self.channel_locks.setdefault(channel, asyncio.Lock())
+        # The lock keeps messages to one channel in order while other channels proceed in parallel
+        async with lock:
+            return await self.loop.run_in_executor(self.executor, lambda: self.post(channel, text, **fields))
+
+    def enqueue(self, channel: str, text: str, **fields) -> Future:
+        """
+        Queues a message without blocking and returns a Future resolving to the Slack response.
+        """
+        self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(self._deliver(channel, text, fields), self.loop)
+        with self.pending_lock:
+            self.pending.add(future)
+        future.add_done_callback(self._settle)
+        return future
+
+    def _settle(self, future: Future):
+        failed = future.cancelled() or future.exception() is not None
+        with self.pending_lock:
+            self.pending.discard(future)
+            if failed:
+                self.failed.append(future)
+        if failed:
+            print("❌ Queued Slack message failed:", "cancelled" if future.cancelled() else str(future.exception()))
+
+    def fan_out(self, channels: List[str], text: str, **fields) -> List[Future]:
+        """
+        Queues the same message to several channels.
+        """
+        return [self.enqueue(channel, text, **fields) for channel in channels]
+
+    def flush(self, timeout: Optional[float] = None) -> List[Future]:
+        """
+        Waits for every queued message to finish and returns the futures that failed since the
+        last flush (the most recent MAX_KEPT_FAILURES), plus any still unfinished when the
+        timeout ran out.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.pending_lock:
+            pending = list(self.pending)
+        unfinished = []
+        for future in pending:
+            remaining = None if deadline is None else max(0, deadline - time.monotonic())
+            try:
+                future.result(timeout=remaining)
+            except FutureTimeoutError:
+                unfinished.append(future)
+            except Exception:
+                pass
+        with self.pending_lock:
+            failed = list(self.failed)
+            self.failed.clear()
+        return failed + unfinished
+
+    def close(self):
+        self.flush()
+        if self.loop:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.loop_thread.join()
+        self.executor.shutdown(wait=True)
+        self.session.close()
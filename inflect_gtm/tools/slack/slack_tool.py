@@ -1,53 +1,79 @@
 import os
-import requests
-from typing import Dict, Any
-from dotenv import load_dotenv
+import threading
+from typing import Dict, Any, List
+from inflect_gtm.components.utils.env import load_env
 from inflect_gtm.components import Tool
+from inflect_gtm.tools.slack.slack_delivery import SlackDeliveryEngine
 
 # Load environment variables from .env
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
-load_dotenv(dotenv_path=os.path.join(project_root, ".env"))
+load_env()
 
 SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")
 SLACK_CHANNEL_ID = os.getenv("SLACK_CHANNEL_ID")
-SLACK_URL = "https://slack.com/api/chat.postMessage"
+
+# One pooled delivery engine is shared by every SlackTool in the process
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> SlackDeliveryEngine:
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = SlackDeliveryEngine(SLACK_BOT_TOKEN)
+    return _engine
 
 
 class SlackTool(Tool):
     def __init__(self):
         super().__init__(name="Slack", function=self.send_message)
 
+    def _channels(self, context: Dict[str, Any]) -> List[str]:
+        # "channel" may hold one id or a comma-separated list for fan-out
+        channels = context.get("channels") or context.get("channel") or SLACK_CHANNEL_ID or ""
+        if isinstance(channels, str):
+            channels = [c.strip() for c in channels.split(",") if c.strip()]
+        return channels
+
     def send_message(self, context: Dict[str, Any]) -> str:
         message = context.get("input", "")
         try:
-            if not SLACK_BOT_TOKEN or not SLACK_CHANNEL_ID:
+            channels = self._channels(context)
+            if not SLACK_BOT_TOKEN or not channels:
                 return "❌ SLACK_BOT_TOKEN and SLACK_CHANNEL_ID must be set in the .env file."
 
-            payload = {
-                "channel": SLACK_CHANNEL_ID,
-                "text": message
-            }
-            headers = {
-                "Authorization": f"Bearer {SLACK_BOT_TOKEN}",
-                "Content-Type": "application/json"
-            }
+            engine = get_engine()
+            if len(channels) == 1:
+                engine.post(channels[0], message)
+            else:
+                failed = [f for f in engine.fan_out(channels, message) if f.exception()]
+                if failed:
+                    return f"❌ Slack API error: {failed[0].exception()}"
 
-            response = requests.post(SLACK_URL, json=payload, headers=headers)
-            response.raise_for_status()
-            data = response.json()
-
-            if not data.get("ok"):
-                return f"❌ Slack API error: {data.get('error')}"
-
-            return f"💬 Message posted to Slack channel {SLACK_CHANNEL_ID}"
+            return f"💬 Message posted to Slack channel {', '.join(channels)}"
 
         except Exception as e:
             return f"❌ Failed to post to Slack: {str(e)}"
 
+    def notify(self, context: Dict[str, Any]) -> str:
+        """
+        Queues a message for background delivery so callers (e.g. pipeline progress updates) never block.
+        """
+        channels = self._channels(context)
+        if not SLACK_BOT_TOKEN or not channels:
+            return "❌ SLACK_BOT_TOKEN and SLACK_CHANNEL_ID must be set in the .env file."
+        get_engine().fan_out(channels, context.get("input", ""))
+        return f"💬 Message queued for Slack channel {', '.join(channels)}"
+
 
 if __name__ == "__main__":
     print("🚀 Testing Slack tool...")
     slack_tool = SlackTool()
     test_context = {"input": "Hello from the Slack tool!"}
     result = slack_tool.run(test_context)
-    print("🔍 Result:", result)
\ No newline at end of file
+    print("🔍 Result:", result)
+
+    for i in range(5):
+        slack_tool.notify({"input": f"Queued progress update {i}"})
+    print("🔍 Failed queued sends:", get_engine().flush(timeout=30))
@@ -0,0 +1,723 @@
+import re
+import json
+import time
+import base64
+import random
+import datetime
+import itertools
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+
+# Largest page the real list methods return, whatever maxResults asks for
+MAX_PAGE_SIZE = {
+    "gmail.users.messages.list": 500,
+    "gmail.users.history.list": 500,
+    "calendar.events.list": 2500,
+    "drive.files.list": 1000,
+}
+
+# Method ID (as googleapiclient reports it) -> FakeGoogle handler
+HANDLERS = {
+    "gmail.users.getProfile": "gmail_get_profile",
+    "gmail.users.history.list": "gmail_history_list",
+    "gmail.users.messages.list": "gmail_messages_list",
+    "gmail.users.messages.get": "gmail_messages_get",
+    "gmail.users.messages.send": "gmail_messages_send",
+    "calendar.events.list": "calendar_events_list",
+    "drive.files.list": "drive_files_list",
+    "sheets.spreadsheets.create": "sheets_create",
+    "sheets.spreadsheets.get": "sheets_get",
+    "sheets.spreadsheets.batchUpdate": "sheets_batch_update",
+    "sheets.spreadsheets.values.get": "values_get",
+    "sheets.spreadsheets.values.batchGet": "values_batch_get",
+    "sheets.spreadsheets.values.update": "values_update",
+    "sheets.spreadsheets.values.append": "values_append",
+    "sheets.spreadsheets.values.batchUpdate": "values_batch_update",
+    "docs.documents.create": "docs_create",
+    "docs.documents.get": "docs_get",
+    "docs.documents.batchUpdate": "docs_batch_update",
+}
+
+A1_RANGE = re.compile(r"^(?P<start_col>[A-Za-z]*)(?P<start_row>\d*)(?::(?P<end_col>[A-Za-z]*)(?P<end_row>\d*))?$")
+DRIVE_NAME = re.compile(r"name='((?:[^'\\]|\\.)*)'")
+DRIVE_MODIFIED = re.compile(r"modifiedTime > '([^']*)'")
+
+# Gmail search terms: operator:value, operator:"quoted value", or a bare word
+GMAIL_TERM = re.compile(r'(?:(?P<op>\w+):)?(?:"(?P<quoted>[^"]*)"|(?P<word>\S+))')
+
+# A new sheet's grid, which the API reports as rowCount even when fewer rows hold data
+DEFAULT_GRID_ROWS = 1000
+
+NAMES = ["Sarah Kim", "James Lee", "Priya Patel", "Daniel Park", "Maria Garcia", "Tom Becker", "Aiko Tanaka", "Omar Haddad"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Logistics", "Wayne Retail", "Soylent Foods"]
+TOPICS = ["Slack integration", "pricing tiers", "SSO setup", "onboarding timeline", "data migration", "usage analytics"]
+PLANS = ["Starter", "Growth", "Enterprise"]
+
+# IDs are unique across fakes in a process, so ID-keyed caches in the tools never mix backends
+_ids = itertools.count(1)
+
+
+class FakeResponse(dict):
+    """
+    Stands in for the httplib2 response on HttpError.resp: the status is on `.status`.
+    """
+
+    def __init__(self, status: int, reason: str):
+        super().__init__(status=str(status))
+        self.status = status
+        self.reason = reason
+
+
+class FakeHttpError(Exception):
+    """
+    Mirrors googleapiclient.errors.HttpError closely enough for google_retry.get_status.
+    """
+
+    def __init__(self, status: int, reason: str):
+        self.resp = FakeResponse(status, reason)
+        self.content = json.dumps({"error": {"code": status, "message": reason}}).encode()
+        super().__init__(f'<HttpError {status} "{reason}">')
+
+
+class FakeRequest:
+    """
+    Unexecuted request, like googleapiclient's HttpRequest.
+    """
+
+    def __init__(self, backend: "FakeGoogle", method_id: str, params: Dict[str, Any]):
+        self.backend = backend
+        self.methodId = method_id
+        self.params = params
+
+    def execute(self) -> Dict[str, Any]:
+        return self.backend.execute(self.methodId, self.params)
+
+
+class FakeBatch:
+    """
+    Batch request, like the one service.new_batch_http_request() returns: one round trip
+    (latency is paid once), with each part's response or error passed to its callback.
+    """
+
+    def __init__(self, backend: "FakeGoogle", callback=None):
+        self.backend = backend
+        self.callback = callback
+        self.parts: List[Tuple[str, FakeRequest, Any]] = []
+
+    def add(self, request: FakeRequest, callback=None, request_id: Optional[str] = None):
+        self.parts.append((request_id or str(len(self.parts) + 1), request, callback or self.callback))
+
+    def execute(self):
+        self.backend.wait()
+        for request_id, request, callback in self.parts:
+            response, exception = None, None
+            try:
+                response = self.backend.call(request.methodId, request.params)
+            except FakeHttpError as e:
+                exception = e
+            if callback:
+                callback(request_id, response, exception)
+
+
+class FakeResource:
+    """
+    Resource chain such as service.spreadsheets().values(): attribute calls descend into
+    sub-resources until they reach a known method, which returns a FakeRequest.
+    """
+
+    def __init__(self, backend: "FakeGoogle", path: str):
+        self._backend = backend
+        self._path = path
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if name == "new_batch_http_request":
+            return lambda callback=None: FakeBatch(self._backend, callback)
+        method_id = f"{self._path}.{name}"
+
+        def call(**params):
+            if method_id in HANDLERS:
+                return FakeRequest(self._backend, method_id, params)
+            return FakeResource(self._backend, method_id)
+        return call
+
+
+class FakeGoogle:
+    """
+    In-memory Gmail, Calendar, Drive, Sheets and Docs backend for running the Google tools
+    without OAuth or network access.
+    `build` has the signature of googleapiclient.discovery.build, so it can be passed to a tool
+    as `build_service`. Every request pays the configured latency, may fail with an injected
+    quota error, and is counted (calls, request and response bytes) per method in `stats`.
+    Responses are JSON round-tripped, so callers get fresh objects, as from the real client.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 429,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            latency (float): Seconds added to every request.
+            jitter (float): Extra random seconds (0 to jitter) added to every request.
+            error_rate (float): Share of requests that fail with `error_status`.
+            error_status (int): HTTP status of injected errors (429 quota, 503 backend, ...).
+            seed (int): Seed for generated data, jitter and error injection.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.lock = threading.RLock()
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+        self.message_ids: List[str] = []
+        self.messages: Dict[str, Dict[str, Any]] = {}
+        # Mailbox changes as Gmail history records, oldest first
+        self.history: List[Dict[str, Any]] = []
+        self.history_id = 1000
+        self.sent: List[Dict[str, Any]] = []
+        self.events: List[Dict[str, Any]] = []
+        self.spreadsheets: Dict[str, Dict[str, Any]] = {}
+        self.documents: Dict[str, Dict[str, Any]] = {}
+
+    def build(self, api: str, version: str, credentials=None) -> FakeResource:
+        return FakeResource(self, api)
+
+    # Request handling
+
+    def execute(self, method_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        self.wait()
+        return self.call(method_id, params)
+
+    def wait(self):
+        """
+        Sleeps for one round trip of latency and jitter.
+        """
+        with self.lock:
+            delay = self.latency + (self.random.random() * self.jitter if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+
+    def call(self, method_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Handles one request without latency, injecting errors and recording stats.
+        """
+        with self.lock:
+            fail = self.error_rate and self.random.random() < self.error_rate
+
+        request_bytes = len(json.dumps(params, default=str))
+        if fail:
+            self._record(method_id, request_bytes, 0, error=True)
+            reason = "rateLimitExceeded" if self.error_status == 429 else "backendError"
+            raise FakeHttpError(self.error_status, reason)
+
+        try:
+            with self.lock:
+                response = getattr(self, HANDLERS[method_id])(**params)
+                payload = json.dumps(response)
+        except FakeHttpError:
+            self._record(method_id, request_bytes, 0, error=True)
+            raise
+        self._record(method_id, request_bytes, len(payload))
+        return json.loads(payload)
+
+    def _record(self, method_id: str, request_bytes: int, response_bytes: int, error: bool = False):
+        with self.lock:
+            entry = self.stats.setdefault(
+                method_id, {"calls": 0, "errors": 0, "request_bytes": 0, "response_bytes": 0}
+            )
+            entry["calls"] += 1
+            entry["errors"] += int(error)
+            entry["request_bytes"] += request_bytes
+            entry["response_bytes"] += response_bytes
+
+    def totals(self) -> Dict[str, int]:
+        with self.lock:
+            keys = ("calls", "errors", "request_bytes", "response_bytes")
+            return {key: sum(entry[key] for entry in self.stats.values()) for key in keys}
+
+    def reset_stats(self):
+        with self.lock:
+            self.stats = {}
+
+    def _new_id(self, prefix: str) -> str:
+        return f"{prefix}{next(_ids):010x}"
+
+    # Seed data
+
+    def add_messages(self, count: int) -> List[str]:
+        """
+        Adds `count` realistic inbox messages (multipart, base64url bodies), newest first.
+        """
+        now = int(time.time() * 1000)
+        added = []
+        with self.lock:
+            for i in range(count):
+                name, company, topic = self.random.choice(NAMES), self.random.choice(COMPANIES), self.random.choice(TOPICS)
+                body = (
+                    f"Hi team,\n\nThanks for the time today. {company} wants to move forward with the {topic} "
+                    f"and would like a follow-up next week.\n\nBest,\n{name}\n"
+                )
+                message_id = self._new_id("msg")
+                self.messages[message_id] = {
+                    "id": message_id,
+                    "threadId": message_id.replace("msg", "thr"),
+                    "labelIds": ["INBOX", "UNREAD"],
+                    "snippet": body[:100].replace("\n", " "),
+                    "internalDate": str(now - i * 60000),
+                    "sizeEstimate": len(body) * 2,
+                    "payload": {
+                        "mimeType": "multipart/alternative",
+                        "headers": [
+                            {"name": "From", "value": f"{name} <{name.split()[0].lower()}@{company.split()[0].lower()}.com>"},
+                            {"name": "To", "value": "me@example.com"},
+                            {"name": "Subject", "value": f"Re: {topic} with {company}"},
+                        ],
+                        "parts": [
+                            {"mimeType": "text/plain", "body": {"size": len(body), "data": _b64(body)}},
+                            {"mimeType": "text/html", "body": {"size": len(body) + 40, "data": _b64(f"<div>{body}</div>")}},
+                        ],
+                    },
+                }
+                added.append(message_id)
+                self._record_history("messagesAdded", self.messages[message_id])
+            self.message_ids[:0] = added
+        return added
+
+    def delete_messages(self, message_ids: List[str]):
+        """
+        Permanently deletes messages, recording messageDeleted history like Gmail does.
+        """
+        with self.lock:
+            for message_id in message_ids:
+                message = self.messages.pop(message_id, None)
+                if message is not None:
+                    self.message_ids.remove(message_id)
+                    self._record_history("messagesDeleted", message)
+
+    def _record_history(self, kind: str, message: Dict[str, Any]):
+        self.history_id += 1
+        summary = {key: message[key] for key in ("id", "threadId", "labelIds")}
+        self.history.append({"id": str(self.history_id), "messages": [summary], kind: [{"message": summary}]})
+
+    def add_events(self, count: int, start: Optional[datetime.datetime] = None):
+        """
+        Adds `count` upcoming meetings, one per hour from `start` (default: now).
+        """
+        start = start or datetime.datetime.utcnow().replace(minute=0, second=0, microsecond=0) + datetime.timedelta(hours=1)
+        with self.lock:
+            for i in range(count):
+                company, topic = self.random.choice(COMPANIES), self.random.choice(TOPICS)
+                begin = start + datetime.timedelta(hours=i)
+                attendees = self.random.sample(NAMES, 3)
+                event_id = self._new_id("evt")
+                self.events.append({
+                    "kind": "calendar#event",
+                    "id": event_id,
+                    "status": "confirmed",
+                    "htmlLink": f"https://www.google.com/calendar/event?eid={event_id}",
+                    "summary": f"{topic} — {company}",
+                    "description": f"Discuss {topic} with the {company} team.",
+                    "start": {"dateTime": begin.isoformat() + "Z"},
+                    "end": {"dateTime": (begin + datetime.timedelta(minutes=30)).isoformat() + "Z"},
+                    "organizer": {"email": "me@example.com", "self": True},
+                    "attendees": [
+                        {"email": f"{name.split()[0].lower()}@{company.split()[0].lower()}.com", "displayName": name, "responseStatus": "accepted"}
+                        for name in attendees
+                    ],
+                })
+            self.events.sort(key=lambda event: event["start"]["dateTime"])
+
+    def add_spreadsheet(self, title: str, rows: int = 0, tab: str = "Sheet1", values: Optional[List[list]] = None) -> str:
+        """
+        Adds a spreadsheet with a customer table of `rows` rows (plus header), or the given values.
+        """
+        if values is None:
+            values = [["customer_id", "name", "company", "email", "plan", "seats", "mrr", "signup_date"]]
+            for i in range(rows):
+                name, company = self.random.choice(NAMES), self.random.choice(COMPANIES)
+                seats = self.random.randint(1, 500)
+                values.append([
+                    f"C{i + 1:06d}", name, company, f"{name.split()[0].lower()}{i}@{company.split()[0].lower()}.com",
+                    self.random.choice(PLANS), seats, seats * 12, f"2025-{self.random.randint(1, 12):02d}-{self.random.randint(1, 28):02d}",
+                ])
+        with self.lock:
+            spreadsheet_id = self._new_id("sheet")
+            self.spreadsheets[spreadsheet_id] = {"title": title, "modifiedTime": _now(), "tabs": {tab: values}}
+        return spreadsheet_id
+
+    def add_document(self, title: str, paragraphs: int = 0, text: Optional[str] = None) -> str:
+        """
+        Adds a document of `paragraphs` meeting-note paragraphs, or the given text.
+        """
+        if text is None:
+            text = "".join(
+                f"{self.random.choice(NAMES)} raised {self.random.choice(TOPICS)} for {self.random.choice(COMPANIES)}; "
+                f"next step is a follow-up call.\n"
+                for _ in range(paragraphs)
+            )
+        with self.lock:
+            document_id = self._new_id("doc")
+            self.documents[document_id] = {"title": title, "text": text, "revision": 1}
+        return document_id
+
+    # Gmail
+
+    def gmail_get_profile(self, userId: str = "me", **_):
+        return {
+            "emailAddress": "me@example.com",
+            "messagesTotal": len(self.message_ids),
+            "threadsTotal": len(self.message_ids),
+            "historyId": str(self.history_id),
+        }
+
+    def gmail_history_list(self, userId: str = "me", startHistoryId: str = "0", historyTypes: Optional[List[str]] = None,
+                           maxResults: int = 100, pageToken: Optional[str] = None, **_):
+        # A start older than the oldest kept record has expired, as after Gmail trims history
+        if self.history and int(startHistoryId) < int(self.history[0]["id"]) - 1:
+            raise FakeHttpError(404, "Requested entity was not found.")
+        records = [record for record in self.history if int(record["id"]) > int(startHistoryId)]
+        if historyTypes:
+            # historyTypes are singular ("messageAdded"), record fields plural ("messagesAdded")
+            fields = [kind.replace("message", "messages", 1) for kind in historyTypes]
+            records = [record for record in records if any(field in record for field in fields)]
+        start = int(pageToken or 0)
+        end = start + min(int(maxResults), MAX_PAGE_SIZE["gmail.users.history.list"])
+        response = {"historyId": str(self.history_id)}
+        if records[start:end]:
+            response["history"] = records[start:end]
+        if end < len(records):
+            response["nextPageToken"] = str(end)
+        return response
+
+    def gmail_messages_list(self, userId: str = "me", maxResults: int = 100, q: str = "", pageToken: Optional[str] = None, **_):
+        message_ids = [m for m in self.message_ids if _matches_query(self.messages[m], q)] if q else self.message_ids
+        start = int(pageToken or 0)
+        end = start + min(int(maxResults), MAX_PAGE_SIZE["gmail.users.messages.list"])
+        page = message_ids[start:end]
+        response = {"resultSizeEstimate": len(message_ids)}
+        if page:
+            response["messages"] = [{"id": m, "threadId": self.messages[m]["threadId"]} for m in page]
+        if end < len(message_ids):
+            response["nextPageToken"] = str(end)
+        return response
+
+    def gmail_messages_get(self, userId: str = "me", id: str = "", format: str = "full", **_):
+        if id not in self.messages:
+            raise FakeHttpError(404, "Requested entity was not found.")
+        message = self.messages[id]
+        if format == "minimal":
+            return {key: message[key] for key in ("id", "threadId", "labelIds", "snippet", "internalDate", "sizeEstimate")}
+        return message
+
+    def gmail_messages_send(self, userId: str = "me", body: Optional[Dict[str, Any]] = None, **_):
+        message_id = self._new_id("msg")
+        self.sent.append(body or {})
+        return {"id": message_id, "threadId": message_id.replace("msg", "thr"), "labelIds": ["SENT"]}
+
+    # Calendar
+
+    def calendar_events_list(self, calendarId: str = "primary", timeMin: Optional[str] = None, maxResults: int = 250, pageToken: Optional[str] = None, **_):
+        items = [event for event in self.events if not timeMin or event["end"]["dateTime"] >= timeMin]
+        start = int(pageToken or 0)
+        end = start + min(int(maxResults), MAX_PAGE_SIZE["calendar.events.list"])
+        response = {"kind": "calendar#events", "summary": "me@example.com", "timeZone": "UTC", "items": items[start:end]}
+        if end < len(items):
+            response["nextPageToken"] = str(end)
+        return response
+
+    # Drive
+
+    def drive_files_list(self, q: str = "", pageSize: int = 100, **_):
+        name = DRIVE_NAME.search(q)
+        modified = DRIVE_MODIFIED.search(q)
+        files = [
+            {"id": spreadsheet_id, "name": sheet["title"], "modifiedTime": sheet["modifiedTime"]}
+            for spreadsheet_id, sheet in self.spreadsheets.items()
+            if (not name or sheet["title"] == re.sub(r"\\(.)", r"\1", name.group(1)))
+            and (not modified or sheet["modifiedTime"] > modified.group(1))
+        ]
+        files.sort(key=lambda f: f["modifiedTime"], reverse=True)
+        return {"files": files[:min(int(pageSize), MAX_PAGE_SIZE["drive.files.list"])]}
+
+    # Sheets
+
+    def _spreadsheet(self, spreadsheet_id: str) -> Dict[str, Any]:
+        if spreadsheet_id not in self.spreadsheets:
+            raise FakeHttpError(404, "Requested entity was not found.")
+        return self.spreadsheets[spreadsheet_id]
+
+    def _resolve(self, spreadsheet_id: str, cell_range: str) -> Tuple[str, List[list], int, Optional[int], int, Optional[int]]:
+        """
+        Returns (tab, rows, first row, last row, first column, last column), 0-based with
+        inclusive ends; None means to the end of the data.
+        """
+        sheet = self._spreadsheet(spreadsheet_id)
+        tab = None
+        if "!" in cell_range:
+            tab, cell_range = cell_range.rsplit("!", 1)
+        elif cell_range.strip("'").replace("''", "'") in sheet["tabs"]:
+            tab, cell_range = cell_range, ""
+        tab = tab.strip("'").replace("''", "'") if tab else next(iter(sheet["tabs"]))
+        if tab not in sheet["tabs"]:
+            raise FakeHttpError(400, f"Unable to parse range: {tab}")
+        rows = sheet["tabs"][tab]
+
+        match = A1_RANGE.match(cell_range)
+        if not match:
+            raise FakeHttpError(400, f"Unable to parse range: {cell_range}")
+        start_col = _column_index(match.group("start_col")) if match.group("start_col") else 0
+        end_col = _column_index(match.group("end_col") or match.group("start_col")) if (match.group("end_col") or match.group("start_col")) else None
+        start_row = int(match.group("start_row")) - 1 if match.group("start_row") else 0
+        if ":" in cell_range:
+            end_row = int(match.group("end_row")) - 1 if match.group("end_row") else None
+        else:
+            end_row = start_row if match.group("start_row") else None
+        return tab, rows, start_row, end_row, start_col, end_col
+
+    def _read(self, spreadsheet_id: str, cell_range: str, render: str) -> Dict[str, Any]:
+        tab, rows, start_row, end_row, start_col, end_col = self._resolve(spreadsheet_id, cell_range)
+        stop = len(rows) if end_row is None else min(len(rows), end_row + 1)
+        values = []
+        for row in rows[start_row:stop]:
+            cells = row[start_col:None if end_col is None else end_col + 1]
+            if render != "UNFORMATTED_VALUE":
+                cells = ["" if cell is None else str(cell) for cell in cells]
+            # The API drops trailing empty cells and rows
+            while cells and cells[-1] in ("", None):
+                cells = cells[:-1]
+            values.append(cells)
+        while values and not values[-1]:
+            values.pop()
+        response = {"range": f"'{tab}'!{cell_range or 'A1'}", "majorDimension": "ROWS"}
+        if values:
+            response["values"] = values
+        return response
+
+    def _write(self, spreadsheet_id: str, cell_range: str, values: List[list]) -> Dict[str, Any]:
+        tab, rows, start_row, _, start_col, _ = self._resolve(spreadsheet_id, cell_range)
+        for offset, new_row in enumerate(values):
+            index = start_row + offset
+            while len(rows) <= index:
+                rows.append([])
+            row = rows[index]
+            if len(row) < start_col + len(new_row):
+                row.extend([""] * (start_col + len(new_row) - len(row)))
+            for col, cell in enumerate(new_row):
+                # RAW writes skip None, leaving the existing cell untouched
+                if cell is not None:
+                    row[start_col + col] = cell
+        self.spreadsheets[spreadsheet_id]["modifiedTime"] = _now()
+        return {
+            "updatedRange": f"'{tab}'!{cell_range}",
+            "updatedRows": len(values),
+            "updatedColumns": max((len(row) for row in values), default=0),
+            "updatedCells": sum(len(row) for row in values),
+        }
+
+    def sheets_create(self, body: Optional[Dict[str, Any]] = None, **_):
+        body = body or {}
+        tabs = [s["properties"]["title"] for s in body.get("sheets", [])] or ["Sheet1"]
+        spreadsheet_id = self._new_id("sheet")
+        self.spreadsheets[spreadsheet_id] = {
+            "title": body.get("properties", {}).get("title", "Untitled spreadsheet"),
+            "modifiedTime": _now(),
+            "tabs": {tab: [] for tab in tabs},
+        }
+        return {"spreadsheetId": spreadsheet_id}
+
+    def sheets_get(self, spreadsheetId: str, **_):
+        sheet = self._spreadsheet(spreadsheetId)
+        return {
+            "spreadsheetId": spreadsheetId,
+            "properties": {"title": sheet["title"]},
+            "sheets": [
+                {"properties": {
+                    "sheetId": i, "title": tab, "index": i,
+                    "gridProperties": {"rowCount": max(DEFAULT_GRID_ROWS, len(rows)), "columnCount": max([26] + [len(row) for row in rows])},
+                }}
+                for i, (tab, rows) in enumerate(sheet["tabs"].items())
+            ],
+        }
+
+    def sheets_batch_update(self, spreadsheetId: str, body: Optional[Dict[str, Any]] = None, **_):
+        sheet = self._spreadsheet(spreadsheetId)
+        replies = []
+        for request in (body or {}).get("requests", []):
+            if "addSheet" in request:
+                title = request["addSheet"]["properties"]["title"]
+                if title in sheet["tabs"]:
+                    raise FakeHttpError(400, f'A sheet with the name "{title}" already exists.')
+                sheet["tabs"][title] = []
+                replies.append({"addSheet": {"properties": {"sheetId": len(sheet["tabs"]) - 1, "title": title}}})
+            else:
+                replies.append({})
+        return {"spreadsheetId": spreadsheetId, "replies": replies}
+
+    def values_get(self, spreadsheetId: str, range: str, valueRenderOption: str = "FORMATTED_VALUE", **_):
+        return self._read(spreadsheetId, range, valueRenderOption)
+
+    def values_batch_get(self, spreadsheetId: str, ranges: List[str], valueRenderOption: str = "FORMATTED_VALUE", **_):
+        return {
+            "spreadsheetId": spreadsheetId,
+            "valueRanges": [self._read(spreadsheetId, cell_range, valueRenderOption) for cell_range in ranges],
+        }
+
+    def values_update(self, spreadsheetId: str, range: str, body: Optional[Dict[str, Any]] = None, **_):
+        return {"spreadsheetId": spreadsheetId, **self._write(spreadsheetId, range, (body or {}).get("values", []))}
+
+    def values_append(self, spreadsheetId: str, range: str, body: Optional[Dict[str, Any]] = None, **_):
+        tab, rows, _, _, _, _ = self._resolve(spreadsheetId, range)
+        last_row = len(rows)
+        while last_row and not any(cell not in ("", None) for cell in rows[last_row - 1]):
+            last_row -= 1
+        updates = self._write(spreadsheetId, f"'{tab}'!A{last_row + 1}", (body or {}).get("values", []))
+        return {"spreadsheetId": spreadsheetId, "tableRange": f"'{tab}'!A1", "updates": updates}
+
+    def values_batch_update(self, spreadsheetId: str, body: Optional[Dict[str, Any]] = None, **_):
+        results = [self._write(spreadsheetId, data["range"], data.get("values", [])) for data in (body or {}).get("data", [])]
+        return {
+            "spreadsheetId": spreadsheetId,
+            "totalUpdatedRows": sum(r["updatedRows"] for r in results),
+            "totalUpdatedCells": sum(r["updatedCells"] for r in results),
+            "responses": results,
+        }
+
+    # Docs
+
+    def _document(self, document_id: str) -> Dict[str, Any]:
+        if document_id not in self.documents:
+            raise FakeHttpError(404, "Requested entity was not found.")
+        return self.documents[document_id]
+
+    def _document_resource(self, document_id: str) -> Dict[str, Any]:
+        document = self._document(document_id)
+        content = [{"startIndex": 0, "endIndex": 1, "sectionBreak": {"sectionStyle": {}}}]
+        index = 1
+        for line in document["text"].splitlines(keepends=True):
+            end = index + len(line)
+            content.append({
+                "startIndex": index,
+                "endIndex": end,
+                "paragraph": {
+                    "elements": [{"startIndex": index, "endIndex": end, "textRun": {"content": line, "textStyle": {}}}],
+                    "paragraphStyle": {"namedStyleType": "NORMAL_TEXT"},
+                },
+            })
+            index = end
+        return {
+            "documentId": document_id,
+            "title": document["title"],
+            "revisionId": f"rev{document['revision']}",
+            "body": {"content": content},
+        }
+
+    def docs_create(self, body: Optional[Dict[str, Any]] = None, **_):
+        document_id = self._new_id("doc")
+        self.documents[document_id] = {"title": (body or {}).get("title", "Untitled document"), "text": "", "revision": 1}
+        return self._document_resource(document_id)
+
+    def docs_get(self, documentId: str, fields: Optional[str] = None, **_):
+        resource = self._document_resource(documentId)
+        if fields:
+            return {key: resource[key] for key in (f.strip() for f in fields.split(",")) if key in resource}
+        return resource
+
+    def docs_batch_update(self, documentId: str, body: Optional[Dict[str, Any]] = None, **_):
+        document = self._document(documentId)
+        requests = (body or {}).get("requests", [])
+        for request in requests:
+            if "insertText" in request:
+                # Body indexes start at 1 (character offsets stand in for UTF-16 units here)
+                index = request["insertText"].get("location", {}).get("index", 1) - 1
+                text = document["text"]
+                document["text"] = text[:index] + request["insertText"]["text"] + text[index:]
+        document["revision"] += 1
+        return {"documentId": documentId, "replies": [{} for _ in requests], "writeControl": {"requiredRevisionId": f"rev{document['revision']}"}}
+
+
+def _b64(text: str) -> str:
+    return base64.urlsafe_b64encode(text.encode("utf-8")).decode()
+
+
+def _now() -> str:
+    return datetime.datetime.utcnow().isoformat(timespec="milliseconds") + "Z"
+
+
+def _matches_query(message: Dict[str, Any], query: str) -> bool:
+    """
+    Applies the common Gmail search operators (from, to, subject, label, is, after, before,
+    newer_than); other terms must appear in the subject or snippet.
+    """
+    headers = {h["name"].lower(): h["value"].lower() for h in message["payload"]["headers"]}
+    labels = {label.lower() for label in message["labelIds"]}
+    sent = int(message["internalDate"]) / 1000
+    for match in GMAIL_TERM.finditer(query):
+        op = (match.group("op") or "").lower()
+        value = (match.group("quoted") if match.group("quoted") is not None else match.group("word")).lower()
+        if op in ("from", "to", "subject"):
+            found = value in headers.get(op, "")
+        elif op == "label":
+            found = value in labels
+        elif op == "is":
+            found = "unread" in labels if value == "unread" else ("unread" not in labels if value == "read" else value in labels)
+        elif op in ("after", "before"):
+            day = datetime.datetime.strptime(value.replace("-", "/"), "%Y/%m/%d").replace(tzinfo=datetime.timezone.utc).timestamp()
+            found = sent >= day if op == "after" else sent < day
+        elif op == "newer_than":
+            found = sent >= time.time() - int(value[:-1]) * {"d": 86400, "m": 2592000, "y": 31536000}[value[-1]]
+        else:
+            found = (f"{op}:{value}" if op else value) in f"{headers.get('subject', '')} {message['snippet'].lower()}"
+        if not found:
+            return False
+    return True
+
+
+def _column_index(letters: str) -> int:
+    # A -> 0, Z -> 25, AA -> 26
+    index = 0
+    for letter in letters.upper():
+        index = index * 26 + ord(letter) - ord("A") + 1
+    return index - 1
+
+
+# Unit test
+if __name__ == "__main__":
+    from inflect_gtm.tools.utils.google_retry import get_status, is_retryable
+
+    print("🚀 Testing fake Google APIs...")
+    google = FakeGoogle()
+    google.add_messages(3)
+    sheet_id = google.add_spreadsheet("customer_info", rows=5)
+
+    gmail = google.build("gmail", "v1")
+    listed = gmail.users().messages().list(userId="me", maxResults=10).execute()
+    print("📥 Messages:", [m["id"] for m in listed["messages"]])
+    print("🔎 Unread today:", gmail.users().messages().list(userId="me", q="is:unread newer_than:1d").execute()["resultSizeEstimate"])
+    google.delete_messages([listed["messages"][0]["id"]])
+    history = gmail.users().history().list(userId="me", startHistoryId="1000").execute()
+    print("🕓 History:", [(record["id"], [kind for kind in record if kind.startswith("messages")][-1]) for record in history["history"]])
+    fetched = []
+    batch = gmail.new_batch_http_request(callback=lambda request_id, response, exception: fetched.append(exception or response["id"]))
+    for m in listed["messages"]:
+        batch.add(gmail.users().messages().get(userId="me", id=m["id"]))
+    batch.execute()
+    print("📦 Batch:", fetched)
+
+    sheets = google.build("sheets", "v4")
+    print("📊 Rows:", sheets.spreadsheets().values().get(spreadsheetId=sheet_id, range="A1:C3").execute()["values"])
+
+    flaky = FakeGoogle(error_rate=1.0)
+    try:
+        flaky.build("gmail", "v1").users().messages().send(userId="me", body={"raw": ""}).execute()
+    except FakeHttpError as e:
+        print("⚠️ Injected error:", e, "status", get_status(e), "retryable", is_retryable(e))
+    print("📈 Stats:", google.stats)
@@ -3,12 +3,12 @@ import ast
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
-from dotenv import load_dotenv
+from inflect_gtm.components.utils.env import PROJECT_ROOT, load_env
 
 
 # Load environment variables
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
-load_dotenv(dotenv_path=os.path.join(project_root, ".env"))
+load_env()
+project_root = PROJECT_ROOT
 
 def authenticate():
     """
@@ -0,0 +1,50 @@
+import time
+from inflect_gtm.components.utils.rate_limit import backoff_delay
+from inflect_gtm.components.utils.tracing import span
+
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+def get_status(error: Exception) -> int:
+    """
+    Returns the HTTP status carried by a googleapiclient HttpError, or 0 for other errors.
+    """
+    resp = getattr(error, "resp", None)
+    try:
+        return int(getattr(resp, "status", 0) or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Quota (429) and server-side (5xx) errors are worth retrying; everything else is not.
+    """
+    return get_status(error) in RETRYABLE_STATUSES
+
+
+def execute_with_retry(request, max_retries: int = 5, base_delay: float = 1.0):
+    """
+    Executes a googleapiclient request, retrying 429 and 5xx responses with jittered backoff.
+
+    Args:
+        request: An unexecuted googleapiclient HttpRequest.
+        max_retries (int): Number of retries before the last error is raised.
+        base_delay (float): Base delay in seconds for the exponential backoff.
+
+    Returns:
+        The parsed API response.
+    """
+    attempt = 0
+    with span("google.api", method=getattr(request, "methodId", "unknown")) as current:
+        while True:
+            try:
+                return request.execute()
+            except Exception as e:
+                if attempt >= max_retries or not is_retryable(e):
+                    raise
+                time.sleep(backoff_delay(attempt, base=base_delay))
+                attempt += 1
+                if current:
+                    current.set(retries=attempt, last_status=get_status(e))